@@ -4,15 +4,38 @@
 # - Deterministic merge + rule evaluation
 
 import argparse
+import gc
+import hashlib
+import heapq
+import io
 import json
+import os
+import pickle
+import re
+import signal
+import socket
+import socketserver
 import sys
-from copy import deepcopy
+import tempfile
+import traceback
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from itertools import compress
+from operator import attrgetter, itemgetter
 from pathlib import Path
+from typing import NamedTuple
 
 PLACEHOLDERS = {"", "n/a", "na", "null", "none", "-", "--"}
 ALLOWED_OPERATORS = {"IN", "EQ", "NEQ", "CONTAINS", "EXISTS", "NOT_EXISTS"}
 ALLOWED_ACTIONS = {"REQUIRE_BLANK", "REQUIRE_PRESENT", "SET_VALUE"}
 ALLOWED_SEVERITY = {"info", "warning", "blocking"}
+ENGINES = ("row", "columnar")
+STREAM_BUDGET = 100_000  # items per in-memory sort run under --stream
+STREAM_CHUNK = 1 << 16  # characters read per refill by the incremental parser
+SPILL_BLOCK = 1000  # sorted entries per pickle block in a spilled run
+EVAL_CACHE_VERSION = 3  # bump when evaluation output changes shape
 
 
 def load_json(path: str):
@@ -28,6 +51,254 @@ def save_json(path: str, obj):
         json.dump(obj, f, ensure_ascii=False, indent=2)
 
 
+_PRETTY = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+
+def _dumps_at(value, level: int) -> str:
+    # json.dump(indent=2) output for a value nested *level* containers deep.
+    # Raw newlines only ever separate lines, since strings escape theirs.
+    return _PRETTY.encode(value).replace("\n", "\n" + "  " * level)
+
+
+def save_json_stream(path: str, obj: dict):
+    """Write *obj* byte-for-byte as save_json would, without materializing it.
+
+    Top-level values that are lists or iterators (SortSpool.sorted()) are
+    written one element at a time; everything else goes through json.dumps.
+    """
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("w", encoding="utf-8") as f:
+        f.write("{")
+        for n, (key, value) in enumerate(obj.items()):
+            f.write(",\n  " if n else "\n  ")
+            f.write(json.dumps(key, ensure_ascii=False) + ": ")
+            if value is None or isinstance(value, (dict, str, int, float)):
+                f.write(_dumps_at(value, 1))
+                continue
+            empty = True
+            for item in value:
+                f.write("[\n    " if empty else ",\n    ")
+                f.write(_dumps_at(item, 2))
+                empty = False
+            f.write("[]" if empty else "\n  ]")
+        f.write("\n}" if obj else "}")
+
+
+_WS = " \t\r\n"
+_SKIP_TOKEN = re.compile(r'[\[\]{}"]')
+_STRING_TAIL = re.compile(r'(?:[^"\\]|\\.)*"', re.S)
+
+
+class _JsonReader:
+    """Minimal pull parser over a text file, read STREAM_CHUNK characters at a time.
+
+    Objects and arrays on the path of interest are walked token by token;
+    leaf values are decoded with json's raw_decode, and values off the path
+    are skipped by bracket counting, so neither is ever held beyond one
+    element (a skipped value costs one buffer, not its decoded size).
+    """
+
+    def __init__(self, f, chunk_size: int = STREAM_CHUNK):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ("" at EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str):
+        found = self.peek()
+        if found != ch:
+            raise ValueError(f"Expected {ch!r} in JSON stream, found {found or 'EOF'!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                val, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return val
+
+    def skip(self):
+        if self.peek() not in "[{":
+            self.value()
+            return
+        depth = 0
+        while True:
+            m = _SKIP_TOKEN.search(self.buf, self.pos)
+            if m is None:
+                self.pos = len(self.buf)
+                if not self._fill():
+                    raise ValueError("Unterminated JSON value in stream")
+                continue
+            ch = m.group()
+            if ch == '"':
+                tail = _STRING_TAIL.match(self.buf, m.end())
+                if tail is None:
+                    self.pos = m.start()
+                    if not self._fill():
+                        raise ValueError("Unterminated JSON string in stream")
+                    continue
+                self.pos = tail.end()
+                continue
+            self.pos = m.end()
+            depth += 1 if ch in "[{" else -1
+            if depth == 0:
+                return
+
+    def _next_member(self, close: str) -> bool:
+        # After '{'/'[' or a member: True if another member follows
+        ch = self.peek()
+        if ch == ",":
+            self.pos += 1
+            return True
+        if ch == close:
+            self.pos += 1
+            return False
+        raise ValueError(f"Expected ',' or {close!r} in JSON stream, found {ch or 'EOF'!r}")
+
+    def enter(self, path: list[str]) -> bool:
+        """Advance to the value at *path* (object keys); False if any key is absent."""
+        for key in path:
+            if self.peek() != "{":
+                return False
+            self.pos += 1
+            if self.peek() == "}":
+                return False
+            while True:
+                name = self.value()
+                self.expect(":")
+                if name == key:
+                    break
+                self.skip()
+                if not self._next_member("}"):
+                    return False
+        return True
+
+    def items(self):
+        """Yield the elements of the array at the current position."""
+        if self.peek() != "[":
+            return
+        self.pos += 1
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if not self._next_member("]"):
+                return
+
+
+def iter_sheet_rows(path: str, sheet: str):
+    """Yield standardized_dataset.sheets.<sheet>.rows from *path* one row at a time."""
+    with Path(path).open("r", encoding="utf-8") as f:
+        reader = _JsonReader(f)
+        if reader.enter(["standardized_dataset", "sheets", sheet, "rows"]):
+            yield from reader.items()
+
+
+def load_standardized_stream(path: str) -> dict:
+    """Standardized dataset with only the sheets evaluate_rules reads.
+
+    Catalog rows are loaded (the join index needs them); accounts stay a lazy
+    row iterator for evaluate_rules to sort through a SortSpool.
+    """
+    return {"standardized_dataset": {"sheets": {
+        "accounts": {"rows": iter_sheet_rows(path, "accounts")},
+        "catalog": {"rows": list(iter_sheet_rows(path, "catalog"))},
+    }}}
+
+
+class SortSpool:
+    """Append-only sf_packet section of (sort key, item) pairs that comes back stably sorted.
+
+    Without a budget this is a stable sort on the keys. With one, each full
+    buffer of *budget* entries is sorted and spilled as pickled blocks to a
+    private temporary file, and sorted() k-way merges the runs lazily; the
+    append sequence number breaks ties, so the order matches the stable sort.
+    """
+
+    def __init__(self, budget: int | None = None):
+        self.budget = budget
+        self.buffer = []
+        self.runs = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, entry: tuple):
+        self.buffer.append(entry)
+        self.count += 1
+        if self.budget and len(self.buffer) >= self.budget:
+            self._spill()
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def _decorated(self):
+        start = self.count - len(self.buffer)
+        return sorted((key, start + i, item) for i, (key, item) in enumerate(self.buffer))
+
+    def _spill(self):
+        run = tempfile.TemporaryFile()
+        entries = self._decorated()
+        for i in range(0, len(entries), SPILL_BLOCK):
+            pickle.dump(entries[i:i + SPILL_BLOCK], run, pickle.HIGHEST_PROTOCOL)
+        run.seek(0)
+        self.runs.append(run)
+        self.buffer = []
+
+    @staticmethod
+    def _read_run(run):
+        try:
+            while True:
+                try:
+                    block = pickle.load(run)
+                except EOFError:
+                    return
+                yield from block
+        finally:
+            run.close()
+
+    def sorted(self):
+        """Sorted items: a list if nothing was spilled, else a one-shot iterator."""
+        if not self.runs:
+            return [item for _, item in sorted(self.buffer, key=itemgetter(0))]
+        runs, tail = self.runs, self._decorated()
+        self.runs, self.buffer = [], []
+        return (item for _, _, item in heapq.merge(*(self._read_run(r) for r in runs), tail))
+
+
 def norm(v):
     if v is None:
         return ""
@@ -42,22 +313,48 @@ def is_blank(v):
     return norm_cmp(v) in PLACEHOLDERS or norm(v) == ""
 
 
+def _deprecation_key(entry):
+    """(rule_id, reason) if *entry* equals a {"rule_id", "reason"} dict deprecate_rule would add."""
+    if isinstance(entry, dict) and entry.keys() == {"rule_id", "reason"}:
+        try:
+            key = (entry["rule_id"], entry["reason"])
+            hash(key)
+            return key
+        except TypeError:
+            return None
+    return None
+
+
 def merge_base_patch(base: dict, patch: dict | None) -> dict:
-    merged = deepcopy(base)
+    """Apply the Salesforce rule changes of *patch* on top of *base*.
+
+    Only the sections the merge writes (the top-level dict, salesforce_rules
+    and deprecated_rules, plus any section it has to create) are copied; rule
+    dicts are shared with *base* and *patch*, so treat the result as read-only.
+    Rules live in slots indexed by rule_id, so each change costs O(1) and a
+    patch of n changes merges in O(n log n) for the final sort.
+    """
+    merged = dict(base)
     # Ensure structure
-    merged.setdefault("salesforce_rules", {}).setdefault("rules", [])
-    merged.setdefault("qa_rules", {}).setdefault("rules", [])
-    merged.setdefault("resolver_rules", {}).setdefault("rules", [])
-    merged.setdefault("deprecated_rules", [])
-
-    if not patch:
-        # Sort rules deterministically by rule_id if present
-        merged["salesforce_rules"]["rules"] = sorted(
-            merged["salesforce_rules"]["rules"], key=lambda r: r.get("rule_id", "")
-        )
-        return merged
-
-    for change in patch.get("changes", []):
+    for section in ("salesforce_rules", "qa_rules", "resolver_rules"):
+        if section not in merged or "rules" not in merged[section]:
+            merged[section] = dict(merged.get(section, {}))
+            merged[section].setdefault("rules", [])
+    merged["salesforce_rules"] = dict(merged["salesforce_rules"])
+    merged["deprecated_rules"] = list(merged.get("deprecated_rules", []))
+
+    # Rules in insertion order; None marks a slot removed by a later change
+    slots = list(merged["salesforce_rules"]["rules"])
+    by_id = {}
+    for pos, rule in enumerate(slots):
+        by_id.setdefault(rule.get("rule_id"), []).append(pos)
+    deprecated = {key for key in map(_deprecation_key, merged["deprecated_rules"]) if key is not None}
+
+    def drop(rid):
+        for pos in by_id.pop(rid, ()):
+            slots[pos] = None
+
+    for change in (patch or {}).get("changes", []):
         action = change.get("action")
         target = change.get("target")
         if target != "salesforce_rules":
@@ -69,41 +366,32 @@ def merge_base_patch(base: dict, patch: dict | None) -> dict:
             if not rid:
                 continue
             # Replace if same rule_id exists; else append
-            new_rules = [r for r in merged["salesforce_rules"]["rules"] if r.get("rule_id") != rid]
-            new_rules.append(rule)
-            merged["salesforce_rules"]["rules"] = new_rules
+            drop(rid)
+            by_id[rid] = [len(slots)]
+            slots.append(rule)
         elif action == "deprecate_rule":
             rid = change.get("rule_id")
             reason = change.get("reason", "deprecated")
             if rid:
                 # Remove from active rules
-                merged["salesforce_rules"]["rules"] = [
-                    r for r in merged["salesforce_rules"]["rules"] if r.get("rule_id") != rid
-                ]
+                drop(rid)
                 # Add to deprecated catalog if not present
                 dep = {"rule_id": rid, "reason": reason}
-                if dep not in merged["deprecated_rules"]:
+                key = _deprecation_key(dep)
+                if key is None:
+                    if dep not in merged["deprecated_rules"]:
+                        merged["deprecated_rules"].append(dep)
+                elif key not in deprecated:
+                    deprecated.add(key)
                     merged["deprecated_rules"].append(dep)
 
     # Deterministic order
     merged["salesforce_rules"]["rules"] = sorted(
-        merged["salesforce_rules"]["rules"], key=lambda r: r.get("rule_id", "")
+        (r for r in slots if r is not None), key=lambda r: r.get("rule_id", "")
     )
     return merged
 
 
-def build_sheet_index(rows: list[dict]):
-    # Deterministic index: keep insertion order lists; return first match when joining
-    idx = {"contract_key": {}, "file_url": {}, "file_name": {}}
-    for row in rows:
-        for key in ("contract_key", "file_url", "file_name"):
-            val = norm(row.get(key, ""))
-            if val:
-                k = norm_cmp(val)
-                idx[key].setdefault(k, []).append(row)
-    return idx
-
-
 def get_join_triplet(row: dict):
     return (
         norm(row.get("contract_key", "")),
@@ -112,316 +400,458 @@ def get_join_triplet(row: dict):
     )
 
 
-def lookup_target_row(sheet_idx: dict, join_triplet: tuple[str, str, str]):
-    ck, fu, fn = join_triplet
-    if norm(ck):
-        hits = sheet_idx["contract_key"].get(norm_cmp(ck))
-        if hits:
-            return hits[0]
-    if norm(fu):
-        hits = sheet_idx["file_url"].get(norm_cmp(fu))
-        if hits:
-            return hits[0]
-    if norm(fn):
-        hits = sheet_idx["file_name"].get(norm_cmp(fn))
-        if hits:
-            return hits[0]
-    return None
+def join_key(triplet: tuple[str, str, str]) -> tuple[str, str, str]:
+    """norm_cmp() of an already norm()'d join triplet, interned so equal keys share one object."""
+    ck, fu, fn = triplet
+    return (sys.intern(ck.lower()), sys.intern(fu.lower()), sys.intern(fn.lower()))
 
 
-def operator_match(value_raw, operator: str, expected):
-    v = norm_cmp(value_raw)
-    if operator in {"EXISTS", "NOT_EXISTS"}:
-        return (not is_blank(v)) if operator == "EXISTS" else is_blank(v)
+class Record(NamedTuple):
+    """An account row with its join fields normalized once (prepare_record)."""
+    row: dict
+    triplet: tuple[str, str, str]  # norm()'d contract_key, file_url, file_name
+    key: tuple[str, str, str]  # join_key(triplet): join lookups, record order, sharding
+    sort_prefix: tuple  # leading sort-key fields shared by every output of the record
 
-    # Normalize expected to list
-    exp_list = expected if isinstance(expected, list) else [expected]
-    exp_list = [norm_cmp(x) for x in exp_list]
 
-    if operator == "IN":
-        return v in exp_list
-    if operator == "EQ":
-        return v == (exp_list[0] if exp_list else "")
-    if operator == "NEQ":
-        return v != (exp_list[0] if exp_list else "")
-    if operator == "CONTAINS":
-        sub = exp_list[0] if exp_list else ""
-        return sub in v
-    return False
+def prepare_record(row: dict) -> Record:
+    triplet = get_join_triplet(row)
+    key = join_key(triplet)
+    # contract_key present sorts first
+    return Record(row, triplet, key, ("" if triplet[0] else "zzz",) + key)
 
 
-def same_triplet(d: dict, ck: str, fu: str, fn: str) -> bool:
-    return (
-        norm_cmp(d.get("contract_key")),
-        norm_cmp(d.get("file_url")),
-        norm_cmp(d.get("file_name")),
-    ) == (
-        norm_cmp(ck),
-        norm_cmp(fu),
-        norm_cmp(fn),
-    )
+def build_join_table(rows: list[dict]) -> dict:
+    """Single catalog lookup table: (tier, normalized value) -> first row with it.
 
+    Tiers 0/1/2 are contract_key/file_url/file_name; join_target_row tries
+    them in that order, which is the contract_key -> file_url -> file_name
+    fallback of the catalog join.
+    """
+    table = {}
+    for row in rows:
+        for tier, value in enumerate(join_key(get_join_triplet(row))):
+            if value:
+                table.setdefault((tier, value), row)
+    return table
+
+
+def join_target_row(table: dict, key: tuple[str, str, str]):
+    for tier, value in enumerate(key):
+        if value:
+            row = table.get((tier, value))
+            if row is not None:
+                return row
+    return None
 
-def evaluate_rules(merged_cfg: dict, std: dict, qa_loaded: bool):
-    sheets = std.get("standardized_dataset", {}).get("sheets", {})
-    accounts = sheets.get("accounts", {}).get("rows", [])
-    catalog = sheets.get("catalog", {}).get("rows", [])
 
-    idx_catalog = build_sheet_index(catalog)
+def normalize_expected(expected) -> list[str]:
+    exp_list = expected if isinstance(expected, list) else [expected]
+    return [norm_cmp(x) for x in exp_list]
 
-    rules = merged_cfg.get("salesforce_rules", {}).get("rules", [])
 
-    sf_field_actions = []
-    sf_issues = []
-    sf_change_log = []
-    sf_contract_results = []
-    sf_manual_review_queue = []
+def compile_matcher(operator: str, expected):
+    """Return a predicate over an already-normalized field value (see norm_cmp)."""
+    # is_blank() of a normalized value reduces to a PLACEHOLDERS lookup
+    if operator == "EXISTS":
+        return lambda v: v not in PLACEHOLDERS
+    if operator == "NOT_EXISTS":
+        return lambda v: v in PLACEHOLDERS
 
-    # Deterministic iteration over accounts
-    def record_key(row):
-        ck, fu, fn = get_join_triplet(row)
-        return (norm_cmp(ck), norm_cmp(fu), norm_cmp(fn))
+    exp_list = normalize_expected(expected)
+    first = exp_list[0] if exp_list else ""
 
-    accounts_sorted = sorted(accounts, key=record_key)
+    if operator == "IN":
+        exp_set = frozenset(exp_list)
+        return lambda v: v in exp_set
+    if operator == "EQ":
+        return lambda v: v == first
+    if operator == "NEQ":
+        return lambda v: v != first
+    if operator == "CONTAINS":
+        return lambda v: first in v
+    return lambda v: False
 
-    for acc in accounts_sorted:
-        ck, fu, fn = get_join_triplet(acc)
-        join_key_tuple = (ck, fu, fn)
-        cat_row = lookup_target_row(idx_catalog, join_key_tuple)
 
-        for rule in rules:
-            when = rule.get("when", {})
-            sheet_name = when.get("sheet", "accounts")
-            field_name = when.get("field")
-            operator = when.get("operator")
-            value = when.get("value")
+def operator_match(value_raw, operator: str, expected):
+    return compile_matcher(operator, expected)(norm_cmp(value_raw))
+
+
+def compile_rules(rules: list[dict]) -> list[dict]:
+    """Turn merged Salesforce rules into evaluation plans.
+
+    Validation and normalization that used to run per account x rule happens
+    here once: unknown operators and WHEN sheets drop the rule, invalid THEN
+    entries are filtered out, and the expected values become a matcher.
+    Plans keep the merged rule order.
+    """
+    plans = []
+    for rule in rules:
+        when = rule.get("when", {})
+        sheet_name = when.get("sheet", "accounts")
+        operator = when.get("operator")
+        if operator not in ALLOWED_OPERATORS:
+            continue
 
-            if operator not in ALLOWED_OPERATORS:
-                continue
+        # Resolve the sheet WHEN reads from
+        if sheet_name == "accounts" or sheet_name == "__contract__":
+            when_sheet = "accounts"
+        elif sheet_name == "catalog":
+            when_sheet = "catalog"
+        else:
+            continue
 
-            # Resolve the row for WHEN
-            when_row = acc if sheet_name == "accounts" or sheet_name == "__contract__" else (
-                cat_row if sheet_name == "catalog" else None
-            )
-            if when_row is None:
-                continue
-            field_val = when_row.get(field_name)
-            if not operator_match(field_val, operator, value):
+        thens = []
+        for then in rule.get("then", []):
+            action = then.get("action")
+            severity = then.get("severity", "warning")
+            if action not in ALLOWED_ACTIONS or severity not in ALLOWED_SEVERITY:
                 continue
+            thens.append({
+                "action": action,
+                "sheet": then.get("sheet"),
+                "field": then.get("field"),
+                "severity": severity,
+                "proposed_value": then.get("proposed_value"),
+            })
 
-            # WHEN satisfied → apply THEN actions
-            for then in rule.get("then", []):
-                action = then.get("action")
-                target_sheet = then.get("sheet")
-                target_field = then.get("field")
-                severity = then.get("severity", "warning")
-                proposed_value = then.get("proposed_value")
+        plans.append({
+            "rule_id": rule.get("rule_id"),
+            "description": rule.get("description", ""),
+            "when_sheet": when_sheet,
+            "field": when.get("field"),
+            "operator": operator,
+            "values": normalize_expected(when.get("value")),
+            "match": compile_matcher(operator, when.get("value")),
+            "then": thens,
+        })
+    return plans
 
-                if action not in ALLOWED_ACTIONS or severity not in ALLOWED_SEVERITY:
-                    continue
 
-                # Resolve target row (join to catalog if requested)
-                target_row = acc if target_sheet == "accounts" else (
-                    cat_row if target_sheet == "catalog" else None
-                )
-
-                # Join failure diagnostic for missing target row (e.g., catalog)
-                if target_row is None and target_sheet == "catalog":
-                    sf_issues.append({
-                        "contract_key": ck or None,
-                        "file_url": fu or None,
-                        "file_name": fn or None,
-                        "sheet": target_sheet,
-                        "row_index": None,
-                        "field": target_field,
-                        "issue_type": "join_failed_missing_target_row",
-                        "severity": "blocking",
-                        "details": f"Cannot join to {target_sheet} for rule {rule.get('rule_id')}",
-                        "suggested_routing": None
-                    })
-                    # Do not attempt action when join fails; continue to next THEN
-                    continue
-
-                current_value = target_row.get(target_field)
-
-                # REQUIRE_BLANK
-                if action == "REQUIRE_BLANK":
-                    if not is_blank(current_value):
-                        sf_field_actions.append({
-                            "contract_key": ck or None,
-                            "file_url": fu or None,
-                            "file_name": fn or None,
-                            "sheet": target_sheet,
-                            "row_index": None,
-                            "field": target_field,
-                            "action": "blank",
-                            "proposed_value": None,
-                            "reason_category": "salesforce_rules",
-                            "reason_text": rule.get("description", ""),
-                            "severity": severity
-                        })
-                        sf_issues.append({
-                            "contract_key": ck or None,
-                            "file_url": fu or None,
-                            "file_name": fn or None,
-                            "sheet": target_sheet,
-                            "row_index": None,
-                            "field": target_field,
-                            "issue_type": "field_should_be_blank_but_populated",
-                            "severity": severity,
-                            "details": rule.get("description", ""),
-                            "suggested_routing": None
-                        })
-                        sf_change_log.append({
-                            "timestamp": None,
-                            "agent": "salesforce_agent_preview",
-                            "sheet": target_sheet,
-                            "row_key": None,
-                            "field": target_field,
-                            "old_value": current_value,
-                            "new_value": None,
-                            "reason_category": "salesforce_rules",
-                            "severity": severity,
-                            "notes": rule.get("rule_id"),
-                            "_ck": ck,
-                            "_fu": fu,
-                            "_fn": fn
-                        })
-
-                # REQUIRE_PRESENT
-                elif action == "REQUIRE_PRESENT":
-                    if is_blank(current_value):
-                        sf_issues.append({
-                            "contract_key": ck or None,
-                            "file_url": fu or None,
-                            "file_name": fn or None,
-                            "sheet": target_sheet,
-                            "row_index": None,
-                            "field": target_field,
-                            "issue_type": "field_required_but_missing",
-                            "severity": severity,
-                            "details": rule.get("description", ""),
-                            "suggested_routing": None
-                        })
-
-                # SET_VALUE
-                elif action == "SET_VALUE":
-                    sf_field_actions.append({
-                        "contract_key": ck or None,
-                        "file_url": fu or None,
-                        "file_name": fn or None,
-                        "sheet": target_sheet,
-                        "row_index": None,
-                        "field": target_field,
-                        "action": "format_fix",
-                        "proposed_value": proposed_value,
-                        "reason_category": "salesforce_rules",
-                        "reason_text": rule.get("description", ""),
-                        "severity": severity
-                    })
-                    sf_change_log.append({
-                        "timestamp": None,
-                        "agent": "salesforce_agent_preview",
-                        "sheet": target_sheet,
-                        "row_key": None,
-                        "field": target_field,
-                        "old_value": current_value,
-                        "new_value": proposed_value,
-                        "reason_category": "salesforce_rules",
-                        "severity": severity,
-                        "notes": rule.get("rule_id"),
-                        "_ck": ck,
-                        "_fu": fu,
-                        "_fn": fn
-                    })
-
-        # Aggregate status for this record using full JOIN TRIPLET
-        has_blocking = False
-        has_warning = False
-
-        for it in sf_issues:
-            if same_triplet(it, ck, fu, fn):
-                if it.get("severity") == "blocking":
-                    has_blocking = True
-                if it.get("severity") == "warning":
-                    has_warning = True
-        for ac in sf_field_actions:
-            if same_triplet(ac, ck, fu, fn):
-                if ac.get("severity") == "blocking":
-                    has_blocking = True
-                if ac.get("severity") == "warning":
-                    has_warning = True
-
-        status = "READY"
-        if has_blocking:
-            status = "BLOCKED"
-            # Minimal manual review queue entry per INTERFACES.md
-            sf_manual_review_queue.append({
-                "contract_key": ck or None,
-                "severity": "blocking",
-                "reason": "blocking_salesforce_rule_or_join_failure"
-            })
-        elif has_warning:
-            status = "NEEDS_REVIEW"
+def build_dispatch_index(plans: list[dict]) -> dict:
+    """Index plan positions by the (sheet, field) their WHEN reads.
 
-        sf_contract_results.append({
-            "contract_key": ck or None,
-            "file_name": fn or None,
-            "file_url": fu or None,
-            "detected_subtype": {
-                "value": acc.get("subtype") if acc.get("subtype") is not None else None,
-                "confidence": None
-            },
-            "sf_contract_status": status,
-            "notes": None
+    Per (sheet, field) the plans are bucketed by operator so one normalized
+    field value answers the whole group: EQ/IN through a value -> plans map,
+    NEQ as "all minus equal", EXISTS/NOT_EXISTS by one placeholder check and
+    CONTAINS once per distinct substring.
+    """
+    index = {}
+    for i, plan in enumerate(plans):
+        entry = index.setdefault((plan["when_sheet"], plan["field"]), {
+            "eq": {}, "neq": {}, "neq_all": [], "contains": {}, "exists": [], "not_exists": [],
         })
-
-    # Deterministic ordering of outputs
-    def key_contract(d):
-        return (
-            "" if d.get("contract_key") else "zzz",  # contract_key present sorts first
-            norm_cmp(d.get("contract_key") or ""),
-            norm_cmp(d.get("file_url") or ""),
-            norm_cmp(d.get("file_name") or ""),
-            d.get("sheet", ""),
-            d.get("field", ""),
+        operator = plan["operator"]
+        values = plan["values"]
+        first = values[0] if values else ""
+        if operator == "IN":
+            for v in set(values):
+                entry["eq"].setdefault(v, []).append(i)
+        elif operator == "EQ":
+            entry["eq"].setdefault(first, []).append(i)
+        elif operator == "NEQ":
+            entry["neq"].setdefault(first, set()).add(i)
+            entry["neq_all"].append(i)
+        elif operator == "CONTAINS":
+            entry["contains"].setdefault(first, []).append(i)
+        elif operator == "EXISTS":
+            entry["exists"].append(i)
+        elif operator == "NOT_EXISTS":
+            entry["not_exists"].append(i)
+    return index
+
+
+def matching_plans(dispatch: dict, plans: list[dict], acc: dict, cat_row: dict | None) -> list[dict]:
+    """Plans whose WHEN holds for this record, in rule order."""
+    hits = []
+    for (sheet, field), entry in dispatch.items():
+        when_row = acc if sheet == "accounts" else cat_row
+        if when_row is None:
+            continue
+        v = norm_cmp(when_row.get(field))
+        hits.extend(entry["eq"].get(v, ()))
+        if entry["neq_all"]:
+            equal = entry["neq"].get(v, ())
+            hits.extend(i for i in entry["neq_all"] if i not in equal)
+        for sub, ids in entry["contains"].items():
+            if sub in v:
+                hits.extend(ids)
+        hits.extend(entry["not_exists"] if v in PLACEHOLDERS else entry["exists"])
+    hits.sort()
+    return [plans[i] for i in hits]
+
+
+def columnar_matches(plans: list[dict], accounts: list[dict], cat_rows: list[dict | None]) -> list[list[int]]:
+    """Fired plan positions per record, evaluated column-wise (--engine columnar).
+
+    Each (sheet, field) a WHEN reads becomes one dictionary-encoded column over
+    the sorted accounts: normalized value -> record positions. Catalog columns
+    are gathered through the precomputed join and skip records whose join
+    failed. EQ/IN rules look their values up directly; the other operators
+    evaluate a mask over the column's distinct values only. Plans are visited
+    in rule order, so every record's list stays in rule order.
+    """
+    columns = {}
+    fired = [[] for _ in accounts]
+
+    for i, plan in enumerate(plans):
+        key = (plan["when_sheet"], plan["field"])
+        column = columns.get(key)
+        if column is None:
+            field = plan["field"]
+            rows = accounts if plan["when_sheet"] == "accounts" else cat_rows
+            column = {}
+            for pos, row in enumerate(rows):
+                if row is not None:
+                    column.setdefault(norm_cmp(row.get(field)), []).append(pos)
+            columns[key] = column
+
+        if plan["operator"] == "IN":
+            matched = [v for v in set(plan["values"]) if v in column]
+        elif plan["operator"] == "EQ":
+            first = plan["values"][0] if plan["values"] else ""
+            matched = [first] if first in column else []
+        else:
+            values = list(column)
+            matched = compress(values, map(plan["match"], values))
+        for v in matched:
+            for pos in column[v]:
+                fired[pos].append(i)
+    return fired
+
+
+@contextmanager
+def gc_paused():
+    """Pause the cyclic collector while building a packet.
+
+    Evaluation allocates millions of acyclic, long-lived dicts and tuples;
+    generational passes would rescan them over and over for nothing.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+# sf_packet list sections in output order. Entries are (sort key, item); the
+# keys start with the record's sort_prefix, so nothing is re-normalized to sort.
+SECTIONS = ("sf_contract_results", "sf_field_actions", "sf_issues", "sf_manual_review_queue", "sf_change_log")
+
+
+def iter_record_plans(records_sorted, plans: list[dict], dispatch: dict | None, join_table: dict, engine: str):
+    """Yield (record, cat_row, record_plans, record_severities) per account Record.
+
+    *records_sorted* must be ordered by Record.key. record_severities holds the
+    severities emitted so far for the record's normalized join triplet: records
+    sharing one are adjacent and share the set, so the status evaluate_record
+    derives sees the same issues/actions a rescan of sf_issues + sf_field_actions
+    would, in O(1) per record.
+    """
+    if engine == "columnar":
+        records_sorted = list(records_sorted)
+        # Catalog join resolved once per record
+        cat_rows = [join_target_row(join_table, record.key) for record in records_sorted]
+        fired = columnar_matches(plans, [record.row for record in records_sorted], cat_rows)
+    else:
+        cat_rows = fired = None
+
+    current_key = None
+    record_severities = set()
+    for pos, record in enumerate(records_sorted):
+        if cat_rows is not None:
+            cat_row = cat_rows[pos]
+        else:
+            cat_row = join_target_row(join_table, record.key)
+        if record.key != current_key:
+            current_key, record_severities = record.key, set()
+        if fired is not None:
+            record_plans = [plans[i] for i in fired[pos]]
+        else:
+            record_plans = matching_plans(dispatch, plans, record.row, cat_row)
+        yield record, cat_row, record_plans, record_severities
+
+
+def apply_plan(plan: dict, record: Record, cat_row: dict | None, out: dict, record_severities: set):
+    """Emit one matched plan's THEN actions for an account into the *out* sections."""
+    acc = record.row
+    ck, fu, fn = record.triplet
+    # WHEN satisfied → apply THEN actions
+    for then in plan["then"]:
+        action = then["action"]
+        target_sheet = then["sheet"]
+        target_field = then["field"]
+        severity = then["severity"]
+        proposed_value = then["proposed_value"]
+        field_key = record.sort_prefix + (target_sheet, target_field)
+
+        # Resolve target row (join to catalog if requested)
+        target_row = acc if target_sheet == "accounts" else (
+            cat_row if target_sheet == "catalog" else None
         )
 
-    sf_field_actions = sorted(sf_field_actions, key=key_contract)
-    sf_issues = sorted(sf_issues, key=lambda d: (
-        "" if d.get("contract_key") else "zzz",  # contract_key present sorts first
-        norm_cmp(d.get("contract_key") or ""), norm_cmp(d.get("file_url") or ""), norm_cmp(d.get("file_name") or ""), d.get("sheet", ""), d.get("field", ""), d.get("issue_type", "")
-    ))
-    sf_change_log = sorted(sf_change_log, key=lambda d: (
-        "" if d.get("_ck") else "zzz",  # contract_key present sorts first
-        norm_cmp(d.get("_ck") or ""),
-        norm_cmp(d.get("_fu") or ""),
-        norm_cmp(d.get("_fn") or ""),
-        d.get("sheet", ""), d.get("field", ""), norm_cmp(str(d.get("old_value"))), norm_cmp(str(d.get("new_value")))
-    ))
-    # Remove internal sorting keys from sf_change_log
-    sf_change_log = [{k: v for k, v in d.items() if not k.startswith("_")} for d in sf_change_log]
-    sf_contract_results = sorted(sf_contract_results, key=lambda d: (
-        "" if d.get("contract_key") else "zzz",  # contract_key present sorts first
-        norm_cmp(d.get("contract_key") or ""),
-        norm_cmp(d.get("file_url") or ""),
-        norm_cmp(d.get("file_name") or "")
-    ))
-    sf_manual_review_queue = sorted(sf_manual_review_queue, key=lambda d: (
-        norm_cmp(d.get("contract_key")), d.get("severity", "")
-    ))
+        # Join failure diagnostic for missing target row (e.g., catalog)
+        if target_row is None and target_sheet == "catalog":
+            out["sf_issues"].append((field_key + ("join_failed_missing_target_row",), {
+                "contract_key": ck or None,
+                "file_url": fu or None,
+                "file_name": fn or None,
+                "sheet": target_sheet,
+                "row_index": None,
+                "field": target_field,
+                "issue_type": "join_failed_missing_target_row",
+                "severity": "blocking",
+                "details": f"Cannot join to {target_sheet} for rule {plan['rule_id']}",
+                "suggested_routing": None
+            }))
+            record_severities.add("blocking")
+            # Do not attempt action when join fails; continue to next THEN
+            continue
 
+        current_value = target_row.get(target_field)
+
+        # REQUIRE_BLANK
+        if action == "REQUIRE_BLANK":
+            if not is_blank(current_value):
+                out["sf_field_actions"].append((field_key, {
+                    "contract_key": ck or None,
+                    "file_url": fu or None,
+                    "file_name": fn or None,
+                    "sheet": target_sheet,
+                    "row_index": None,
+                    "field": target_field,
+                    "action": "blank",
+                    "proposed_value": None,
+                    "reason_category": "salesforce_rules",
+                    "reason_text": plan["description"],
+                    "severity": severity
+                }))
+                out["sf_issues"].append((field_key + ("field_should_be_blank_but_populated",), {
+                    "contract_key": ck or None,
+                    "file_url": fu or None,
+                    "file_name": fn or None,
+                    "sheet": target_sheet,
+                    "row_index": None,
+                    "field": target_field,
+                    "issue_type": "field_should_be_blank_but_populated",
+                    "severity": severity,
+                    "details": plan["description"],
+                    "suggested_routing": None
+                }))
+                out["sf_change_log"].append((field_key + (norm_cmp(str(current_value)), norm_cmp(str(None))), {
+                    "timestamp": None,
+                    "agent": "salesforce_agent_preview",
+                    "sheet": target_sheet,
+                    "row_key": None,
+                    "field": target_field,
+                    "old_value": current_value,
+                    "new_value": None,
+                    "reason_category": "salesforce_rules",
+                    "severity": severity,
+                    "notes": plan["rule_id"]
+                }))
+                record_severities.add(severity)
+
+        # REQUIRE_PRESENT
+        elif action == "REQUIRE_PRESENT":
+            if is_blank(current_value):
+                out["sf_issues"].append((field_key + ("field_required_but_missing",), {
+                    "contract_key": ck or None,
+                    "file_url": fu or None,
+                    "file_name": fn or None,
+                    "sheet": target_sheet,
+                    "row_index": None,
+                    "field": target_field,
+                    "issue_type": "field_required_but_missing",
+                    "severity": severity,
+                    "details": plan["description"],
+                    "suggested_routing": None
+                }))
+                record_severities.add(severity)
+
+        # SET_VALUE
+        elif action == "SET_VALUE":
+            out["sf_field_actions"].append((field_key, {
+                "contract_key": ck or None,
+                "file_url": fu or None,
+                "file_name": fn or None,
+                "sheet": target_sheet,
+                "row_index": None,
+                "field": target_field,
+                "action": "format_fix",
+                "proposed_value": proposed_value,
+                "reason_category": "salesforce_rules",
+                "reason_text": plan["description"],
+                "severity": severity
+            }))
+            out["sf_change_log"].append((field_key + (norm_cmp(str(current_value)), norm_cmp(str(proposed_value))), {
+                "timestamp": None,
+                "agent": "salesforce_agent_preview",
+                "sheet": target_sheet,
+                "row_key": None,
+                "field": target_field,
+                "old_value": current_value,
+                "new_value": proposed_value,
+                "reason_category": "salesforce_rules",
+                "severity": severity,
+                "notes": plan["rule_id"]
+            }))
+            record_severities.add(severity)
+
+
+def finish_record(record: Record, record_severities: set, out: dict) -> str:
+    """Append the account's manual review entry and contract result; returns its status."""
+    acc = record.row
+    ck, fu, fn = record.triplet
+
+    # Aggregate status for this record using full JOIN TRIPLET
+    has_blocking = "blocking" in record_severities
+    has_warning = "warning" in record_severities
+
+    status = "READY"
+    if has_blocking:
+        status = "BLOCKED"
+        # Minimal manual review queue entry per INTERFACES.md
+        out["sf_manual_review_queue"].append(((record.key[0], "blocking"), {
+            "contract_key": ck or None,
+            "severity": "blocking",
+            "reason": "blocking_salesforce_rule_or_join_failure"
+        }))
+    elif has_warning:
+        status = "NEEDS_REVIEW"
+
+    out["sf_contract_results"].append((record.sort_prefix, {
+        "contract_key": ck or None,
+        "file_name": fn or None,
+        "file_url": fu or None,
+        "detected_subtype": {
+            "value": acc.get("subtype") if acc.get("subtype") is not None else None,
+            "confidence": None
+        },
+        "sf_contract_status": status,
+        "notes": None
+    }))
+    return status
+
+
+def evaluate_record(record: Record, cat_row: dict | None, record_plans: list[dict], record_severities: set,
+                    out: dict) -> str:
+    """Apply *record_plans* to one account, appending to the *out* sections; returns its status."""
+    for plan in record_plans:
+        apply_plan(plan, record, cat_row, out, record_severities)
+    return finish_record(record, record_severities, out)
+
+
+def build_packet(merged_cfg: dict, qa_loaded: bool, sections: dict, status_counts: dict) -> dict:
+    """Assemble sf_packet from sorted *sections* (lists or one-shot iterators)."""
     # Summary
-    total = len(sf_contract_results)
-    blocked = sum(1 for r in sf_contract_results if r.get("sf_contract_status") == "BLOCKED")
-    needs_review = sum(1 for r in sf_contract_results if r.get("sf_contract_status") == "NEEDS_REVIEW")
-    ready = sum(1 for r in sf_contract_results if r.get("sf_contract_status") == "READY")
-
     sf_summary = {
-        "contracts": total,
-        "blocked": blocked,
-        "needs_review": needs_review,
-        "ready": ready
+        "contracts": sum(status_counts.values()),
+        "blocked": status_counts["BLOCKED"],
+        "needs_review": status_counts["NEEDS_REVIEW"],
+        "ready": status_counts["READY"]
     }
 
     sf_meta = {
@@ -431,41 +861,487 @@ def evaluate_rules(merged_cfg: dict, std: dict, qa_loaded: bool):
 
     return {
         "sf_summary": sf_summary,
-        "sf_contract_results": sf_contract_results,
-        "sf_field_actions": sf_field_actions,
-        "sf_issues": sf_issues,
-        "sf_manual_review_queue": sf_manual_review_queue,
-        "sf_change_log": sf_change_log,
+        "sf_contract_results": sections["sf_contract_results"],
+        "sf_field_actions": sections["sf_field_actions"],
+        "sf_issues": sections["sf_issues"],
+        "sf_manual_review_queue": sections["sf_manual_review_queue"],
+        "sf_change_log": sections["sf_change_log"],
         "sf_meta": sf_meta
     }
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Offline governance preview harness")
-    parser.add_argument("--base", required=True, help="Path to config_pack.base.json")
-    parser.add_argument("--patch", required=False, help="Path to config_pack.example.patch.json")
-    parser.add_argument("--standardized", required=True, help="Path to standardized_dataset JSON")
-    parser.add_argument("--qa", required=False, help="Optional path to qa_packet JSON (not used in logic; for trace only)")
-    parser.add_argument("--out", required=True, help="Path to write sf_packet preview JSON")
-    args = parser.parse_args()
+def evaluate_rules(merged_cfg: dict, std: dict, qa_loaded: bool, engine: str = "row",
+                   spill_budget: int | None = None, plans: list[dict] | None = None):
+    """Evaluate the Salesforce rules over *std* and build the sf_packet preview.
+
+    With *spill_budget* the account sort and the output sections go through
+    SortSpools that spill past that many items, and list sections of the
+    result may be one-shot iterators (write them with save_json_stream).
+    *plans* are compile_rules output for merged_cfg's rules, if already built.
+    """
+    sheets = std.get("standardized_dataset", {}).get("sheets", {})
+    accounts = sheets.get("accounts", {}).get("rows", [])
+    catalog = sheets.get("catalog", {}).get("rows", [])
+
+    join_table = build_join_table(catalog)
+
+    if plans is None:
+        plans = compile_rules(merged_cfg.get("salesforce_rules", {}).get("rules", []))
+    dispatch = build_dispatch_index(plans) if engine == "row" else None
+
+    sections = {name: SortSpool(spill_budget) for name in SECTIONS}
+    status_counts = {"READY": 0, "NEEDS_REVIEW": 0, "BLOCKED": 0}
+
+    with gc_paused():
+        # Deterministic iteration over accounts
+        if engine == "columnar":
+            records_sorted = sorted(map(prepare_record, accounts), key=attrgetter("key"))
+        else:
+            record_spool = SortSpool(spill_budget)
+            record_spool.extend((record.key, record) for record in map(prepare_record, accounts))
+            records_sorted = record_spool.sorted()
+
+        for record, cat_row, record_plans, record_severities in iter_record_plans(
+                records_sorted, plans, dispatch, join_table, engine):
+            status_counts[evaluate_record(record, cat_row, record_plans, record_severities, sections)] += 1
+        sorted_sections = {name: spool.sorted() for name, spool in sections.items()}
+
+    return build_packet(merged_cfg, qa_loaded, sorted_sections, status_counts)
+
+
+def plan_hash(plan: dict) -> str:
+    """Content hash of a compiled plan (everything that shapes its emissions)."""
+    content = {k: v for k, v in plan.items() if k not in ("match", "rule_key")}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+def record_hash(acc: dict, cat_row: dict | None) -> str:
+    """Content hash of an account row together with the catalog row it joins to."""
+    return hashlib.sha256(json.dumps([acc, cat_row], sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
 
-    base = load_json(args.base)
-    patch = load_json(args.patch) if args.patch else None
-    std = load_json(args.standardized)
+
+def empty_eval_cache() -> dict:
+    return {"version": EVAL_CACHE_VERSION, "rules": set(), "records": {}}
+
+
+def load_eval_cache(path: str) -> dict:
+    """Evaluation cache written by save_eval_cache, or an empty one if absent/unreadable/outdated."""
+    try:
+        with Path(path).open("rb") as f:
+            cache = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return empty_eval_cache()
+    if not isinstance(cache, dict) or cache.get("version") != EVAL_CACHE_VERSION:
+        return empty_eval_cache()
+    return cache
+
+
+def save_eval_cache(path: str, cache: dict):
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(p.name + ".tmp")
+    with tmp.open("wb") as f:
+        pickle.dump(cache, f, pickle.HIGHEST_PROTOCOL)
+    tmp.replace(p)
+
+
+def evaluate_rules_incremental(merged_cfg: dict, std: dict, qa_loaded: bool, cache: dict):
+    """evaluate_rules that reuses per-(record, rule) emissions from a previous run.
+
+    *cache* maps record_hash -> {rule key: (emissions, severities)} for every
+    rule key in cache["rules"]; plans with no emissions are simply absent. A
+    rule key is (plan_hash, occurrence), so identical rules listed twice keep
+    a slot each and emit twice, as in evaluate_rules. Only plans whose key is
+    new (added or edited rules) run against known records, unknown records
+    run every plan, and removed rules drop out.
+    Cached emissions carry their sort keys, so rebuilding the packet is a
+    sort over tuples. Returns (sf_packet, updated cache, stats).
+    """
+    sheets = std.get("standardized_dataset", {}).get("sheets", {})
+    accounts = sheets.get("accounts", {}).get("rows", [])
+    catalog = sheets.get("catalog", {}).get("rows", [])
+
+    join_table = build_join_table(catalog)
+
+    plans = compile_rules(merged_cfg.get("salesforce_rules", {}).get("rules", []))
+    occurrences = {}
+    for plan in plans:
+        h = plan_hash(plan)
+        plan["rule_key"] = (h, occurrences.get(h, 0))
+        occurrences[h] = plan["rule_key"][1] + 1
+    rule_order = {plan["rule_key"]: i for i, plan in enumerate(plans)}
+    stale_plans = [plan for plan in plans if plan["rule_key"] not in cache["rules"]]
+    dispatch = build_dispatch_index(plans)
+    stale_dispatch = build_dispatch_index(stale_plans)
+
+    records = {}
+    decorated = {name: [] for name in SECTIONS}
+    status_counts = {"READY": 0, "NEEDS_REVIEW": 0, "BLOCKED": 0}
+    stats = {"rules": len(plans), "rules_evaluated": len(stale_plans), "records": 0, "records_reused": 0}
+    seq = 0
+
+    with gc_paused():
+        current_key = None
+        record_severities = set()
+        for record in sorted(map(prepare_record, accounts), key=attrgetter("key")):
+            acc = record.row
+            cat_row = join_target_row(join_table, record.key)
+            rhash = record_hash(acc, cat_row)
+            entry = records.get(rhash)
+            if entry is None:
+                prior = cache["records"].get(rhash)
+                if prior is None:
+                    entry, todo = {}, matching_plans(dispatch, plans, acc, cat_row)
+                else:
+                    entry = {h: emitted for h, emitted in prior.items() if h in rule_order}
+                    todo = matching_plans(stale_dispatch, stale_plans, acc, cat_row)
+                    stats["records_reused"] += 1
+                for plan in todo:
+                    out = {name: [] for name in SECTIONS}
+                    severities = set()
+                    apply_plan(plan, record, cat_row, out, severities)
+                    emissions = [(name, key, item) for name, entries in out.items() for key, item in entries]
+                    if emissions or severities:
+                        entry[plan["rule_key"]] = (emissions, frozenset(severities))
+                records[rhash] = entry
+            stats["records"] += 1
+
+            if record.key != current_key:
+                current_key, record_severities = record.key, set()
+            for h in sorted(entry, key=rule_order.__getitem__):
+                emissions, severities = entry[h]
+                for name, key, item in emissions:
+                    decorated[name].append((key, seq, item))
+                    seq += 1
+                record_severities |= severities
+
+            out = {name: [] for name in SECTIONS}
+            status_counts[finish_record(record, record_severities, out)] += 1
+            for name, entries in out.items():
+                for key, item in entries:
+                    decorated[name].append((key, seq, item))
+                    seq += 1
+
+        sections = {name: [item for _, _, item in sorted(entries)] for name, entries in decorated.items()}
+    new_cache = {"version": EVAL_CACHE_VERSION, "rules": set(rule_order), "records": records}
+    return build_packet(merged_cfg, qa_loaded, sections, status_counts), new_cache, stats
+
+
+# Per-process state of a --workers pool, set once by _init_shard_worker
+_SHARD_STATE = {}
+
+
+def _init_shard_worker(rules: list[dict], join_table: dict, engine: str):
+    # Compiled matchers are closures and do not pickle; the raw rules do
+    plans = compile_rules(rules)
+    _SHARD_STATE.update(
+        plans=plans,
+        dispatch=build_dispatch_index(plans) if engine == "row" else None,
+        join_table=join_table,
+        engine=engine,
+    )
+
+
+def _evaluate_shard(records: list[Record]):
+    """Evaluate one shard of account Records (in input order) inside a pool worker.
+
+    Returns (sections, status_counts). Each section is sorted and holds
+    (sort key, record key, seq, item) entries: equal sort keys from different
+    records fall back to the record key, which is exactly the order the
+    single-process run appends them in, and a record key never spans shards.
+    """
+    state = _SHARD_STATE
+    sections = {name: [] for name in SECTIONS}
+    status_counts = {"READY": 0, "NEEDS_REVIEW": 0, "BLOCKED": 0}
+    out = {name: [] for name in SECTIONS}
+    seq = 0
+    with gc_paused():
+        for record, cat_row, record_plans, record_severities in iter_record_plans(
+                sorted(records, key=attrgetter("key")), state["plans"], state["dispatch"], state["join_table"],
+                state["engine"]):
+            status_counts[evaluate_record(record, cat_row, record_plans, record_severities, out)] += 1
+            for name, entries in out.items():
+                for key, item in entries:
+                    sections[name].append((key, record.key, seq, item))
+                    seq += 1
+                entries.clear()
+        return {name: sorted(entries) for name, entries in sections.items()}, status_counts
+
+
+def shard_of(record: Record, shards: int) -> int:
+    """Stable shard for *record*: every record with the same normalized join triplet lands together."""
+    return zlib.crc32("\x1f".join(record.key).encode("utf-8")) % shards
+
+
+def evaluate_rules_parallel(merged_cfg: dict, std: dict, qa_loaded: bool, workers: int, engine: str = "row"):
+    """evaluate_rules across *workers* processes, byte-identical to the single-process run.
+
+    Accounts are partitioned by shard_of, each worker receives the rules and
+    catalog join table once (pool initializer) and evaluates its shard, and
+    the sorted per-shard sections are k-way merged with heapq.merge.
+    """
+    sheets = std.get("standardized_dataset", {}).get("sheets", {})
+    accounts = sheets.get("accounts", {}).get("rows", [])
+    catalog = sheets.get("catalog", {}).get("rows", [])
+    rules = merged_cfg.get("salesforce_rules", {}).get("rules", [])
+
+    shards = [[] for _ in range(workers)]
+    for record in map(prepare_record, accounts):
+        shards[shard_of(record, workers)].append(record)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker,
+                             initargs=(rules, build_join_table(catalog), engine)) as pool:
+        results = list(pool.map(_evaluate_shard, shards))
+
+    status_counts = {"READY": 0, "NEEDS_REVIEW": 0, "BLOCKED": 0}
+    for _, counts in results:
+        for status, n in counts.items():
+            status_counts[status] += n
+    sections = {
+        name: [entry[3] for entry in heapq.merge(*(shard_sections[name] for shard_sections, _ in results))]
+        for name in SECTIONS
+    }
+    return build_packet(merged_cfg, qa_loaded, sections, status_counts)
+
+
+class WarmCache:
+    """Parsed inputs kept across previews by the --serve daemon.
+
+    Files are keyed by absolute path and validated by (mtime, size); when
+    those move the bytes are re-hashed, so a touched but unchanged file is
+    not re-parsed.
+    Merged configs and their compiled plans are keyed by the base and patch
+    digests. Both maps keep the *max_entries* most recently used.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self.files = OrderedDict()  # path -> (stamp, sha256, parsed JSON)
+        self.rulesets = OrderedDict()  # (base sha256, patch sha256) -> (merged, plans)
+
+    def _remember(self, table: OrderedDict, key, value):
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.max_entries:
+            table.popitem(last=False)
+
+    def load(self, path: str):
+        """(sha256, parsed JSON) of *path*, parsing it only if its content changed."""
+        path = os.path.abspath(path)
+        st = Path(path).stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self.files.get(path)
+        if entry is None or entry[0] != stamp:
+            data = Path(path).read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if entry is None or entry[1] != digest:
+                entry = (stamp, digest, json.loads(data.decode("utf-8")))
+            else:
+                entry = (stamp, digest, entry[2])
+        self._remember(self.files, path, entry)
+        return entry[1], entry[2]
+
+    def load_json(self, path: str):
+        return self.load(path)[1]
+
+    def ruleset(self, base_path: str, patch_path: str | None):
+        """(merged config, compiled plans) for this base and optional patch."""
+        base_digest, base = self.load(base_path)
+        patch_digest, patch = self.load(patch_path) if patch_path else (None, None)
+        key = (base_digest, patch_digest)
+        entry = self.rulesets.get(key)
+        if entry is None:
+            merged = merge_base_patch(base, patch)
+            entry = (merged, compile_rules(merged.get("salesforce_rules", {}).get("rules", [])))
+        self._remember(self.rulesets, key, entry)
+        return entry
+
+
+def run_preview(args: argparse.Namespace, warm: WarmCache | None = None):
+    """Run the preview described by parsed CLI *args*, loading inputs through *warm* if given."""
+    load = warm.load_json if warm is not None else load_json
+    if warm is not None:
+        merged, plans = warm.ruleset(args.base, args.patch)
+    else:
+        base = load_json(args.base)
+        patch = load_json(args.patch) if args.patch else None
+        merged, plans = merge_base_patch(base, patch), None
+    std = load_standardized_stream(args.standardized) if args.stream else load(args.standardized)
 
     qa_loaded_flag = False
     if args.qa:
         try:
-            _ = load_json(args.qa)
+            _ = load(args.qa)
             qa_loaded_flag = True
         except Exception:
             qa_loaded_flag = False
 
-    merged = merge_base_patch(base, patch)
-    result = evaluate_rules(merged, std, qa_loaded_flag)
-    save_json(args.out, result)
+    if args.cache:
+        # The cache is millions of long-lived objects too (see gc_paused)
+        with gc_paused():
+            cache = load_eval_cache(args.cache)
+            result, cache, stats = evaluate_rules_incremental(merged, std, qa_loaded_flag, cache)
+            save_json(args.out, result)
+            save_eval_cache(args.cache, cache)
+        print(f"Re-evaluated {stats['rules_evaluated']}/{stats['rules']} rules; "
+              f"reused {stats['records_reused']}/{stats['records']} records from {args.cache}")
+    elif args.workers > 1:
+        result = evaluate_rules_parallel(merged, std, qa_loaded_flag, args.workers, engine=args.engine)
+        save_json(args.out, result)
+    elif args.stream:
+        result = evaluate_rules(merged, std, qa_loaded_flag, engine=args.engine,
+                                spill_budget=max(args.memory_budget, 1), plans=plans)
+        save_json_stream(args.out, result)
+    else:
+        result = evaluate_rules(merged, std, qa_loaded_flag, engine=args.engine, plans=plans)
+        save_json(args.out, result)
     print(f"Wrote preview to {args.out}")
 
 
+class _PreviewHandler(socketserver.StreamRequestHandler):
+    """One preview per connection: a JSON line of CLI args in, a JSON line of the outcome back.
+
+    The preview runs in the client's working directory, so relative paths and
+    messages are exactly those of an in-process run.
+    """
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        stdout, stderr = io.StringIO(), io.StringIO()
+        status = 0
+        cwd = os.getcwd()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                os.chdir(request["cwd"])
+                run_preview(argparse.Namespace(**request["args"]), self.server.warm)
+            except SystemExit as e:
+                status = e.code if isinstance(e.code, int) else 1
+            except Exception:
+                traceback.print_exc()
+                status = 1
+            finally:
+                os.chdir(cwd)
+        reply = {"status": status, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+        self.wfile.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+def daemon_alive(socket_path: str) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+def serve(socket_path: str) -> int:
+    """Answer previews from `run_local.py --daemon` on a Unix socket until interrupted.
+
+    Requests are handled one at a time against a shared WarmCache, so repeat
+    previews skip JSON parsing, merging and rule compilation. The socket is
+    created owner-only and removed on exit; nothing listens on the network.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        print("--serve needs Unix domain sockets, which this platform lacks", file=sys.stderr)
+        return 2
+    path = Path(socket_path)
+    if path.exists():
+        if not path.is_socket():
+            print(f"{socket_path} exists and is not a socket", file=sys.stderr)
+            return 2
+        if daemon_alive(socket_path):
+            print(f"A preview daemon is already serving {socket_path}", file=sys.stderr)
+            return 2
+        path.unlink()
+
+    umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, _PreviewHandler)
+    finally:
+        os.umask(umask)
+    server.warm = WarmCache()
+    # Let SIGTERM unwind through the cleanup below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Serving previews on {socket_path} (Ctrl-C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+    return 0
+
+
+def request_preview(socket_path: str, args: argparse.Namespace) -> dict | None:
+    """Send *args* to the daemon on *socket_path*; its reply, or None if no usable daemon answered.
+
+    A missing or unreachable socket, a connection dropped mid-request and an
+    empty or malformed reply all return None, so the caller runs in-process.
+    """
+    payload = {k: v for k, v in vars(args).items() if k not in ("serve", "daemon")}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            request = {"cwd": os.getcwd(), "args": payload}
+            sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reply:
+                line = reply.readline()
+        reply = json.loads(line)
+    except (OSError, ValueError):
+        return None
+    if not (isinstance(reply, dict) and isinstance(reply.get("status"), int)
+            and isinstance(reply.get("stdout"), str) and isinstance(reply.get("stderr"), str)):
+        return None
+    return reply
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline governance preview harness")
+    parser.add_argument("--base", help="Path to config_pack.base.json")
+    parser.add_argument("--patch", required=False, help="Path to config_pack.example.patch.json")
+    parser.add_argument("--standardized", help="Path to standardized_dataset JSON")
+    parser.add_argument("--qa", required=False, help="Optional path to qa_packet JSON (not used in logic; for trace only)")
+    parser.add_argument("--out", help="Path to write sf_packet preview JSON")
+    parser.add_argument("--engine", choices=ENGINES, default="row",
+                        help="Rule evaluation engine: row (default) or columnar (column-wise WHEN masks)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Parse the standardized dataset incrementally and stream the output, "
+                             "spilling sorts to temp files (same output, bounded memory)")
+    parser.add_argument("--memory-budget", type=int, default=STREAM_BUDGET,
+                        help=f"Items per in-memory sort run with --stream (default {STREAM_BUDGET})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Evaluate accounts in N processes sharded by join triplet (same output)")
+    parser.add_argument("--cache", required=False,
+                        help="Incremental mode: reuse per-record rule results from this cache file "
+                             "(re-evaluating only added/changed rules and new records) and update it")
+    parser.add_argument("--serve", metavar="SOCKET",
+                        help="Run a preview daemon on this Unix socket, keeping configs, datasets and "
+                             "compiled rules warm between previews")
+    parser.add_argument("--daemon", metavar="SOCKET", default=os.environ.get("RUN_LOCAL_DAEMON"),
+                        help="Send the preview to the daemon on this socket (default $RUN_LOCAL_DAEMON); "
+                             "runs in-process if none is listening")
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args.serve)
+    missing = [flag for flag in ("--base", "--standardized", "--out") if not getattr(args, flag[2:])]
+    if missing:
+        parser.error("the following arguments are required: " + ", ".join(missing))
+    if args.workers > 1 and args.stream:
+        parser.error("--workers keeps shard results in memory and cannot be combined with --stream")
+    if args.cache and (args.workers > 1 or args.stream):
+        parser.error("--cache cannot be combined with --workers or --stream")
+
+    if args.daemon and hasattr(socket, "AF_UNIX"):
+        reply = request_preview(args.daemon, args)
+        if reply is not None:
+            sys.stdout.write(reply["stdout"])
+            sys.stderr.write(reply["stderr"])
+            return reply["status"]
+        print(f"No usable preview daemon on {args.daemon}; running in-process", file=sys.stderr)
+    run_preview(args)
+    return 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
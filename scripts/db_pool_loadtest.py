@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+DB Read Path Load Test — async pool vs sync pool
+Hammers the hot read endpoints with concurrent clients and reports throughput
+and latency percentiles. Run once with ASYNC_DB_POOL=false and once with
+ASYNC_DB_POOL=true on the server, then compare the two reports.
+Run: python scripts/db_pool_loadtest.py --concurrency 32 --requests 2000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+BASE = os.environ.get("BASE_URL", "http://localhost:5000")
+WS = "ws_SEED0100000000000000000000"
+BAT = "bat_SEED0100000000000000000000"
+TOKEN = "Bearer usr_SEED0100000000000000000000"
+
+DEFAULT_PATHS = [
+    "/api/v2.5/workspaces/%s/patches" % WS,
+    "/api/v2.5/workspaces/%s/rfis" % WS,
+    "/api/v2.5/workspaces/%s/batches" % WS,
+    "/api/v2.5/workspaces/%s/audit-events" % WS,
+    "/api/v2.5/workspaces/%s/corrections" % WS,
+    "/api/v2.5/workspaces/%s/operations/queue" % WS,
+    "/api/v2.5/batches/%s/health" % BAT,
+]
+
+
+def fetch(url, token):
+    req = urllib.request.Request(url, headers={"Authorization": token})
+    t0 = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 0
+    return status, (time.perf_counter() - t0) * 1000.0
+
+
+def percentile(sorted_vals, pct):
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, int(round(pct / 100.0 * (len(sorted_vals) - 1))))
+    return sorted_vals[k]
+
+
+def run_path(path, concurrency, total, token):
+    url = BASE + path
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        t0 = time.perf_counter()
+        results = list(pool.map(lambda _: fetch(url, token), range(total)))
+        elapsed = time.perf_counter() - t0
+    latencies = sorted(ms for _, ms in results)
+    statuses = {}
+    for status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "path": path,
+        "requests": total,
+        "concurrency": concurrency,
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "statuses": statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the DB read endpoints")
+    parser.add_argument("--path", action="append", help="Endpoint path (repeatable); defaults to the hot read set")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per path")
+    parser.add_argument("--token", default=TOKEN, help="Authorization header value")
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report instead of a table")
+    args = parser.parse_args()
+
+    flags_status, flags = 0, {}
+    try:
+        with urllib.request.urlopen(BASE + "/api/v2.5/feature-flags", timeout=10) as resp:
+            flags_status, flags = resp.status, json.loads(resp.read())
+    except Exception:
+        pass
+    mode = "async" if flags.get("data", {}).get("ASYNC_DB_POOL") else "sync"
+
+    reports = [run_path(p, args.concurrency, args.requests, args.token) for p in (args.path or DEFAULT_PATHS)]
+
+    if args.json:
+        print(json.dumps({"mode": mode, "results": reports}, indent=2))
+        return 0
+
+    print("DB READ LOAD TEST — pool mode: %s (feature-flags HTTP %s)" % (mode, flags_status or "n/a"))
+    print("%-60s %8s %8s %8s %8s  %s" % ("path", "rps", "p50", "p95", "p99", "statuses"))
+    for r in reports:
+        print("%-60s %8.1f %8.1f %8.1f %8.1f  %s" % (
+            r["path"][-60:], r["rps"], r["p50_ms"], r["p95_ms"], r["p99_ms"],
+            ", ".join("%s=%d" % kv for kv in sorted(r["statuses"].items())),
+        ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Index Advisor — EXPLAIN the list endpoints' SQL shapes and propose indexes
+Replays the query shapes the generic list endpoints generate (one per filter
+combination) against a seeded database with EXPLAIN (ANALYZE, BUFFERS), flags
+sequential scans and explicit sorts on the paged tables, and proposes the
+composite / partial index that serves each flagged shape. Proposals can be
+written out as a migration or applied directly.
+
+Seed-sized tables always favour seq scans, so by default the planner is run with
+enable_seqscan = off: a seq scan that survives means no usable index exists.
+Use --natural to see the plans the planner would really pick.
+
+Run: DATABASE_URL=... python scripts/index_advisor.py
+     DATABASE_URL=... python scripts/index_advisor.py --emit-migration server/migrations/0NN_more_indexes.sql
+     DATABASE_URL=... python scripts/index_advisor.py --apply
+"""
+import os
+import re
+import sys
+import json
+import argparse
+
+import psycopg2
+
+WS = "ws_SEED0100000000000000000000"
+BAT = "bat_SEED0100000000000000000000"
+USER = "usr_SEED0100000000000000000000"
+PAT = "pat_SEED0100000000000000000000"
+REC = "rec_seed_001"
+
+HIDDEN = "status NOT IN ('Sent_to_Kiwi', 'Kiwi_Returned')"
+
+# (endpoint, shape label, table paged, SQL, params, proposed index DDL)
+# SQL mirrors what the route builds; keep in sync when list filters change.
+SHAPES = [
+    ("list_patches", "workspace", "patches",
+     "SELECT id FROM patches WHERE workspace_id = %s AND deleted_at IS NULL AND " + HIDDEN + " ORDER BY id ASC LIMIT 51",
+     (WS,),
+     "CREATE INDEX IF NOT EXISTS idx_patches_ws_live_id ON patches(workspace_id, id) WHERE deleted_at IS NULL"),
+    ("list_patches", "workspace+status", "patches",
+     "SELECT id FROM patches WHERE workspace_id = %s AND deleted_at IS NULL AND " + HIDDEN + " AND status = %s ORDER BY id ASC LIMIT 51",
+     (WS, "Submitted"),
+     "CREATE INDEX IF NOT EXISTS idx_patches_ws_status_live_id ON patches(workspace_id, status, id) WHERE deleted_at IS NULL"),
+    ("list_patches", "workspace+record_id", "patches",
+     "SELECT id FROM patches WHERE workspace_id = %s AND deleted_at IS NULL AND " + HIDDEN + " AND record_id = %s ORDER BY id ASC LIMIT 51",
+     (WS, REC),
+     "CREATE INDEX IF NOT EXISTS idx_patches_ws_record_live_id ON patches(workspace_id, record_id, id) WHERE deleted_at IS NULL"),
+    ("list_patches", "workspace+batch_id", "patches",
+     "SELECT id FROM patches WHERE workspace_id = %s AND deleted_at IS NULL AND " + HIDDEN + " AND batch_id = %s ORDER BY id ASC LIMIT 51",
+     (WS, BAT),
+     "CREATE INDEX IF NOT EXISTS idx_patches_ws_batch_live_id ON patches(workspace_id, batch_id, id) WHERE deleted_at IS NULL"),
+    ("list_patches", "analyst scope", "patches",
+     "SELECT id FROM patches WHERE workspace_id = %s AND author_id = %s AND deleted_at IS NULL AND " + HIDDEN + " ORDER BY id ASC LIMIT 51",
+     (WS, USER),
+     "CREATE INDEX IF NOT EXISTS idx_patches_ws_author_live_id ON patches(workspace_id, author_id, id) WHERE deleted_at IS NULL"),
+    ("list_rfis", "workspace", "rfis",
+     "SELECT id FROM rfis WHERE workspace_id = %s AND deleted_at IS NULL ORDER BY id ASC LIMIT 51",
+     (WS,),
+     "CREATE INDEX IF NOT EXISTS idx_rfis_ws_live_id ON rfis(workspace_id, id) WHERE deleted_at IS NULL"),
+    ("list_batch_rfis", "batch", "rfis",
+     "SELECT id FROM rfis WHERE batch_id = %s AND deleted_at IS NULL ORDER BY id ASC LIMIT 51",
+     (BAT,),
+     "CREATE INDEX IF NOT EXISTS idx_rfis_batch_live_id ON rfis(batch_id, id) WHERE deleted_at IS NULL"),
+    ("list_audit_events", "workspace", "audit_events",
+     "SELECT id FROM audit_events WHERE workspace_id = %s ORDER BY id ASC LIMIT 51",
+     (WS,),
+     "CREATE INDEX IF NOT EXISTS idx_audit_events_workspace_id ON audit_events(workspace_id, id)"),
+    ("list_audit_events", "workspace+patch_id", "audit_events",
+     "SELECT id FROM audit_events WHERE workspace_id = %s AND patch_id = %s ORDER BY id ASC LIMIT 51",
+     (WS, PAT),
+     "CREATE INDEX IF NOT EXISTS idx_audit_events_ws_patch_id ON audit_events(workspace_id, patch_id, id) WHERE patch_id IS NOT NULL"),
+    ("list_audit_events", "workspace+batch_id", "audit_events",
+     "SELECT id FROM audit_events WHERE workspace_id = %s AND batch_id = %s ORDER BY id ASC LIMIT 51",
+     (WS, BAT),
+     "CREATE INDEX IF NOT EXISTS idx_audit_events_ws_batch_id ON audit_events(workspace_id, batch_id, id) WHERE batch_id IS NOT NULL"),
+    ("list_audit_events", "workspace+record_id", "audit_events",
+     "SELECT id FROM audit_events WHERE workspace_id = %s AND record_id = %s ORDER BY id ASC LIMIT 51",
+     (WS, REC),
+     "CREATE INDEX IF NOT EXISTS idx_audit_events_ws_record_id ON audit_events(workspace_id, record_id, id) WHERE record_id IS NOT NULL"),
+    ("list_workspace_corrections", "workspace", "corrections",
+     "SELECT c.id FROM corrections c WHERE c.workspace_id = %s AND c.deleted_at IS NULL ORDER BY c.id ASC LIMIT 51",
+     (WS,),
+     "CREATE INDEX IF NOT EXISTS idx_corrections_ws_live_id ON corrections(workspace_id, id) WHERE deleted_at IS NULL"),
+    ("list_workspace_corrections", "workspace+batch_id", "corrections",
+     "SELECT c.id FROM corrections c WHERE c.workspace_id = %s AND c.deleted_at IS NULL"
+     " AND c.document_id IN (SELECT id FROM documents WHERE batch_id = %s AND deleted_at IS NULL)"
+     " ORDER BY c.id ASC LIMIT 51",
+     (WS, BAT),
+     "CREATE INDEX IF NOT EXISTS idx_corrections_document_live_id ON corrections(document_id, id) WHERE deleted_at IS NULL"),
+    ("list_batches", "workspace", "batches",
+     "SELECT id FROM batches WHERE workspace_id = %s AND deleted_at IS NULL ORDER BY id ASC LIMIT 51",
+     (WS,),
+     "CREATE INDEX IF NOT EXISTS idx_batches_ws_live_id ON batches(workspace_id, id) WHERE deleted_at IS NULL"),
+]
+
+INDEX_NAME_RE = re.compile(r"CREATE INDEX IF NOT EXISTS (\w+)")
+
+
+def plan_nodes(node, parent=None):
+    yield node, parent
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child, node)
+
+
+def findings_for(plan, table):
+    """Seq scans on any table, and sorts sitting on top of a scan of the paged table."""
+    out = []
+    for node, parent in plan_nodes(plan):
+        if node["Node Type"] == "Seq Scan":
+            out.append("seq scan on %s (rows removed by filter: %s)" % (
+                node.get("Relation Name"), node.get("Rows Removed by Filter", 0)))
+        if node["Node Type"] == "Sort":
+            scanned = {n.get("Relation Name") for n, _ in plan_nodes(node)}
+            if table in scanned:
+                out.append("explicit sort on %s (%s)" % (table, ", ".join(node.get("Sort Key", []))))
+    return out
+
+
+def explain(conn, sql, params, natural):
+    with conn.cursor() as cur:
+        if not natural:
+            cur.execute("SET LOCAL enable_seqscan = off")
+        cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql, params)
+        plan = cur.fetchone()[0]
+    conn.rollback()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def existing_indexes(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+        names = {r[0] for r in cur.fetchall()}
+    conn.rollback()
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN list-endpoint query shapes and propose indexes")
+    parser.add_argument("--natural", action="store_true", help="Leave enable_seqscan on (real plans for this data size)")
+    parser.add_argument("--emit-migration", metavar="PATH", help="Write proposed CREATE INDEX statements to PATH")
+    parser.add_argument("--apply", action="store_true", help="Create the proposed indexes now")
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report instead of a table")
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        print("DATABASE_URL not set", file=sys.stderr)
+        return 2
+
+    conn = psycopg2.connect(database_url)
+    try:
+        have = existing_indexes(conn)
+        report, proposals = [], []
+        for endpoint, label, table, sql, params, ddl in SHAPES:
+            plan = explain(conn, sql, params, args.natural)
+            findings = findings_for(plan["Plan"], table)
+            index_name = INDEX_NAME_RE.match(ddl).group(1)
+            proposed = bool(findings) and index_name not in have
+            if proposed and ddl not in proposals:
+                proposals.append(ddl)
+            report.append({
+                "endpoint": endpoint,
+                "shape": label,
+                "execution_ms": plan.get("Execution Time"),
+                "shared_hit_blocks": plan["Plan"].get("Shared Hit Blocks"),
+                "shared_read_blocks": plan["Plan"].get("Shared Read Blocks"),
+                "findings": findings,
+                "proposed_index": index_name if proposed else None,
+                "index_present": index_name in have,
+            })
+
+        if args.apply and proposals:
+            with conn.cursor() as cur:
+                for ddl in proposals:
+                    cur.execute(ddl)
+            conn.commit()
+    finally:
+        conn.close()
+
+    if args.emit_migration and proposals:
+        with open(args.emit_migration, "w") as f:
+            f.write("-- Generated by scripts/index_advisor.py\n")
+            f.write("-- Indexes for list-endpoint query shapes that planned a seq scan or sort.\n\n")
+            for ddl in proposals:
+                f.write(ddl + ";\n")
+
+    if args.json:
+        print(json.dumps({"natural": args.natural, "shapes": report, "proposals": proposals}, indent=2))
+        return 0
+
+    print("INDEX ADVISOR (%s planner)" % ("natural" if args.natural else "enable_seqscan=off"))
+    for r in report:
+        status = "OK" if not r["findings"] else "FLAG"
+        print("%-4s %-28s %-22s %8.3f ms  %s" % (
+            status, r["endpoint"], r["shape"], r["execution_ms"] or 0.0,
+            "; ".join(r["findings"]) or ("index present" if r["index_present"] else ""),
+        ))
+    if proposals:
+        print("\nProposed indexes%s:" % (" (applied)" if args.apply else ""))
+        for ddl in proposals:
+            print("  " + ddl + ";")
+        if args.emit_migration:
+            print("Migration written to %s" % args.emit_migration)
+    else:
+        print("\nNo missing indexes for the replayed shapes.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Prepared Statement Benchmark — plain execute vs server-side PREPARE/EXECUTE
+Runs each registered hot statement (server/prepared.py) N times both ways on one
+connection and reports mean round-trip time plus the planning time Postgres
+reports via EXPLAIN (ANALYZE, SUMMARY). Audit inserts run inside a transaction
+that is rolled back, so nothing is written.
+Run: DATABASE_URL=... python scripts/prepared_stmt_bench.py --iterations 2000
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import psycopg2
+
+from server.db import PooledConnection
+from server.prepared import STATEMENTS, execute_prepared
+
+WS = "ws_SEED0100000000000000000000"
+USER = "usr_SEED0100000000000000000000"
+
+PLANNING_RE = re.compile(r"Planning Time: ([0-9.]+) ms")
+
+
+def params_for(name, i):
+    if name == "workspace_role":
+        return (USER, WS)
+    if name == "workspace_exists":
+        return (WS,)
+    return ("aud_BENCH%020d" % i, WS, "BENCHMARK", USER, "analyst",
+            "2026-01-01T00:00:00+00:00", None, None, None,
+            None, None, None, None, "{}")
+
+
+def timed(conn, fn, iterations):
+    t0 = time.perf_counter()
+    with conn.cursor() as cur:
+        for i in range(iterations):
+            fn(cur, i)
+    elapsed = time.perf_counter() - t0
+    conn.rollback()
+    return elapsed * 1000.0 / iterations
+
+
+def planning_ms(conn, name, prepared):
+    with conn.cursor() as cur:
+        sql = STATEMENTS[name]
+        if prepared:
+            # Warm past Postgres' five custom plans so the generic plan is cached.
+            for i in range(6):
+                execute_prepared(cur, name, params_for(name, i))
+            args = ", ".join(["%s"] * len(params_for(name, 0)))
+            cur.execute("EXPLAIN (ANALYZE, SUMMARY) EXECUTE %s (%s)" % (name, args), params_for(name, 99))
+        else:
+            cur.execute("EXPLAIN (ANALYZE, SUMMARY) " + sql, params_for(name, 99))
+        plan = "\n".join(r[0] for r in cur.fetchall())
+    conn.rollback()
+    m = PLANNING_RE.search(plan)
+    return float(m.group(1)) if m else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prepared vs plain hot statements")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report instead of a table")
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        print("DATABASE_URL not set", file=sys.stderr)
+        return 2
+
+    conn = psycopg2.connect(database_url, connection_factory=PooledConnection)
+    reports = []
+    try:
+        for name in STATEMENTS:
+            plain = timed(conn, lambda cur, i: cur.execute(STATEMENTS[name], params_for(name, i)), args.iterations)
+            prepared = timed(conn, lambda cur, i: execute_prepared(cur, name, params_for(name, i)), args.iterations)
+            reports.append({
+                "statement": name,
+                "iterations": args.iterations,
+                "plain_ms": round(plain, 4),
+                "prepared_ms": round(prepared, 4),
+                "speedup": round(plain / prepared, 2) if prepared else None,
+                "plain_planning_ms": planning_ms(conn, name, prepared=False),
+                "prepared_planning_ms": planning_ms(conn, name, prepared=True),
+            })
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps({"results": reports}, indent=2))
+        return 0
+
+    print("PREPARED STATEMENT BENCHMARK (%d iterations each)" % args.iterations)
+    print("%-18s %10s %12s %8s %14s %14s" % ("statement", "plain ms", "prepared ms", "speedup", "plan ms plain", "plan ms prep"))
+    for r in reports:
+        print("%-18s %10.4f %12.4f %8s %14s %14s" % (
+            r["statement"], r["plain_ms"], r["prepared_ms"], r["speedup"],
+            r["plain_planning_ms"], r["prepared_planning_ms"],
+        ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
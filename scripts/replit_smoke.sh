@@ -5,6 +5,7 @@
 #   bash scripts/replit_smoke.sh --edge        # strict (edge-case pack)
 #   bash scripts/replit_smoke.sh --allow-diff  # baseline; allows diff (prints warning)
 #   bash scripts/replit_smoke.sh --edge --allow-diff  # edge-case pack + allow diff
+#   RUN_LOCAL_DAEMON=/tmp/run_local.sock bash scripts/replit_smoke.sh  # preview via a warm run_local --serve daemon
 
 set -euo pipefail
 
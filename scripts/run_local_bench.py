@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+run_local Benchmark — rule evaluation cost in the offline preview harness
+Builds a synthetic standardized dataset and Salesforce rule set, then times
+WHEN matching per account x rule three ways: re-normalizing the expected values
+on every call (operator_match), running every compiled plan (compile_rules),
+and the field-indexed dispatch (build_dispatch_index / matching_plans), plus a
+full evaluate_rules pass. With --dataset it instead compares the row and
+columnar engines end to end on a real extract scaled up --scale times, and
+with --patch-changes it times merge_base_patch on synthetic patches.
+Run: python scripts/run_local_bench.py --accounts 2000 --rules 10,100,1000
+     python scripts/run_local_bench.py --dataset examples/datasets/ostereo_demo_v1.json --scale 100
+     python scripts/run_local_bench.py --patch-changes 1000,10000 --rules 1000
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "local_runner"))
+
+import run_local  # noqa: E402
+
+OPERATORS = ["IN", "EQ", "NEQ", "CONTAINS", "EXISTS", "NOT_EXISTS"]
+SUBTYPES = ["record_label", "label", "artist", "publisher", "distributor", "n/a", ""]
+COUNTRIES = ["United States", "United Kingdom", "Pakistan", "Germany", "N/A"]
+
+
+def synthetic_dataset(n_accounts, seed=7):
+    rng = random.Random(seed)
+    accounts, catalog = [], []
+    for i in range(n_accounts):
+        key = {"contract_key": "ck:%06d" % i, "file_url": "https://example.org/%d.pdf" % i, "file_name": "%d.pdf" % i}
+        accounts.append(dict(key, subtype=rng.choice(SUBTYPES), billing_country=rng.choice(COUNTRIES)))
+        if rng.random() < 0.8:
+            catalog.append(dict(key, artist_name=rng.choice(["Some Artist", "", "N/A"]), track_title="t%d" % i))
+    return {"standardized_dataset": {"sheets": {"accounts": {"rows": accounts}, "catalog": {"rows": catalog}}}}
+
+
+# Extract sheet columns -> standardized field names used by the synthetic rules
+DEMO_FIELDS = {
+    "File_Name_c": "file_name",
+    "File_URL_c": "file_url",
+    "Account_Type_c": "subtype",
+    "Billing_Country_c": "billing_country",
+    "Artist_Name_c": "artist_name",
+}
+
+
+def scaled_dataset(path, scale):
+    """Standardized dataset built from an extract's Accounts/Catalog sheets, copied *scale* times."""
+    with open(path, "r", encoding="utf-8") as f:
+        src = json.load(f)
+    if "standardized_dataset" in src:
+        sheets = src["standardized_dataset"]["sheets"]
+        accounts, catalog = sheets["accounts"]["rows"], sheets["catalog"]["rows"]
+    else:
+        def convert(rows):
+            return [{DEMO_FIELDS.get(k, k.lower()): v for k, v in row.items()} for row in rows]
+        accounts, catalog = convert(src["sheets"]["Accounts"]["rows"]), convert(src["sheets"]["Catalog"]["rows"])
+
+    def copies(rows):
+        out = []
+        for n in range(scale):
+            for row in rows:
+                row = dict(row)
+                for key in ("contract_key", "file_url", "file_name"):
+                    if row.get(key):
+                        row[key] = "%s#%d" % (row[key], n)
+                out.append(row)
+        return out
+    return {"standardized_dataset": {"sheets": {"accounts": {"rows": copies(accounts)}, "catalog": {"rows": copies(catalog)}}}}
+
+
+def compare_engines(std, rule_counts, selective):
+    n_accounts = len(std["standardized_dataset"]["sheets"]["accounts"]["rows"])
+    print("RUN_LOCAL ENGINE BENCHMARK — %d accounts" % n_accounts)
+    print("%8s %12s %12s  %s" % ("rules", "row", "columnar", "identical"))
+    for n_rules in rule_counts:
+        cfg = {"version": "bench", "salesforce_rules": {"rules": synthetic_rules(n_rules, selective)}}
+        timings, outputs = [], []
+        for engine in run_local.ENGINES:
+            t0 = time.perf_counter()
+            result = run_local.evaluate_rules(cfg, std, False, engine=engine)
+            timings.append(time.perf_counter() - t0)
+            outputs.append(json.dumps(result, ensure_ascii=False, indent=2))
+        print("%8d %11.3fs %11.3fs  %s" % (n_rules, timings[0], timings[1], outputs[0] == outputs[1]))
+
+
+def synthetic_rules(n_rules, selective=False, seed=11):
+    rng = random.Random(seed)
+    rules = []
+    for i in range(n_rules):
+        operator = rng.choice(OPERATORS)
+        field = rng.choice(["subtype", "billing_country"])
+        pool = SUBTYPES if field == "subtype" else COUNTRIES
+        value = rng.sample(pool, 2) if operator == "IN" else rng.choice(pool)
+        if selective:
+            operator, value = rng.choice([("EQ", "value_%d" % i), ("IN", ["value_%d" % i, pool[i % len(pool)]])])
+        rules.append({
+            "rule_id": "SF_BENCH_%05d" % i,
+            "description": "benchmark rule %d" % i,
+            "when": {"sheet": "accounts", "field": field, "operator": operator, "value": value},
+            "then": [{"action": "REQUIRE_BLANK", "sheet": "catalog", "field": "artist_name", "severity": "warning"}],
+        })
+    return rules
+
+
+def synthetic_patch(n_changes, n_rules, seed=13):
+    """Patch of *n_changes* add/deprecate changes, half of them hitting existing rule ids."""
+    rng = random.Random(seed)
+    changes = []
+    for i in range(n_changes):
+        rid = "SF_BENCH_%05d" % rng.randrange(n_rules) if rng.random() < 0.5 else "SF_PATCH_%05d" % i
+        if rng.random() < 0.8:
+            rule = synthetic_rules(1, seed=i)[0]
+            rule["rule_id"] = rid
+            changes.append({"action": "add_rule", "target": "salesforce_rules", "rule": rule})
+        else:
+            changes.append({"action": "deprecate_rule", "target": "salesforce_rules", "rule_id": rid,
+                            "reason": rng.choice(["superseded", "deprecated"])})
+    return {"changes": changes}
+
+
+def time_merge(change_counts, n_rules):
+    base = {"version": "bench", "salesforce_rules": {"rules": synthetic_rules(n_rules)}, "deprecated_rules": []}
+    print("MERGE_BASE_PATCH BENCHMARK — %d base rules" % n_rules)
+    print("%8s %12s %8s %8s" % ("changes", "merge", "rules", "deprecated"))
+    for n_changes in change_counts:
+        patch = synthetic_patch(n_changes, n_rules)
+        t0 = time.perf_counter()
+        merged = run_local.merge_base_patch(base, patch)
+        elapsed = time.perf_counter() - t0
+        print("%8d %11.3fs %8d %8d" % (
+            n_changes, elapsed, len(merged["salesforce_rules"]["rules"]), len(merged["deprecated_rules"]),
+        ))
+
+
+def time_matching(accounts, rules, plans):
+    t0 = time.perf_counter()
+    hits_plain = 0
+    for acc in accounts:
+        for rule in rules:
+            when = rule["when"]
+            if run_local.operator_match(acc.get(when["field"]), when["operator"], when["value"]):
+                hits_plain += 1
+    plain = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    hits_compiled = 0
+    for acc in accounts:
+        for plan in plans:
+            if plan["match"](run_local.norm_cmp(acc.get(plan["field"]))):
+                hits_compiled += 1
+    compiled = time.perf_counter() - t0
+
+    dispatch = run_local.build_dispatch_index(plans)
+    t0 = time.perf_counter()
+    hits_dispatch = 0
+    for acc in accounts:
+        hits_dispatch += len(run_local.matching_plans(dispatch, plans, acc, None))
+    dispatched = time.perf_counter() - t0
+    assert hits_plain == hits_compiled == hits_dispatch
+    return plain, compiled, dispatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark run_local rule evaluation")
+    parser.add_argument("--accounts", type=int, default=2000)
+    parser.add_argument("--rules", default="10,100,1000", help="Comma-separated rule counts")
+    parser.add_argument("--selective", action="store_true",
+                        help="Use EQ/IN rules on distinct values so few rules fire per record")
+    parser.add_argument("--dataset", help="Compare row vs columnar engines on this extract instead")
+    parser.add_argument("--scale", type=int, default=100, help="Copies of the --dataset rows")
+    parser.add_argument("--patch-changes", help="Comma-separated patch sizes; times merge_base_patch "
+                                                "against a base of --rules rules instead")
+    args = parser.parse_args()
+    rule_counts = [int(n) for n in args.rules.split(",") if n]
+
+    if args.patch_changes:
+        time_merge([int(n) for n in args.patch_changes.split(",") if n], rule_counts[-1])
+        return 0
+
+    if args.dataset:
+        compare_engines(scaled_dataset(args.dataset, args.scale), rule_counts, args.selective)
+        return 0
+
+    std = synthetic_dataset(args.accounts)
+    accounts = std["standardized_dataset"]["sheets"]["accounts"]["rows"]
+
+    print("RUN_LOCAL RULE BENCHMARK — %d accounts" % args.accounts)
+    print("%8s %12s %12s %14s %14s" % ("rules", "match_plain", "match_plan", "match_dispatch", "evaluate_rules"))
+    for n_rules in rule_counts:
+        rules = synthetic_rules(n_rules, args.selective)
+        t0 = time.perf_counter()
+        plans = run_local.compile_rules(rules)
+        compile_s = time.perf_counter() - t0
+        plain, compiled, dispatched = time_matching(accounts, rules, plans)
+
+        cfg = {"version": "bench", "salesforce_rules": {"rules": rules}}
+        t0 = time.perf_counter()
+        run_local.evaluate_rules(cfg, std, False)
+        full = time.perf_counter() - t0
+
+        print("%8d %11.3fs %11.3fs %13.3fs %13.3fs   (compile %.1f ms)" % (
+            n_rules, plain, compiled, dispatched, full, compile_s * 1000.0,
+        ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
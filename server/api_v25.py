@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 
 from fastapi import APIRouter
 
-from server.db import check_health
+from server.db import check_health, get_pool_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -22,13 +22,15 @@ def envelope(data, request_id=None):
     return {"data": data, "meta": _meta(request_id)}
 
 
-def collection_envelope(data, cursor=None, has_more=False, limit=50, request_id=None):
+def collection_envelope(data, cursor=None, has_more=False, limit=50, request_id=None, total=None):
     meta = _meta(request_id)
     meta["pagination"] = {
         "cursor": cursor,
         "has_more": has_more,
         "limit": limit,
     }
+    if total is not None:
+        meta["pagination"]["total"] = total
     return {"data": data, "meta": meta}
 
 
@@ -43,7 +45,11 @@ def error_envelope(code, message, details=None, request_id=None):
 def health_check():
     db_ok = check_health()
     if db_ok:
-        return {"status": "ok", "db": "connected", "version": "2.5.0"}
+        from server.audit import get_audit_queue_metrics
+        return {
+            "status": "ok", "db": "connected", "version": "2.5.0",
+            "pool": get_pool_metrics(), "audit_queue": get_audit_queue_metrics(),
+        }
     else:
         from fastapi.responses import JSONResponse
         return JSONResponse(
@@ -1,19 +1,43 @@
 import json
 import logging
+import os
+import queue
+import threading
 from datetime import datetime, timezone
 
+from psycopg2.extras import execute_values
+
+from server.prepared import execute_prepared
 from server.ulid import generate_id
 
 logger = logging.getLogger(__name__)
 
+BEST_EFFORT_QUEUE_MAX = int(os.environ.get("AUDIT_QUEUE_MAX", "10000"))
+BEST_EFFORT_BATCH = int(os.environ.get("AUDIT_QUEUE_BATCH", "500"))
+BEST_EFFORT_LINGER_SECONDS = float(os.environ.get("AUDIT_QUEUE_LINGER_SECONDS", "0.5"))
 
-def emit_audit_event(cur, workspace_id, event_type, actor_id,
-                     resource_type=None, resource_id=None,
-                     detail=None, actor_role=None,
-                     batch_id=None, patch_id=None, dataset_id=None,
-                     record_id=None, field_key=None,
-                     before_value=None, after_value=None,
-                     timestamp_iso=None):
+_FLUSH_SQL = """INSERT INTO audit_events
+   (id, workspace_id, event_type, actor_id, actor_role,
+    timestamp_iso, dataset_id, batch_id, record_id,
+    field_key, patch_id, before_value, after_value, metadata)
+   VALUES %s"""
+_FLUSH_TEMPLATE = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb)"
+
+_queue = queue.Queue(maxsize=BEST_EFFORT_QUEUE_MAX)
+_worker = None
+_worker_lock = threading.Lock()
+_stop = threading.Event()
+_metrics_lock = threading.Lock()
+_queue_metrics = {"enqueued": 0, "dropped": 0, "flushed": 0, "flush_failures": 0}
+
+
+def _audit_row(workspace_id, event_type, actor_id,
+               resource_type=None, resource_id=None,
+               detail=None, actor_role=None,
+               batch_id=None, patch_id=None, dataset_id=None,
+               record_id=None, field_key=None,
+               before_value=None, after_value=None,
+               timestamp_iso=None):
     audit_id = generate_id("aud_")
     if timestamp_iso is None:
         timestamp_iso = datetime.now(timezone.utc).isoformat()
@@ -25,14 +49,135 @@ def emit_audit_event(cur, workspace_id, event_type, actor_id,
         meta["resource_id"] = resource_id
     metadata_json = json.dumps(meta) if meta else "{}"
 
-    cur.execute(
-        """INSERT INTO audit_events
-           (id, workspace_id, event_type, actor_id, actor_role,
+    return (audit_id, workspace_id, event_type, actor_id, actor_role,
             timestamp_iso, dataset_id, batch_id, record_id,
-            field_key, patch_id, before_value, after_value, metadata)
-           VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb)""",
-        (audit_id, workspace_id, event_type, actor_id, actor_role,
-         timestamp_iso, dataset_id, batch_id, record_id,
-         field_key, patch_id, before_value, after_value, metadata_json),
+            field_key, patch_id, before_value, after_value, metadata_json)
+
+
+def emit_audit_event(cur, workspace_id, event_type, actor_id,
+                     resource_type=None, resource_id=None,
+                     detail=None, actor_role=None,
+                     batch_id=None, patch_id=None, dataset_id=None,
+                     record_id=None, field_key=None,
+                     before_value=None, after_value=None,
+                     timestamp_iso=None, best_effort=False):
+    """Record an audit event.
+
+    With AUDIT_BUFFERED=true the row is held on the connection and written by
+    one multi-row insert when the transaction commits (PooledConnection.commit),
+    so a rollback discards it along with the business writes. Events marked
+    *best_effort* (dedupe hits and similar) skip the transaction entirely and
+    go to an in-process queue drained in batches, whatever AUDIT_BUFFERED says;
+    they may be dropped under overload. The queue needs the pool, so on a
+    connection from outside it they are written inline like any other event.
+    """
+    row = _audit_row(
+        workspace_id, event_type, actor_id, resource_type, resource_id, detail, actor_role,
+        batch_id, patch_id, dataset_id, record_id, field_key, before_value, after_value, timestamp_iso,
     )
-    return audit_id
+    buffer = getattr(cur.connection, "audit_buffer", None)
+    if buffer is not None and best_effort:
+        _enqueue(row)
+    elif buffer is not None and _buffered():
+        buffer.append(row)
+    else:
+        execute_prepared(cur, "audit_insert", row)
+    return row[0]
+
+
+def _buffered():
+    from server.feature_flags import is_audit_buffered_enabled
+    return is_audit_buffered_enabled()
+
+
+def _bump(key, n=1):
+    with _metrics_lock:
+        _queue_metrics[key] += n
+
+
+def flush_audit_rows(cur, rows):
+    """Insert buffered audit rows with a single multi-row INSERT."""
+    execute_values(cur, _FLUSH_SQL, rows, template=_FLUSH_TEMPLATE, page_size=max(len(rows), 1))
+
+
+def _enqueue(row):
+    _ensure_worker()
+    try:
+        _queue.put_nowait(row)
+        _bump("enqueued")
+    except queue.Full:
+        _bump("dropped")
+        logger.warning("Audit queue full, dropped %s event %s", row[2], row[0])
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _stop.clear()
+            _worker = threading.Thread(target=_drain_loop, name="audit-queue", daemon=True)
+            _worker.start()
+
+
+def _next_batch(block=True):
+    batch = []
+    try:
+        batch.append(_queue.get(timeout=BEST_EFFORT_LINGER_SECONDS) if block else _queue.get_nowait())
+    except queue.Empty:
+        return batch
+    while len(batch) < BEST_EFFORT_BATCH:
+        try:
+            batch.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _write_batch(rows):
+    from server.db import get_conn, put_conn, LANE_LONG
+    conn = get_conn(lane=LANE_LONG)
+    try:
+        with conn.cursor() as cur:
+            flush_audit_rows(cur, rows)
+        conn.commit()
+        _bump("flushed", len(rows))
+    except Exception as e:
+        conn.rollback()
+        _bump("flush_failures")
+        logger.error("Audit queue flush of %d events failed: %s", len(rows), e)
+    finally:
+        put_conn(conn)
+
+
+def _drain_loop():
+    while not _stop.is_set():
+        batch = _next_batch()
+        if batch:
+            try:
+                _write_batch(batch)
+            except Exception as e:
+                _bump("flush_failures")
+                logger.error("Audit queue flush of %d events failed: %s", len(batch), e)
+
+
+def stop_audit_worker(timeout=5.0):
+    """Stop the queue worker and flush whatever is still queued (call before close_pool)."""
+    global _worker
+    _stop.set()
+    if _worker is not None:
+        _worker.join(timeout)
+        _worker = None
+    while True:
+        batch = _next_batch(block=False)
+        if not batch:
+            break
+        _write_batch(batch)
+
+
+def get_audit_queue_metrics():
+    with _metrics_lock:
+        snapshot = dict(_queue_metrics)
+    snapshot["queued"] = _queue.qsize()
+    return snapshot
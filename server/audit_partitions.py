@@ -0,0 +1,161 @@
+"""
+Monthly partitions of audit_events (migration 018): creation, archival, pruning.
+
+audit_events is range-partitioned on timestamp_iso. Three pieces keep it healthy:
+
+- ensure_partitions() creates the current month plus AUDIT_PARTITION_MONTHS_AHEAD
+  future months (run at startup and from cron), so inserts never land in
+  audit_events_default.
+- archive_partitions() detaches months older than the retention window, writes
+  each one to <archive_dir>/<partition>.csv.gz via COPY, then drops it.
+- id_lower_bound() / id_window() turn an aud_ ULID into timestamp_iso bounds so
+  the id-ordered list, SSE tail and single-event lookups prune to the relevant
+  months. Audit ids and timestamp_iso are both taken from the app clock in
+  emit_audit_event, so a small skew allowance covers the gap.
+
+The primary key is (id, timestamp_iso), because it has to include the partition
+key. Migration 020 adds a CHECK that keeps timestamp_iso within ID_CLOCK_SKEW of
+the time in the id, and migration 021 makes it reject any id that is not an
+uppercase aud_ ULID. That bounds each id to one narrow timestamp_iso slice, which
+is what makes the pruning above safe. Within the slice, ids stay unique through
+the random bits of the ULID.
+
+CLI:
+    python -m server.audit_partitions --ensure
+    python -m server.audit_partitions --archive --retain-months 24 --archive-dir /var/archive/audit
+"""
+import argparse
+import gzip
+import logging
+import os
+import re
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+from server.ulid import id_timestamp_ms
+
+logger = logging.getLogger(__name__)
+
+MONTHS_AHEAD = int(os.environ.get("AUDIT_PARTITION_MONTHS_AHEAD", "3"))
+RETAIN_MONTHS = int(os.environ.get("AUDIT_RETAIN_MONTHS", "24"))
+ARCHIVE_DIR = os.environ.get("AUDIT_ARCHIVE_DIR", "archive/audit_events")
+ID_CLOCK_SKEW = timedelta(minutes=5)  # also hard-coded in migration 021's CHECK
+
+_PARTITION_NAME = re.compile(r"^audit_events_(\d{4})_(\d{2})$")
+
+
+def _add_months(d, months):
+    total = d.year * 12 + (d.month - 1) + months
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def id_lower_bound(audit_id):
+    """Earliest timestamp_iso an event with id > *audit_id* can carry, or None if undecodable."""
+    ms = id_timestamp_ms(audit_id) if audit_id else None
+    if ms is None:
+        return None
+    now = datetime.now(timezone.utc)
+    if ms / 1000.0 > (now + ID_CLOCK_SKEW).timestamp():
+        return None
+    return datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc) - ID_CLOCK_SKEW
+
+
+def id_window(audit_id):
+    """(lo, hi) timestamp_iso range for the event *audit_id*, or None if undecodable."""
+    lo = id_lower_bound(audit_id)
+    if lo is None:
+        return None
+    return lo, lo + 2 * ID_CLOCK_SKEW
+
+
+def list_partitions(cur):
+    """Monthly partitions of audit_events as [(month_start date, name)], oldest first."""
+    cur.execute(
+        """SELECT c.relname
+           FROM pg_inherits i
+           JOIN pg_class c ON c.oid = i.inhrelid
+           JOIN pg_class p ON p.oid = i.inhparent
+           WHERE p.relname = 'audit_events'"""
+    )
+    parts = []
+    for (name,) in cur.fetchall():
+        m = _PARTITION_NAME.match(name)
+        if m:
+            parts.append((date(int(m.group(1)), int(m.group(2)), 1), name))
+    parts.sort()
+    return parts
+
+
+def ensure_partitions(cur, months_ahead=MONTHS_AHEAD, today=None):
+    """Create this month's and the next *months_ahead* monthly partitions. Returns their names."""
+    month = (today or date.today()).replace(day=1)
+    names = []
+    for i in range(months_ahead + 1):
+        cur.execute("SELECT audit_events_ensure_partition(%s)", (_add_months(month, i),))
+        names.append(cur.fetchone()[0])
+    return names
+
+
+def archive_partitions(cur, retain_months=RETAIN_MONTHS, archive_dir=ARCHIVE_DIR, today=None):
+    """Detach, archive to gzip CSV and drop partitions older than *retain_months*.
+
+    Returns [(partition name, archive path, row count)]. Each partition is
+    written and fsynced before it is dropped; commit after every call.
+    """
+    cutoff = _add_months((today or date.today()).replace(day=1), -retain_months)
+    os.makedirs(archive_dir, exist_ok=True)
+    archived = []
+    for month, name in list_partitions(cur):
+        if month >= cutoff:
+            break
+        cur.execute('ALTER TABLE audit_events DETACH PARTITION "%s"' % name)
+        path = os.path.join(archive_dir, "%s.csv.gz" % name)
+        with gzip.open(path + ".tmp", "wb") as f:
+            cur.copy_expert('COPY "%s" TO STDOUT WITH (FORMAT csv, HEADER true)' % name, f)
+        with open(path + ".tmp", "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        cur.execute('SELECT COUNT(*) FROM "%s"' % name)
+        rows = cur.fetchone()[0]
+        cur.execute('DROP TABLE "%s"' % name)
+        logger.info("Archived %s (%d rows) to %s", name, rows, path)
+        archived.append((name, path, rows))
+    return archived
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain audit_events monthly partitions")
+    parser.add_argument("--ensure", action="store_true", help="Create current and upcoming monthly partitions")
+    parser.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD)
+    parser.add_argument("--archive", action="store_true", help="Detach, archive and drop expired partitions")
+    parser.add_argument("--retain-months", type=int, default=RETAIN_MONTHS)
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    args = parser.parse_args()
+    if not (args.ensure or args.archive):
+        parser.print_help()
+        return 2
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    from server.db import init_pool, get_conn, put_conn, close_pool
+    init_pool(min_conn=1, max_conn=2)
+    conn = get_conn()
+    try:
+        with conn.cursor() as cur:
+            if args.ensure:
+                names = ensure_partitions(cur, args.months_ahead)
+                logger.info("audit_events partitions present: %s", ", ".join(names))
+            if args.archive:
+                archived = archive_partitions(cur, args.retain_months, args.archive_dir)
+                logger.info("Archived %d partition(s)", len(archived))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        put_conn(conn)
+        close_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,8 @@ from typing import Optional
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
-from server.db import get_conn, put_conn
+from server.db import get_conn, helper_conn, put_conn
+from server.prepared import execute_prepared
 from server.api_v25 import error_envelope
 
 logger = logging.getLogger(__name__)
@@ -66,16 +67,12 @@ def _resolve_bearer(token):
     if jwt_payload:
         user_id = jwt_payload.get("sub") or jwt_payload.get("user_id")
         if user_id:
-            conn = get_conn()
-            try:
-                with conn.cursor() as cur:
-                    cur.execute("SELECT status FROM users WHERE id = %s", (user_id,))
-                    row = cur.fetchone()
-                    if row and row[0] == "inactive":
-                        logger.info("JWT user %s is inactive, denying access", user_id)
-                        return None
-            finally:
-                put_conn(conn)
+            with helper_conn() as conn, conn.cursor() as cur:
+                cur.execute("SELECT status FROM users WHERE id = %s", (user_id,))
+                row = cur.fetchone()
+                if row and row[0] == "inactive":
+                    logger.info("JWT user %s is inactive, denying access", user_id)
+                    return None
         return AuthResult(
             user_id=user_id,
             email=jwt_payload.get("email"),
@@ -85,37 +82,34 @@ def _resolve_bearer(token):
             auth_type="bearer",
         )
 
-    conn = get_conn()
-    try:
-        with conn.cursor() as cur:
+    with helper_conn() as conn, conn.cursor() as cur:
+        cur.execute(
+            "SELECT id, email, display_name, status FROM users WHERE id = %s",
+            (token,),
+        )
+        row = cur.fetchone()
+        if not row:
             cur.execute(
-                "SELECT id, email, display_name, status FROM users WHERE id = %s",
+                "SELECT id, email, display_name, status FROM users WHERE email = %s",
                 (token,),
             )
             row = cur.fetchone()
-            if not row:
-                cur.execute(
-                    "SELECT id, email, display_name, status FROM users WHERE email = %s",
-                    (token,),
-                )
-                row = cur.fetchone()
-            if row:
-                if len(row) > 3 and row[3] == "inactive":
-                    return None
-                return AuthResult(
-                    user_id=row[0],
-                    email=row[1],
-                    display_name=row[2],
-                    auth_type="bearer",
-                )
-        return None
-    finally:
-        put_conn(conn)
+        if row:
+            if len(row) > 3 and row[3] == "inactive":
+                return None
+            return AuthResult(
+                user_id=row[0],
+                email=row[1],
+                display_name=row[2],
+                auth_type="bearer",
+            )
+    return None
 
 
 def _resolve_api_key(key_value):
     key_hash = hashlib.sha256(key_value.encode("utf-8")).hexdigest()
-    conn = get_conn()
+    # Commits its own last_used_at update, so it must not share the handler's transaction
+    conn = get_conn(shared=False)
     try:
         with conn.cursor() as cur:
             cur.execute(
@@ -214,19 +208,12 @@ def resolve_auth(request: Request):
 
 
 def get_workspace_role(user_id, workspace_id):
-    conn = get_conn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT role FROM user_workspace_roles WHERE user_id = %s AND workspace_id = %s",
-                (user_id, workspace_id),
-            )
-            row = cur.fetchone()
-            if row:
-                return row[0]
-        return None
-    finally:
-        put_conn(conn)
+    with helper_conn() as conn, conn.cursor() as cur:
+        execute_prepared(cur, "workspace_role", (user_id, workspace_id))
+        row = cur.fetchone()
+        if row:
+            return row[0]
+    return None
 
 
 def has_minimum_role(user_role, required_role):
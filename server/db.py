@@ -1,13 +1,230 @@
 import os
+import time
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+import contextvars
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
 
 import psycopg2
+import psycopg2.extensions
 from psycopg2 import pool
 
 logger = logging.getLogger(__name__)
 
 _pool = None
+_async_pool = None
+
+IDLE_CHECK_SECONDS = float(os.environ.get("DB_POOL_IDLE_CHECK_SECONDS", "30"))
+MAX_LIFETIME_SECONDS = float(os.environ.get("DB_POOL_MAX_LIFETIME_SECONDS", "1800"))
+ACQUIRE_TIMEOUT_SECONDS = float(os.environ.get("DB_POOL_ACQUIRE_TIMEOUT_SECONDS", "5"))
+MAX_WAITERS = int(os.environ.get("DB_POOL_MAX_WAITERS", "64"))
+LONG_LANE_CONN = int(os.environ.get("DB_POOL_LONG_CONN", "3"))
+
+LANE_SHORT = "short"
+LANE_LONG = "long"
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    "checkouts": 0,
+    "shared_checkouts": 0,
+    "connects": 0,
+    "waits": 0,
+    "wait_time_ms": 0.0,
+    "pings": 0,
+    "ping_failures": 0,
+    "recycles": 0,
+    "exhausted": 0,
+    "in_use": 0,
+}
+
+
+def _bump(key, amount=1):
+    with _metrics_lock:
+        _metrics[key] += amount
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when no connection could be acquired within the acquire timeout."""
+
+    def __init__(self, lane, retry_after=None):
+        super().__init__("Connection pool saturated (lane=%s)" % lane)
+        self.lane = lane
+        self.retry_after = retry_after if retry_after is not None else max(1, int(round(ACQUIRE_TIMEOUT_SECONDS)))
+
+
+class _Lane:
+    """FIFO gate capping how many pooled connections one class of work may hold.
+
+    Waiters queue in arrival order and a released slot is handed directly to the
+    oldest waiter, so a burst of new requests cannot starve earlier ones.
+    """
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self._free = size
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self._stats = {"acquired": 0, "queued": 0, "timeouts": 0, "rejected": 0}
+
+    def acquire(self, timeout):
+        with self._lock:
+            if self._free > 0 and not self._waiters:
+                self._free -= 1
+                self._stats["acquired"] += 1
+                return
+            if timeout <= 0 or len(self._waiters) >= MAX_WAITERS:
+                self._stats["rejected"] += 1
+                _bump("exhausted")
+                raise PoolSaturatedError(self.name)
+            granted = threading.Event()
+            self._waiters.append(granted)
+            self._stats["queued"] += 1
+
+        t0 = time.monotonic()
+        granted.wait(timeout)
+        with self._lock:
+            if not granted.is_set():
+                self._waiters.remove(granted)
+                self._stats["timeouts"] += 1
+                _bump("exhausted")
+                raise PoolSaturatedError(self.name)
+            self._stats["acquired"] += 1
+        with _metrics_lock:
+            _metrics["waits"] += 1
+            _metrics["wait_time_ms"] += (time.monotonic() - t0) * 1000.0
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()
+            else:
+                self._free += 1
+
+    def snapshot(self):
+        with self._lock:
+            snap = dict(self._stats)
+            snap["size"] = self.size
+            snap["in_use"] = self.size - self._free
+            snap["waiting"] = len(self._waiters)
+        return snap
+
+
+_lanes = {}
+
+
+class RequestConnection:
+    """One lazily checked-out connection shared by auth, role checks and the handler of a request."""
+
+    def __init__(self):
+        self.conn = None
+        self.active = True
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self.conn is not None and self.conn.closed:
+                self._return()
+            if self.conn is None:
+                self.conn = _get_lane_conn(LANE_SHORT)
+                self.conn.request_holder = self
+            else:
+                _bump("shared_checkouts")
+            return self.conn
+
+    def release(self):
+        with self._lock:
+            self.active = False
+            self._return()
+
+    def discard(self, conn):
+        """put_conn(conn, close=True) on the shared connection: close it; the next get() checks out a fresh one."""
+        with self._lock:
+            if self.conn is conn:
+                self._return(close=True)
+
+    def _return(self, close=False):
+        conn, self.conn = self.conn, None
+        if conn is not None:
+            conn.request_holder = None
+            put_conn(conn, close=close)
+
+
+_request_conn = contextvars.ContextVar("request_conn", default=None)
+
+
+async def request_connection():
+    """App-wide FastAPI dependency that scopes short-lane get_conn() calls to the request.
+
+    Nothing is checked out until the first get_conn(); the connection goes back to
+    the pool (rolled back if a transaction is still open) when the dependency exits.
+    Code that outlives the request, such as a streaming body, falls back to
+    ordinary checkouts because the holder is marked inactive on release.
+
+    The handler owns the shared connection's transaction: its commit() or
+    rollback() is the only one. Helpers called along the way must not end it;
+    read-only ones use helper_conn(), and ones that commit their own writes
+    check out with get_conn(shared=False). async_conn() blocks nest in the
+    handler's transaction under a savepoint.
+    """
+    holder = RequestConnection()
+    _request_conn.set(holder)
+    try:
+        yield holder
+    finally:
+        if holder.conn is not None:
+            await asyncio.to_thread(holder.release)
+        else:
+            holder.active = False
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers when it was opened and last returned to the pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        now = time.monotonic()
+        self.created_at = now
+        self.last_used_at = now
+        self.suspect = False
+        self.lane = None
+        self.request_holder = None
+        self.prepared = set()
+        self.audit_buffer = []
+
+    def reset(self):
+        # reset() issues DISCARD ALL, which drops server-side prepared statements.
+        self.prepared.clear()
+        self.audit_buffer = []
+        super().reset()
+
+    def commit(self):
+        # Audit rows buffered by emit_audit_event (AUDIT_BUFFERED) go out as one
+        # multi-row insert inside the transaction they belong to.
+        if self.audit_buffer:
+            rows, self.audit_buffer = self.audit_buffer, []
+            from server.audit import flush_audit_rows
+            with self.cursor() as cur:
+                flush_audit_rows(cur, rows)
+        super().commit()
+
+    def rollback(self):
+        self.audit_buffer = []
+        try:
+            super().rollback()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # The link itself failed, not just a statement; validate on next checkout.
+            self.suspect = True
+            raise
+
+
+class _MeteredPool(pool.ThreadedConnectionPool):
+    def _connect(self, key=None):
+        # Only reached when no idle connection is available for the checkout.
+        _bump("connects")
+        return super()._connect(key)
 
 
 def init_pool(database_url=None, min_conn=2, max_conn=10):
@@ -16,8 +233,17 @@ def init_pool(database_url=None, min_conn=2, max_conn=10):
         database_url = os.environ.get("DATABASE_URL")
     if not database_url:
         raise RuntimeError("DATABASE_URL not set")
-    _pool = pool.ThreadedConnectionPool(min_conn, max_conn, database_url)
-    logger.info("Database connection pool initialized (min=%d, max=%d)", min_conn, max_conn)
+    _pool = _MeteredPool(min_conn, max_conn, database_url, connection_factory=PooledConnection)
+    long_size = max(1, min(LONG_LANE_CONN, max_conn // 2))
+    _lanes[LANE_SHORT] = _Lane(LANE_SHORT, max_conn - long_size)
+    _lanes[LANE_LONG] = _Lane(LANE_LONG, long_size)
+    with _metrics_lock:
+        _metrics["connects"] = 0
+    logger.info(
+        "Database connection pool initialized (min=%d, max=%d, long_lane=%d, acquire_timeout=%ss, "
+        "idle_check=%ss, max_lifetime=%ss)",
+        min_conn, max_conn, long_size, ACQUIRE_TIMEOUT_SECONDS, IDLE_CHECK_SECONDS, MAX_LIFETIME_SECONDS,
+    )
 
 
 def get_pool():
@@ -26,37 +252,199 @@ def get_pool():
     return _pool
 
 
-def get_conn():
-    p = get_pool()
-    conn = p.getconn()
+def get_pool_metrics():
+    with _metrics_lock:
+        snapshot = dict(_metrics)
+    snapshot["wait_time_ms"] = round(snapshot["wait_time_ms"], 3)
+    if _pool is not None:
+        snapshot["max_conn"] = _pool.maxconn
+    snapshot["lanes"] = {name: lane.snapshot() for name, lane in _lanes.items()}
+    return snapshot
+
+
+def _acquire(p):
+    try:
+        conn = p.getconn()
+    except pool.PoolError:
+        _bump("exhausted")
+        raise
+    with _metrics_lock:
+        _metrics["checkouts"] += 1
+        _metrics["in_use"] += 1
+    return conn
+
+
+def _discard(p, conn):
+    with _metrics_lock:
+        _metrics["in_use"] -= 1
+    try:
+        p.putconn(conn, close=True)
+    except Exception:
+        pass
+
+
+def _ping(conn):
+    _bump("pings")
     try:
-        conn.isolation_level
         with conn.cursor() as cur:
             cur.execute("SELECT 1")
             cur.fetchone()
-        if conn.status != 1:
-            raise psycopg2.OperationalError("connection not ready")
+        conn.rollback()
+        conn.suspect = False
+        return conn.status == psycopg2.extensions.STATUS_READY
     except Exception:
+        _bump("ping_failures")
+        return False
+
+
+def get_conn(lane=LANE_SHORT, shared=True):
+    """Check out a connection, queueing on *lane* for up to ACQUIRE_TIMEOUT_SECONDS.
+
+    Use ``lane=LANE_LONG`` for work that holds the connection across slow external
+    calls (Drive transfers, suggestion runs) so it cannot starve CRUD requests.
+    Raises PoolSaturatedError when the lane stays full past the timeout.
+
+    Inside a request, short-lane calls return the request's shared connection and
+    the matching put_conn() is a no-op (put_conn(conn, close=True) discards it);
+    see request_connection(). ``shared=False`` always checks out a connection of
+    its own, for helpers that commit or roll back independently of the handler.
+
+    ``async def`` code should use get_conn_async(); on the event loop thread
+    itself a full lane is not waited for and raises PoolSaturatedError at once.
+    """
+    holder = _request_conn.get()
+    if shared and lane == LANE_SHORT and holder is not None and holder.active:
+        return holder.get()
+    return _get_lane_conn(lane)
+
+
+@contextmanager
+def helper_conn():
+    """Connection for a read-only helper (auth lookups, role checks) that may run mid-request.
+
+    On the request's shared connection the helper leaves the handler's
+    transaction as it found it: with none open, the helper's statements are
+    rolled back afterwards; with one open, they run inside a SAVEPOINT; if
+    the handler's transaction has already failed, the helper gets a private
+    checkout. Outside a request this is an ordinary get_conn()/put_conn().
+    """
+    conn = get_conn()
+    if conn.request_holder is None:
         try:
-            p.putconn(conn, close=True)
-        except Exception:
-            pass
-        conn = p.getconn()
+            yield conn
+        finally:
+            put_conn(conn)
+        return
+
+    status = conn.info.transaction_status
+    if status == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+        private = get_conn(shared=False)
+        try:
+            yield private
+        finally:
+            put_conn(private)
+    elif status == psycopg2.extensions.TRANSACTION_STATUS_INTRANS:
+        with conn.cursor() as cur:
+            cur.execute("SAVEPOINT helper_conn")
+        try:
+            yield conn
+        except BaseException:
+            if conn.closed:
+                raise
+            with conn.cursor() as cur:
+                cur.execute("ROLLBACK TO SAVEPOINT helper_conn")
+                cur.execute("RELEASE SAVEPOINT helper_conn")
+            raise
+        with conn.cursor() as cur:
+            cur.execute("RELEASE SAVEPOINT helper_conn")
+    else:
         try:
-            conn.reset()
-        except Exception:
-            pass
+            yield conn
+        finally:
+            if not conn.closed and conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+
+
+async def get_conn_async(lane=LANE_SHORT):
+    """get_conn() for ``async def`` code: the lane wait happens in a worker thread, not on the event loop."""
+    return await asyncio.to_thread(get_conn, lane)
+
+
+def _on_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _get_lane_conn(lane):
+    p = get_pool()
+    gate = _lanes[lane]
+    # A blocking wait on the event loop thread would stall every in-flight
+    # request; there a full lane fails fast (503) instead of queueing.
+    gate.acquire(0 if _on_event_loop() else ACQUIRE_TIMEOUT_SECONDS)
+    try:
+        conn = _checkout(p)
+    except Exception:
+        gate.release()
+        raise
+    conn.lane = lane
+    return conn
+
+
+def _checkout(p):
+    conn = _acquire(p)
+
+    if not conn.closed and time.monotonic() - conn.created_at > MAX_LIFETIME_SECONDS:
+        _bump("recycles")
+        _discard(p, conn)
+        conn = _acquire(p)
+
+    if conn.closed or conn.suspect or time.monotonic() - conn.last_used_at > IDLE_CHECK_SECONDS:
+        if conn.closed or not _ping(conn):
+            _discard(p, conn)
+            conn = _acquire(p)
+            try:
+                conn.reset()
+            except Exception:
+                pass
+    # Audit rows only ever belong to the borrower's own transaction.
+    conn.audit_buffer = []
     return conn
 
 
 def put_conn(conn, close=False):
+    holder = conn.request_holder
+    if holder is not None:
+        # Shared request connection: it goes back when the request ends, unless
+        # the caller found it broken.
+        if close:
+            holder.discard(conn)
+        return
+    with _metrics_lock:
+        _metrics["in_use"] -= 1
+    lane, conn.lane = conn.lane, None
+    # Rows buffered by a transaction that never committed are discarded with it,
+    # never flushed by the next borrower's commit().
+    conn.audit_buffer = []
     try:
+        conn.last_used_at = time.monotonic()
         if conn.closed:
             get_pool().putconn(conn, close=True)
-        else:
-            get_pool().putconn(conn, close=close)
+            return
+        if conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_INTRANS:
+            # Routine end-of-request rollback (read-only handlers never commit).
+            try:
+                conn.rollback()
+            except Exception:
+                close = True
+        get_pool().putconn(conn, close=close)
     except Exception:
         pass
+    finally:
+        if lane in _lanes:
+            _lanes[lane].release()
 
 
 def close_pool():
@@ -67,6 +455,159 @@ def close_pool():
         logger.info("Database connection pool closed")
 
 
+async def init_async_pool(database_url=None, min_conn=2, max_conn=10):
+    global _async_pool
+    if database_url is None:
+        database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL not set")
+    from psycopg_pool import AsyncConnectionPool
+    _async_pool = AsyncConnectionPool(
+        database_url, min_size=min_conn, max_size=max_conn,
+        timeout=ACQUIRE_TIMEOUT_SECONDS, max_waiting=MAX_WAITERS, open=False,
+    )
+    await _async_pool.open()
+    logger.info("Async connection pool initialized (min=%d, max=%d)", min_conn, max_conn)
+
+
+def get_async_pool():
+    return _async_pool
+
+
+async def close_async_pool():
+    global _async_pool
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
+        logger.info("Async connection pool closed")
+
+
+class _ThreadedCursor:
+    """Async cursor facade over a psycopg2 cursor; statements run in a worker thread."""
+
+    def __init__(self, cur):
+        self._cur = cur
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._cur.close()
+
+    async def execute(self, sql, params=None):
+        await asyncio.to_thread(self._cur.execute, sql, params)
+
+    async def fetchone(self):
+        return self._cur.fetchone()
+
+    async def fetchall(self):
+        return self._cur.fetchall()
+
+    async def run_sync(self, fn, *args):
+        """Run ``fn(cursor, *args)`` against the underlying psycopg2 cursor in a worker thread."""
+        return await asyncio.to_thread(fn, self._cur, *args)
+
+
+class _ThreadedConnection:
+    """Async connection facade over the sync pool, used when the async pool is not running.
+
+    With *savepoint* set the block is nested in a transaction it does not own:
+    rollback() only undoes the block's own statements and commit() is left to
+    the owner.
+    """
+
+    def __init__(self, conn, savepoint=None):
+        self._conn = conn
+        self._savepoint = savepoint
+
+    def cursor(self):
+        return _ThreadedCursor(self._conn.cursor())
+
+    async def commit(self):
+        if self._savepoint is None:
+            await asyncio.to_thread(self._conn.commit)
+
+    async def rollback(self):
+        if self._savepoint is None:
+            await asyncio.to_thread(self._conn.rollback)
+        else:
+            await asyncio.to_thread(_execute, self._conn, "ROLLBACK TO SAVEPOINT %s" % self._savepoint)
+
+
+def _execute(conn, sql):
+    with conn.cursor() as cur:
+        cur.execute(sql)
+
+
+@asynccontextmanager
+async def async_conn(lane=LANE_SHORT):
+    """Check out a connection with an async cursor API.
+
+    Uses the native async pool when it has been initialized (ASYNC_DB_POOL=true),
+    otherwise a psycopg2 connection from the sync pool with each statement run in
+    a worker thread, so both paths can be load-tested side by side. Inside a
+    request the short lane reuses the request's shared connection rather than
+    taking a second slot: requests already holding one slot while waiting for
+    another would deadlock a saturated lane. On every path the block commits
+    when it exits normally and rolls back when it raises; if the shared
+    connection already has a transaction open, the block runs in a SAVEPOINT
+    instead and leaves the commit to that transaction's owner. Either way a
+    saturated pool surfaces as PoolSaturatedError.
+    """
+    if _async_pool is not None:
+        from psycopg_pool import PoolTimeout, TooManyRequests
+        try:
+            conn = await _async_pool.getconn()
+        except (PoolTimeout, TooManyRequests):
+            _bump("exhausted")
+            raise PoolSaturatedError("async")
+        try:
+            yield conn
+            await conn.commit()
+        except BaseException:
+            await conn.rollback()
+            raise
+        finally:
+            await _async_pool.putconn(conn)
+        return
+
+    holder = _request_conn.get()
+    if lane == LANE_SHORT and holder is not None and holder.active:
+        conn = await asyncio.to_thread(holder.get)
+        status = conn.info.transaction_status
+        if status == psycopg2.extensions.TRANSACTION_STATUS_INTRANS:
+            await asyncio.to_thread(_execute, conn, "SAVEPOINT async_conn")
+            try:
+                yield _ThreadedConnection(conn, savepoint="async_conn")
+            except BaseException:
+                if not conn.closed:
+                    await asyncio.to_thread(
+                        _execute, conn, "ROLLBACK TO SAVEPOINT async_conn; RELEASE SAVEPOINT async_conn")
+                raise
+            await asyncio.to_thread(_execute, conn, "RELEASE SAVEPOINT async_conn")
+            return
+        if status == psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                yield _ThreadedConnection(conn)
+                await asyncio.to_thread(conn.commit)
+            except BaseException:
+                if not conn.closed:
+                    await asyncio.to_thread(conn.rollback)
+                raise
+            return
+        # The handler's transaction has failed; leave it for the handler to roll back.
+
+    conn = await asyncio.to_thread(get_conn, lane, False)
+    try:
+        yield _ThreadedConnection(conn)
+        await asyncio.to_thread(conn.commit)
+    except BaseException:
+        await asyncio.to_thread(conn.rollback)
+        raise
+    finally:
+        await asyncio.to_thread(put_conn, conn)
+
+
 def check_health():
     try:
         conn = get_conn()
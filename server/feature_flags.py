@@ -63,3 +63,15 @@ def is_ops_view_db_read():
 
 def is_ops_view_db_write():
     return is_enabled(OPS_VIEW_DB_WRITE)
+
+
+ASYNC_DB_POOL = "ASYNC_DB_POOL"
+
+def is_async_db_pool_enabled():
+    return is_enabled(ASYNC_DB_POOL)
+
+
+AUDIT_BUFFERED = "AUDIT_BUFFERED"
+
+def is_audit_buffered_enabled():
+    return is_enabled(AUDIT_BUFFERED)
@@ -0,0 +1,63 @@
+"""
+Opt-in totals for paginated list endpoints (?include_total=estimate|exact).
+
+estimate — the planner's row estimate for the list's WHERE clause (EXPLAIN, no scan).
+exact    — COUNT(*) over at most LIST_TOTAL_CEILING + 1 rows under a short
+           statement_timeout; falls back to the estimate if the count times out.
+"""
+import os
+import json
+import logging
+
+from fastapi.responses import JSONResponse
+from server.api_v25 import error_envelope
+
+logger = logging.getLogger(__name__)
+
+TOTAL_MODES = ("estimate", "exact")
+LIST_TOTAL_CEILING = int(os.environ.get("LIST_TOTAL_CEILING", "10000"))
+LIST_TOTAL_TIMEOUT_MS = int(os.environ.get("LIST_TOTAL_TIMEOUT_MS", "500"))
+
+
+def include_total_error(include_total):
+    """Validation check returning 400 JSONResponse for an unknown include_total mode."""
+    if include_total is not None and include_total not in TOTAL_MODES:
+        return JSONResponse(
+            status_code=400,
+            content=error_envelope(
+                "VALIDATION_ERROR",
+                "include_total must be one of: %s" % ", ".join(TOTAL_MODES),
+            ),
+        )
+    return None
+
+
+async def fetch_total(cur, mode, from_sql, where, params):
+    """Total rows matching *where* (no cursor condition) as {"count", "kind", "capped"}."""
+    if mode == "exact":
+        await cur.execute("SELECT current_setting('statement_timeout')")
+        previous_timeout = (await cur.fetchone())[0]
+        await cur.execute("SAVEPOINT list_total")
+        try:
+            await cur.execute("SELECT set_config('statement_timeout', %s, true)", (str(LIST_TOTAL_TIMEOUT_MS),))
+            await cur.execute(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM %s %s LIMIT %d) t" % (from_sql, where, LIST_TOTAL_CEILING + 1),
+                params,
+            )
+            count = (await cur.fetchone())[0]
+            await cur.execute("SELECT set_config('statement_timeout', %s, true)", (previous_timeout,))
+            await cur.execute("RELEASE SAVEPOINT list_total")
+            return {
+                "count": min(count, LIST_TOTAL_CEILING),
+                "kind": "exact",
+                "capped": count > LIST_TOTAL_CEILING,
+            }
+        except Exception as e:
+            logger.info("exact total on %s fell back to estimate: %s", from_sql, e)
+            await cur.execute("ROLLBACK TO SAVEPOINT list_total")
+
+    await cur.execute("EXPLAIN (FORMAT JSON) SELECT 1 FROM %s %s" % (from_sql, where), params)
+    plan = (await cur.fetchone())[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return {"count": int(plan[0]["Plan"]["Plan Rows"]), "kind": "estimate", "capped": False}
@@ -0,0 +1,40 @@
+-- Migration 014: Materialized operations-queue counters
+-- One row per (workspace, batch, item type, author, status, custody status) holding the
+-- number of live items in that state. Maintained by the patch / RFI / correction write
+-- paths (server/queue_counters.py); role scope and queue-status mapping are applied at
+-- read time. Rebuild with: python -m server.queue_counters --rebuild
+
+CREATE TABLE IF NOT EXISTS workspace_queue_counters (
+    workspace_id TEXT NOT NULL REFERENCES workspaces(id),
+    batch_id TEXT NOT NULL DEFAULT '',
+    item_type TEXT NOT NULL CHECK (item_type IN ('patch', 'rfi', 'correction')),
+    author_id TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT '',
+    custody_status TEXT NOT NULL DEFAULT '',
+    item_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (workspace_id, batch_id, item_type, author_id, status, custody_status)
+);
+
+-- Backfill from source tables
+INSERT INTO workspace_queue_counters (workspace_id, batch_id, item_type, author_id, status, custody_status, item_count)
+SELECT p.workspace_id, COALESCE(p.batch_id, ''), 'patch', COALESCE(p.author_id, ''), COALESCE(p.status, ''), '', COUNT(*)
+FROM patches p
+WHERE p.deleted_at IS NULL
+GROUP BY 1, 2, 3, 4, 5, 6
+ON CONFLICT DO NOTHING;
+
+INSERT INTO workspace_queue_counters (workspace_id, batch_id, item_type, author_id, status, custody_status, item_count)
+SELECT r.workspace_id, COALESCE(r.batch_id, ''), 'rfi', COALESCE(r.author_id, ''), COALESCE(r.status, ''), COALESCE(r.custody_status, ''), COUNT(*)
+FROM rfis r
+WHERE r.deleted_at IS NULL
+GROUP BY 1, 2, 3, 4, 5, 6
+ON CONFLICT DO NOTHING;
+
+INSERT INTO workspace_queue_counters (workspace_id, batch_id, item_type, author_id, status, custody_status, item_count)
+SELECT c.workspace_id, COALESCE(d.batch_id, ''), 'correction', COALESCE(c.created_by, ''), COALESCE(c.status, ''), '', COUNT(*)
+FROM corrections c
+JOIN documents d ON d.id = c.document_id
+WHERE c.deleted_at IS NULL
+GROUP BY 1, 2, 3, 4, 5, 6
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,10 @@
+-- Migration 015: Batch health supporting indexes
+-- Partial indexes for the single-query batch health rollup (server/routes/batch_health.py)
+-- and the batch-scoped RFI / document lookups. Live rows only.
+
+CREATE INDEX IF NOT EXISTS idx_documents_batch_live ON documents(batch_id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_rfis_batch_live ON rfis(batch_id) WHERE deleted_at IS NULL;
+
+-- Only flagged cache rows are counted; 'ok' rows (the vast majority) stay out of the index.
+CREATE INDEX IF NOT EXISTS idx_reader_cache_document_flag ON reader_node_cache(document_id, quality_flag)
+    WHERE quality_flag IN ('suspect_mojibake', 'unreadable');
@@ -0,0 +1,5 @@
+-- Migration 016: Newest-audit-event lookup per workspace
+-- Backs the batch-health rollup ETag (latest audit id per workspace) and the SSE
+-- tail query (workspace_id = ? AND id > ? ORDER BY id), which otherwise sort.
+
+CREATE INDEX IF NOT EXISTS idx_audit_events_workspace_id ON audit_events(workspace_id, id);
@@ -0,0 +1,27 @@
+-- Migration 017: Composite / partial indexes for the generic list endpoints
+-- Proposed by scripts/index_advisor.py. Each index leads with the equality filters the
+-- endpoint generates and ends with id, so "ORDER BY id ASC LIMIT n" keyset pages are
+-- read straight off the index instead of filtered + sorted.
+
+-- list_patches: workspace (+ status | record_id | batch_id), live rows, ordered by id
+CREATE INDEX IF NOT EXISTS idx_patches_ws_live_id ON patches(workspace_id, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_patches_ws_status_live_id ON patches(workspace_id, status, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_patches_ws_record_live_id ON patches(workspace_id, record_id, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_patches_ws_batch_live_id ON patches(workspace_id, batch_id, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_patches_ws_author_live_id ON patches(workspace_id, author_id, id) WHERE deleted_at IS NULL;
+
+-- list_rfis / list_batch_rfis
+CREATE INDEX IF NOT EXISTS idx_rfis_ws_live_id ON rfis(workspace_id, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_rfis_batch_live_id ON rfis(batch_id, id) WHERE deleted_at IS NULL;
+
+-- list_audit_events: workspace + patch / batch / record filter, ordered by id
+CREATE INDEX IF NOT EXISTS idx_audit_events_ws_patch_id ON audit_events(workspace_id, patch_id, id) WHERE patch_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_audit_events_ws_batch_id ON audit_events(workspace_id, batch_id, id) WHERE batch_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_audit_events_ws_record_id ON audit_events(workspace_id, record_id, id) WHERE record_id IS NOT NULL;
+
+-- list_workspace_corrections / list_batch_corrections
+CREATE INDEX IF NOT EXISTS idx_corrections_ws_live_id ON corrections(workspace_id, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_corrections_document_live_id ON corrections(document_id, id) WHERE deleted_at IS NULL;
+
+-- list_batches
+CREATE INDEX IF NOT EXISTS idx_batches_ws_live_id ON batches(workspace_id, id) WHERE deleted_at IS NULL;
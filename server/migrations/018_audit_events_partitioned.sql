@@ -0,0 +1,91 @@
+-- Migration 018: Range-partition audit_events by month on timestamp_iso
+-- audit_events is append-only and never pruned; monthly partitions let the
+-- id-ordered list / SSE tail queries prune to recent months (the id cursor is a
+-- ULID, see server/audit_partitions.py) and let old months be detached and
+-- archived instead of deleted row by row (the append-only trigger forbids that).
+--
+-- The primary key must include the partition key, so it becomes (id, timestamp_iso).
+-- audit_events_default catches rows outside every monthly range; the
+-- partition job keeps it empty by creating months ahead of time.
+
+CREATE OR REPLACE FUNCTION audit_events_ensure_partition(month_start DATE)
+RETURNS TEXT AS $$
+DECLARE
+    lo DATE := date_trunc('month', month_start)::date;
+    hi DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::date;
+    part_name TEXT := 'audit_events_' || to_char(lo, 'YYYY_MM');
+BEGIN
+    IF to_regclass(part_name) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF audit_events FOR VALUES FROM (%L) TO (%L)',
+            part_name, lo::timestamptz, hi::timestamptz
+        );
+    END IF;
+    RETURN part_name;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    m DATE;
+    first_month DATE;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class
+        WHERE relname = 'audit_events' AND relkind = 'p'
+    ) THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE audit_events RENAME TO audit_events_unpartitioned;
+    ALTER INDEX audit_events_pkey RENAME TO audit_events_unpartitioned_pkey;
+
+    CREATE TABLE audit_events (
+        id TEXT NOT NULL,
+        workspace_id TEXT NOT NULL REFERENCES workspaces(id),
+        event_type TEXT NOT NULL,
+        actor_id TEXT,
+        actor_role TEXT,
+        timestamp_iso TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        dataset_id TEXT,
+        batch_id TEXT,
+        record_id TEXT,
+        field_key TEXT,
+        patch_id TEXT,
+        before_value TEXT,
+        after_value TEXT,
+        metadata JSONB DEFAULT '{}'::jsonb,
+        PRIMARY KEY (id, timestamp_iso)
+    ) PARTITION BY RANGE (timestamp_iso);
+
+    CREATE TABLE audit_events_default PARTITION OF audit_events DEFAULT;
+
+    SELECT date_trunc('month', COALESCE(MIN(timestamp_iso), NOW()))::date
+      INTO first_month
+      FROM audit_events_unpartitioned;
+    m := first_month;
+    WHILE m <= (date_trunc('month', NOW()) + INTERVAL '3 months')::date LOOP
+        PERFORM audit_events_ensure_partition(m);
+        m := (m + INTERVAL '1 month')::date;
+    END LOOP;
+
+    INSERT INTO audit_events SELECT * FROM audit_events_unpartitioned;
+    DROP TABLE audit_events_unpartitioned;
+END $$;
+
+-- Indexes from 001 / 016 / 017, now declared on the parent so every partition gets them
+CREATE INDEX IF NOT EXISTS idx_audit_events_workspace ON audit_events(workspace_id);
+CREATE INDEX IF NOT EXISTS idx_audit_events_type ON audit_events(workspace_id, event_type);
+CREATE INDEX IF NOT EXISTS idx_audit_events_actor ON audit_events(workspace_id, actor_id);
+CREATE INDEX IF NOT EXISTS idx_audit_events_timestamp ON audit_events(workspace_id, timestamp_iso);
+CREATE INDEX IF NOT EXISTS idx_audit_events_workspace_id ON audit_events(workspace_id, id);
+CREATE INDEX IF NOT EXISTS idx_audit_events_ws_patch_id ON audit_events(workspace_id, patch_id, id) WHERE patch_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_audit_events_ws_batch_id ON audit_events(workspace_id, batch_id, id) WHERE batch_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_audit_events_ws_record_id ON audit_events(workspace_id, record_id, id) WHERE record_id IS NOT NULL;
+
+-- Append-only rule carries over to every partition; DETACH PARTITION is not a
+-- row-level DELETE, so archival is unaffected.
+DROP TRIGGER IF EXISTS trg_audit_events_no_update ON audit_events;
+CREATE TRIGGER trg_audit_events_no_update
+    BEFORE UPDATE OR DELETE ON audit_events
+    FOR EACH ROW EXECUTE FUNCTION audit_events_immutable();
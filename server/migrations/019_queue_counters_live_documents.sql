@@ -0,0 +1,52 @@
+-- Migration 019: Count corrections only on live documents
+-- Batch health excluded corrections whose document is soft-deleted; the
+-- correction buckets of workspace_queue_counters (014) did not. Recompute
+-- them with the live-document filter, and keep them in step when a
+-- document's deleted_at or batch_id changes: the correction write paths only
+-- move individual corrections (server/queue_counters.py).
+
+DELETE FROM workspace_queue_counters WHERE item_type = 'correction';
+
+INSERT INTO workspace_queue_counters (workspace_id, batch_id, item_type, author_id, status, custody_status, item_count)
+SELECT c.workspace_id, COALESCE(d.batch_id, ''), 'correction', COALESCE(c.created_by, ''), COALESCE(c.status, ''), '', COUNT(*)
+FROM corrections c
+JOIN documents d ON d.id = c.document_id
+WHERE c.deleted_at IS NULL AND d.deleted_at IS NULL
+GROUP BY 1, 2, 3, 4, 5, 6
+ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION workspace_queue_counters_move_document(doc_id TEXT, doc_batch_id TEXT, delta INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO workspace_queue_counters (workspace_id, batch_id, item_type, author_id, status, custody_status, item_count)
+    SELECT c.workspace_id, COALESCE(doc_batch_id, ''), 'correction', COALESCE(c.created_by, ''), COALESCE(c.status, ''), '', delta * COUNT(*)
+    FROM corrections c
+    WHERE c.document_id = doc_id AND c.deleted_at IS NULL
+    GROUP BY 1, 2, 3, 4, 5, 6
+    ON CONFLICT (workspace_id, batch_id, item_type, author_id, status, custody_status) DO UPDATE
+    SET item_count = workspace_queue_counters.item_count + EXCLUDED.item_count,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION workspace_queue_counters_document_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF (OLD.deleted_at IS NULL) = (NEW.deleted_at IS NULL)
+       AND OLD.batch_id IS NOT DISTINCT FROM NEW.batch_id THEN
+        RETURN NEW;
+    END IF;
+    IF OLD.deleted_at IS NULL THEN
+        PERFORM workspace_queue_counters_move_document(OLD.id, OLD.batch_id, -1);
+    END IF;
+    IF NEW.deleted_at IS NULL THEN
+        PERFORM workspace_queue_counters_move_document(NEW.id, NEW.batch_id, 1);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_documents_queue_counters ON documents;
+CREATE TRIGGER trg_documents_queue_counters
+    AFTER UPDATE OF deleted_at, batch_id ON documents
+    FOR EACH ROW EXECUTE FUNCTION workspace_queue_counters_document_changed();
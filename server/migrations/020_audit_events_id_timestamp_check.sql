@@ -0,0 +1,52 @@
+-- Migration 020: Tie audit_events.timestamp_iso to the time encoded in its id
+-- Since 018 the primary key is (id, timestamp_iso), so the database alone no
+-- longer keeps ids globally unique, and the id-ordered list / SSE tail /
+-- single-event lookups prune partitions by turning an id into timestamp_iso
+-- bounds (server/audit_partitions.py). Both rely on this invariant:
+--
+--   timestamp_iso is within 5 minutes (audit_partitions.ID_CLOCK_SKEW) of the
+--   millisecond time in the id's ULID.
+--
+-- With it, an id can only ever land in a 10-minute slice of timestamp_iso;
+-- uniqueness within that slice comes from the 80 random bits of the ULID.
+-- Ids that do not decode as ULIDs are left unconstrained, matching
+-- id_lower_bound(), which does not prune for them.
+
+CREATE OR REPLACE FUNCTION audit_id_timestamp(audit_id TEXT)
+RETURNS TIMESTAMPTZ AS $$
+DECLARE
+    body TEXT := upper(substr(audit_id, strpos(audit_id, '_') + 1));
+    ms BIGINT := 0;
+    digit INTEGER;
+BEGIN
+    IF length(body) <> 26 THEN
+        RETURN NULL;
+    END IF;
+    FOR i IN 1..10 LOOP
+        digit := strpos('0123456789ABCDEFGHJKMNPQRSTVWXYZ', substr(body, i, 1)) - 1;
+        IF digit < 0 THEN
+            RETURN NULL;
+        END IF;
+        ms := ms * 32 + digit;
+    END LOOP;
+    IF ms > 253402300799999 THEN
+        RETURN NULL;
+    END IF;
+    RETURN to_timestamp(ms / 1000.0);
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'audit_events_id_timestamp_check'
+          AND conrelid = 'audit_events'::regclass
+    ) THEN
+        ALTER TABLE audit_events ADD CONSTRAINT audit_events_id_timestamp_check CHECK (
+            audit_id_timestamp(id) IS NULL
+            OR timestamp_iso BETWEEN audit_id_timestamp(id) - INTERVAL '5 minutes'
+                                 AND audit_id_timestamp(id) + INTERVAL '5 minutes'
+        );
+    END IF;
+END $$;
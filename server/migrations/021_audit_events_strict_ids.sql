@@ -0,0 +1,17 @@
+-- Migration 021: Require every audit_events id to be an aud_ ULID
+-- 020's CHECK left ids that do not decode as ULIDs unconstrained, and accepted
+-- lowercase ULIDs. Neither is safe for the pruning in server/audit_partitions.py:
+-- id_lower_bound() is taken from the cursor id, and a row with an undecodable
+-- or lowercase id can sort after that cursor while its timestamp_iso falls
+-- below the bound, so the id-ordered list and SSE tail would skip it.
+-- generate_id() only ever produces uppercase Crockford ULIDs, so the CHECK now
+-- rejects anything else outright.
+
+ALTER TABLE audit_events DROP CONSTRAINT IF EXISTS audit_events_id_timestamp_check;
+
+ALTER TABLE audit_events ADD CONSTRAINT audit_events_id_timestamp_check CHECK (
+    id ~ '^aud_[0-9A-HJKMNP-TV-Z]{26}$'
+    AND audit_id_timestamp(id) IS NOT NULL
+    AND timestamp_iso BETWEEN audit_id_timestamp(id) - INTERVAL '5 minutes'
+                          AND audit_id_timestamp(id) + INTERVAL '5 minutes'
+);
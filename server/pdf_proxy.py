@@ -23,22 +23,24 @@ from urllib.parse import urlparse, unquote
 from typing import Optional
 
 from pathlib import Path
-from fastapi import FastAPI, Query, HTTPException, Response
+from fastapi import FastAPI, Depends, Query, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 import httpx
 import fitz  # type: ignore[import-untyped]  # PyMuPDF
 
+from server.db import init_pool, close_pool, get_conn, put_conn, check_health, init_async_pool, close_async_pool, PoolSaturatedError, request_connection
+
 app = FastAPI(
     title="Orchestrate OS PDF Proxy",
     description="CORS-safe PDF proxy for Record Inspection with static file serving",
-    version="1.1.0"
+    version="1.1.0",
+    dependencies=[Depends(request_connection)],
 )
 
-from server.db import init_pool, close_pool, check_health
 from server.migrate import run_migrations
-from server.api_v25 import router as api_v25_router
+from server.api_v25 import router as api_v25_router, error_envelope
 from server.routes.workspaces import router as workspaces_router
 from server.routes.batches import router as batches_router
 from server.routes.patches import router as patches_router
@@ -66,7 +68,8 @@ from server.routes.suggestions import router as suggestions_router
 from server.routes.glossary import router as glossary_router
 from server.routes.preflight import router as preflight_router
 from server.routes.operations_queue import router as operations_queue_router
-from server.feature_flags import is_enabled, EVIDENCE_INSPECTOR, is_preflight_enabled, is_ops_view_db_read, is_ops_view_db_write
+from server.feature_flags import is_enabled, EVIDENCE_INSPECTOR, is_preflight_enabled, is_ops_view_db_read, is_ops_view_db_write, is_async_db_pool_enabled, is_audit_buffered_enabled
+from server.audit import stop_audit_worker
 import logging as _logging
 
 @app.on_event("startup")
@@ -86,11 +89,51 @@ def _startup_v25():
         _log.info("DB connection verified (SELECT 1 OK)")
     else:
         _log.error("DB connection verification FAILED (SELECT 1)")
+    try:
+        from server.audit_partitions import ensure_partitions
+        conn = get_conn()
+        try:
+            with conn.cursor() as cur:
+                ensure_partitions(cur)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            put_conn(conn)
+    except Exception as e:
+        _log.warning("audit_events partition check failed: %s", e)
+
+@app.on_event("startup")
+async def _startup_async_pool():
+    if not is_async_db_pool_enabled():
+        return
+    try:
+        await init_async_pool()
+    except Exception as e:
+        _logging.getLogger("server.startup").warning("Async DB pool init failed, using sync pool: %s", e)
 
 @app.on_event("shutdown")
 def _shutdown_v25():
+    stop_audit_worker()
     close_pool()
 
+@app.on_event("shutdown")
+async def _shutdown_async_pool():
+    await close_async_pool()
+
+@app.exception_handler(PoolSaturatedError)
+async def _pool_saturated_handler(request, exc):
+    return JSONResponse(
+        status_code=503,
+        content=error_envelope(
+            "POOL_SATURATED",
+            "Database is busy, retry shortly",
+            details={"lane": exc.lane},
+        ),
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 @app.get("/api/v2.5/feature-flags")
 def get_feature_flags():
     return {
@@ -99,6 +142,8 @@ def get_feature_flags():
             "PREFLIGHT_GATE_SYNC": is_preflight_enabled(),
             "OPS_VIEW_DB_READ": is_ops_view_db_read(),
             "OPS_VIEW_DB_WRITE": is_ops_view_db_write(),
+            "ASYNC_DB_POOL": is_async_db_pool_enabled(),
+            "AUDIT_BUFFERED": is_audit_buffered_enabled(),
         }
     }
 
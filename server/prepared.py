@@ -0,0 +1,57 @@
+"""
+Named server-side prepared statements for hot queries.
+
+Each pooled connection PREPAREs a statement the first time it is used by name
+and EXECUTEs it from then on, so Postgres skips parse/plan on repeat calls.
+SQL is written with psycopg placeholders (%s); the PREPARE form is derived.
+"""
+import re
+
+STATEMENTS = {
+    "workspace_role": (
+        "SELECT role FROM user_workspace_roles WHERE user_id = %s AND workspace_id = %s"
+    ),
+    "workspace_exists": (
+        "SELECT id FROM workspaces WHERE id = %s AND deleted_at IS NULL"
+    ),
+    "audit_insert": (
+        """INSERT INTO audit_events
+           (id, workspace_id, event_type, actor_id, actor_role,
+            timestamp_iso, dataset_id, batch_id, record_id,
+            field_key, patch_id, before_value, after_value, metadata)
+           VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb)"""
+    ),
+}
+
+_PLACEHOLDER = re.compile(r"%s")
+
+
+def _numbered(sql):
+    counter = iter(range(1, sql.count("%s") + 1))
+    return _PLACEHOLDER.sub(lambda _: "$%d" % next(counter), sql)
+
+
+def execute_prepared(cur, name, params):
+    """Execute registered statement *name* on a psycopg2 cursor.
+
+    Falls back to a plain execute when the cursor's connection does not track
+    prepared statements (e.g. a bare psycopg2.connect() in a script).
+    """
+    sql = STATEMENTS[name]
+    prepared = getattr(cur.connection, "prepared", None)
+    if prepared is None:
+        cur.execute(sql, params)
+        return
+    if name not in prepared:
+        cur.execute("PREPARE %s AS %s" % (name, _numbered(sql)))
+        prepared.add(name)
+    cur.execute("EXECUTE %s (%s)" % (name, ", ".join(["%s"] * len(params))), params)
+
+
+async def aexecute_prepared(cur, name, params):
+    """Async counterpart for cursors handed out by server.db.async_conn()."""
+    if hasattr(cur, "run_sync"):
+        await cur.run_sync(execute_prepared, name, params)
+    else:
+        # psycopg 3 cursor: prepare=True makes the driver prepare it server-side.
+        await cur.execute(STATEMENTS[name], params, prepare=True)
@@ -0,0 +1,137 @@
+"""
+Incrementally maintained operations-queue counters (workspace_queue_counters).
+
+Each counter row holds the number of live items in one
+(workspace, batch, item type, author, status, custody status) bucket. Write paths
+call move_out() just before changing an item's status and move_in() right after,
+on the same cursor, so the counters commit or roll back with the change itself.
+Corrections only count while their document is live; soft-deleting, restoring or
+re-batching a document moves its corrections through a trigger on documents
+(migration 019). rebuild() recomputes the table from the source tables for
+reconciliation:
+
+    python -m server.queue_counters --rebuild [--workspace ws_...]
+"""
+import sys
+import logging
+import argparse
+
+logger = logging.getLogger(__name__)
+
+COUNTER_KEY = "workspace_id, batch_id, item_type, author_id, status, custody_status"
+
+_BUCKET_SQL = {
+    "patch": """SELECT p.workspace_id, COALESCE(p.batch_id, ''), 'patch', COALESCE(p.author_id, ''),
+                       COALESCE(p.status, ''), ''
+                FROM patches p
+                WHERE p.deleted_at IS NULL AND %s""",
+    "rfi": """SELECT r.workspace_id, COALESCE(r.batch_id, ''), 'rfi', COALESCE(r.author_id, ''),
+                     COALESCE(r.status, ''), COALESCE(r.custody_status, '')
+              FROM rfis r
+              WHERE r.deleted_at IS NULL AND %s""",
+    "correction": """SELECT c.workspace_id, COALESCE(d.batch_id, ''), 'correction', COALESCE(c.created_by, ''),
+                            COALESCE(c.status, ''), ''
+                     FROM corrections c
+                     JOIN documents d ON d.id = c.document_id
+                     WHERE c.deleted_at IS NULL AND d.deleted_at IS NULL AND %s""",
+}
+
+_ALIAS = {"patch": "p", "rfi": "r", "correction": "c"}
+
+
+def _apply(cur, item_type, item_id, delta):
+    select_sql = _BUCKET_SQL[item_type] % ("%s.id = %%s" % _ALIAS[item_type])
+    cur.execute(
+        """INSERT INTO workspace_queue_counters (%s, item_count)
+           SELECT b.*, %%s FROM (%s) b (%s)
+           ON CONFLICT (%s) DO UPDATE
+           SET item_count = workspace_queue_counters.item_count + EXCLUDED.item_count,
+               updated_at = NOW()""" % (COUNTER_KEY, select_sql, COUNTER_KEY, COUNTER_KEY),
+        (delta, item_id),
+    )
+
+
+def move_in(cur, item_type, item_id):
+    """Count *item_id* in the bucket matching its current row (no-op if soft-deleted)."""
+    _apply(cur, item_type, item_id, 1)
+
+
+def move_out(cur, item_type, item_id):
+    """Remove *item_id* from the bucket matching its current row; call before updating it."""
+    _apply(cur, item_type, item_id, -1)
+
+
+def counter_rows_sql(workspace_id, batch_id=None, item_types=None, author_id=None):
+    """SQL + params returning (item_type, status, custody_status, count) for one scope."""
+    conditions = ["workspace_id = %s"]
+    params = [workspace_id]
+    if batch_id:
+        conditions.append("batch_id = %s")
+        params.append(batch_id)
+    if item_types:
+        conditions.append("item_type IN (%s)" % ", ".join(["%s"] * len(item_types)))
+        params.extend(item_types)
+    if author_id:
+        conditions.append("author_id = %s")
+        params.append(author_id)
+    sql = """SELECT item_type, status, custody_status, SUM(item_count)::int
+             FROM workspace_queue_counters
+             WHERE %s
+             GROUP BY item_type, status, custody_status
+             HAVING SUM(item_count) <> 0""" % " AND ".join(conditions)
+    return sql, params
+
+
+def rebuild(cur, workspace_id=None):
+    """Recompute counters from source tables, for one workspace or all of them."""
+    if workspace_id:
+        cur.execute("DELETE FROM workspace_queue_counters WHERE workspace_id = %s", (workspace_id,))
+    else:
+        cur.execute("DELETE FROM workspace_queue_counters")
+    for item_type, bucket_sql in _BUCKET_SQL.items():
+        alias = _ALIAS[item_type]
+        if workspace_id:
+            select_sql, params = bucket_sql % ("%s.workspace_id = %%s" % alias), (workspace_id,)
+        else:
+            select_sql, params = bucket_sql % "TRUE", ()
+        cur.execute(
+            """INSERT INTO workspace_queue_counters (%s, item_count)
+               SELECT b.*, COUNT(*) FROM (%s) b (%s)
+               GROUP BY %s""" % (COUNTER_KEY, select_sql, COUNTER_KEY, COUNTER_KEY),
+            params,
+        )
+    cur.execute("SELECT COUNT(*), COALESCE(SUM(item_count), 0) FROM workspace_queue_counters"
+                + (" WHERE workspace_id = %s" if workspace_id else ""),
+                (workspace_id,) if workspace_id else None)
+    return cur.fetchone()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain workspace_queue_counters")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute counters from source tables")
+    parser.add_argument("--workspace", help="Limit the rebuild to one workspace id")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.print_help()
+        return 2
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    from server.db import init_pool, get_conn, put_conn, close_pool
+    init_pool(min_conn=1, max_conn=2)
+    conn = get_conn()
+    try:
+        with conn.cursor() as cur:
+            buckets, items = rebuild(cur, args.workspace)
+        conn.commit()
+        logger.info("Rebuilt workspace_queue_counters: %d buckets, %d items", buckets, items)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        put_conn(conn)
+        close_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,12 +3,13 @@ import json
 import logging
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import JSONResponse
 
 from server.db import get_conn, put_conn
 from server.ulid import generate_id
 from server.api_v25 import envelope, collection_envelope, error_envelope
+from server.batch_get import batch_get
 from server.auth import AuthClass, require_auth
 from server.audit import emit_audit_event
 from server.feature_flags import require_evidence_inspector
@@ -232,6 +233,20 @@ def list_anchors(
         put_conn(conn)
 
 
+@router.post("/anchors:batchGet")
+async def batch_get_anchors(
+    body: dict,
+    request: Request = None,
+    auth=Depends(require_auth(AuthClass.EITHER)),
+):
+    if isinstance(auth, JSONResponse):
+        return auth
+    gate = require_evidence_inspector()
+    if gate:
+        return gate
+    return await batch_get(request, auth, body, "anchors", ANCHOR_COLUMNS, _row_to_dict, "batch_get_anchors")
+
+
 @router.delete("/anchors/{anchor_id}")
 def delete_anchor(
     anchor_id: str,
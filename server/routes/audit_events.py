@@ -1,12 +1,20 @@
+import itertools
+import json
 import logging
+import os
+import zlib
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from server.db import get_conn, put_conn
+from server.db import get_conn, put_conn, async_conn, LANE_LONG, PoolSaturatedError
+from server.prepared import aexecute_prepared, execute_prepared
 from server.api_v25 import envelope, collection_envelope, error_envelope
+from server.list_totals import fetch_total, include_total_error
 from server.auth import AuthClass, require_auth
+from server.audit_partitions import id_lower_bound, id_window
+from server.role_scope import require_workspace_member
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v2.5")
@@ -18,6 +26,9 @@ AUDIT_COLUMNS = [
 ]
 AUDIT_SELECT = ", ".join(AUDIT_COLUMNS)
 
+EXPORT_ITERSIZE = int(os.environ.get("AUDIT_EXPORT_ITERSIZE", "2000"))
+EXPORT_COMPRESSIONS = ("gzip",)
+
 
 def _row_to_dict(row, columns):
     d = {}
@@ -30,11 +41,137 @@ def _row_to_dict(row, columns):
     return d
 
 
+def _audit_filters(ws_id, event_type, actor_id, patch_id, batch_id, record_id, since, until):
+    conditions = ["workspace_id = %s"]
+    params = [ws_id]
+
+    if event_type:
+        conditions.append("event_type = %s")
+        params.append(event_type)
+    if actor_id:
+        conditions.append("actor_id = %s")
+        params.append(actor_id)
+    if patch_id:
+        conditions.append("patch_id = %s")
+        params.append(patch_id)
+    if batch_id:
+        conditions.append("batch_id = %s")
+        params.append(batch_id)
+    if record_id:
+        conditions.append("record_id = %s")
+        params.append(record_id)
+    if since:
+        conditions.append("timestamp_iso >= %s")
+        params.append(since)
+    if until:
+        conditions.append("timestamp_iso <= %s")
+        params.append(until)
+    return conditions, params
+
+
 @router.get("/workspaces/{ws_id}/audit-events")
-def list_audit_events(
+async def list_audit_events(
     ws_id: str,
     cursor: str = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    include_total: str = Query(None),
+    event_type: str = Query(None),
+    actor_id: str = Query(None),
+    patch_id: str = Query(None),
+    batch_id: str = Query(None),
+    record_id: str = Query(None),
+    since: str = Query(None),
+    until: str = Query(None),
+    auth=Depends(require_auth(AuthClass.EITHER)),
+):
+    if isinstance(auth, JSONResponse):
+        return auth
+    total_err = include_total_error(include_total)
+    if total_err:
+        return total_err
+
+    async with async_conn() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await aexecute_prepared(cur, "workspace_exists", (ws_id,))
+                if not await cur.fetchone():
+                    return JSONResponse(
+                        status_code=404,
+                        content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
+                    )
+
+                conditions, params = _audit_filters(
+                    ws_id, event_type, actor_id, patch_id, batch_id, record_id, since, until,
+                )
+                total_where = "WHERE " + " AND ".join(conditions)
+                total_params = list(params)
+                if cursor:
+                    conditions.append("id > %s")
+                    params.append(cursor)
+                    lower = id_lower_bound(cursor)
+                    if lower:
+                        conditions.append("timestamp_iso >= %s")
+                        params.append(lower)
+
+                where = "WHERE " + " AND ".join(conditions)
+                sql = "SELECT %s FROM audit_events %s ORDER BY id ASC LIMIT %%s" % (AUDIT_SELECT, where)
+                params.append(limit + 1)
+
+                await cur.execute(sql, params)
+                rows = await cur.fetchall()
+                total = None
+                if include_total:
+                    total = await fetch_total(cur, include_total, "audit_events", total_where, total_params)
+
+            has_more = len(rows) > limit
+            if has_more:
+                rows = rows[:limit]
+
+            items = [_row_to_dict(r, AUDIT_COLUMNS) for r in rows]
+            next_cursor = items[-1]["id"] if items and has_more else None
+
+            return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit, total=total)
+        except Exception as e:
+            logger.error("list_audit_events error: %s", e)
+            await conn.rollback()
+            return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
+
+
+def _export_chunks(where, params, compression):
+    """Yield NDJSON (gzip-framed if asked) from a named cursor, EXPORT_ITERSIZE rows per round-trip."""
+    compressor = zlib.compressobj(wbits=31) if compression == "gzip" else None
+    conn = get_conn(lane=LANE_LONG)
+    try:
+        with conn.cursor(name="audit_export") as cur:
+            cur.itersize = EXPORT_ITERSIZE
+            cur.execute(
+                "SELECT %s FROM audit_events %s ORDER BY id ASC" % (AUDIT_SELECT, where),
+                params,
+            )
+            lines = []
+            for row in cur:
+                lines.append(json.dumps(_row_to_dict(row, AUDIT_COLUMNS), default=str))
+                if len(lines) >= EXPORT_ITERSIZE:
+                    yield _export_encode(lines, compressor)
+                    lines = []
+            tail = _export_encode(lines, compressor) if lines else b""
+        yield tail + (compressor.flush() if compressor else b"")
+    finally:
+        conn.rollback()
+        put_conn(conn)
+
+
+def _export_encode(lines, compressor):
+    chunk = ("\n".join(lines) + "\n").encode("utf-8")
+    if compressor:
+        return compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    return chunk
+
+
+@router.get("/workspaces/{ws_id}/audit-events/export")
+def export_audit_events(
+    ws_id: str,
+    request: Request = None,
     event_type: str = Query(None),
     actor_id: str = Query(None),
     patch_id: str = Query(None),
@@ -42,71 +179,67 @@ def list_audit_events(
     record_id: str = Query(None),
     since: str = Query(None),
     until: str = Query(None),
+    compression: str = Query(None),
     auth=Depends(require_auth(AuthClass.EITHER)),
 ):
     if isinstance(auth, JSONResponse):
         return auth
+    if compression is not None and compression not in EXPORT_COMPRESSIONS:
+        return JSONResponse(
+            status_code=400,
+            content=error_envelope(
+                "VALIDATION_ERROR",
+                "compression must be one of: %s" % ", ".join(EXPORT_COMPRESSIONS),
+            ),
+        )
+
+    effective_role, role_err = require_workspace_member(request, auth, ws_id)
+    if role_err is not None:
+        return role_err
 
     conn = get_conn()
     try:
         with conn.cursor() as cur:
-            cur.execute("SELECT id FROM workspaces WHERE id = %s AND deleted_at IS NULL", (ws_id,))
+            execute_prepared(cur, "workspace_exists", (ws_id,))
             if not cur.fetchone():
                 return JSONResponse(
                     status_code=404,
                     content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
                 )
-
-            conditions = ["workspace_id = %s"]
-            params = [ws_id]
-
-            if event_type:
-                conditions.append("event_type = %s")
-                params.append(event_type)
-            if actor_id:
-                conditions.append("actor_id = %s")
-                params.append(actor_id)
-            if patch_id:
-                conditions.append("patch_id = %s")
-                params.append(patch_id)
-            if batch_id:
-                conditions.append("batch_id = %s")
-                params.append(batch_id)
-            if record_id:
-                conditions.append("record_id = %s")
-                params.append(record_id)
-            if since:
-                conditions.append("timestamp_iso >= %s")
-                params.append(since)
-            if until:
-                conditions.append("timestamp_iso <= %s")
-                params.append(until)
-            if cursor:
-                conditions.append("id > %s")
-                params.append(cursor)
-
-            where = "WHERE " + " AND ".join(conditions)
-            sql = "SELECT %s FROM audit_events %s ORDER BY id ASC LIMIT %%s" % (AUDIT_SELECT, where)
-            params.append(limit + 1)
-
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-
-        has_more = len(rows) > limit
-        if has_more:
-            rows = rows[:limit]
-
-        items = [_row_to_dict(r, AUDIT_COLUMNS) for r in rows]
-        next_cursor = items[-1]["id"] if items and has_more else None
-
-        return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit)
     except Exception as e:
-        logger.error("list_audit_events error: %s", e)
+        logger.error("export_audit_events error: %s", e)
         conn.rollback()
         return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
     finally:
         put_conn(conn)
 
+    conditions, params = _audit_filters(
+        ws_id, event_type, actor_id, patch_id, batch_id, record_id, since, until,
+    )
+    where = "WHERE " + " AND ".join(conditions)
+
+    # Prime the generator so pool saturation and query errors surface as a
+    # normal error response before any bytes are sent.
+    chunks = _export_chunks(where, params, compression)
+    try:
+        first = next(chunks)
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        logger.error("export_audit_events error: %s", e)
+        return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
+
+    filename = "audit-events-%s.ndjson" % ws_id
+    media_type = "application/x-ndjson"
+    if compression == "gzip":
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        itertools.chain([first], chunks),
+        media_type=media_type,
+        headers={"Content-Disposition": 'attachment; filename="%s"' % filename},
+    )
+
 
 @router.get("/audit-events/{aud_id}")
 def get_audit_event(
@@ -119,10 +252,17 @@ def get_audit_event(
     conn = get_conn()
     try:
         with conn.cursor() as cur:
-            cur.execute(
-                "SELECT %s FROM audit_events WHERE id = %%s" % AUDIT_SELECT,
-                (aud_id,),
-            )
+            window = id_window(aud_id)
+            if window:
+                cur.execute(
+                    "SELECT %s FROM audit_events WHERE id = %%s AND timestamp_iso BETWEEN %%s AND %%s" % AUDIT_SELECT,
+                    (aud_id,) + window,
+                )
+            else:
+                cur.execute(
+                    "SELECT %s FROM audit_events WHERE id = %%s" % AUDIT_SELECT,
+                    (aud_id,),
+                )
             row = cur.fetchone()
 
         if not row:
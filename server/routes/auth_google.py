@@ -7,7 +7,7 @@ from fastapi.responses import JSONResponse
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
 
-from server.db import get_conn, put_conn
+from server.db import get_conn_async, put_conn
 from server.api_v25 import envelope, error_envelope
 from server.jwt_utils import sign_jwt
 
@@ -73,7 +73,7 @@ async def verify_google_token(request: Request):
             content=error_envelope("UNAUTHORIZED", "Google token missing email claim"),
         )
 
-    conn = get_conn()
+    conn = await get_conn_async()
     try:
         with conn.cursor() as cur:
             cur.execute(
@@ -1,20 +1,159 @@
+import hashlib
 import logging
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
-from server.db import get_conn, put_conn
+from server.db import async_conn
+from server.prepared import aexecute_prepared
 from server.api_v25 import envelope, error_envelope
 from server.auth import AuthClass, require_auth
 from server.feature_flags import require_evidence_inspector
+from server.role_scope import require_workspace_member
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v2.5")
 
+# One round trip: RFI / correction counts come from workspace_queue_counters, reader
+# quality counts from reader_node_cache over the batch's live documents. No row means
+# the batch does not exist (or is deleted).
+BATCH_HEALTH_SQL = """
+WITH batch AS (
+    SELECT id, workspace_id FROM batches WHERE id = %(batch_id)s AND deleted_at IS NULL
+),
+queue AS (
+    SELECT
+        COALESCE(SUM(q.item_count) FILTER (
+            WHERE q.item_type = 'rfi'
+              AND (q.custody_status = 'open' OR (q.custody_status = '' AND q.status = 'open'))), 0)::int AS rfis_open,
+        COALESCE(SUM(q.item_count) FILTER (
+            WHERE q.item_type = 'rfi'
+              AND (q.custody_status = 'awaiting_verifier' OR (q.custody_status = '' AND q.status = 'responded'))), 0)::int AS rfis_awaiting,
+        COALESCE(SUM(q.item_count) FILTER (
+            WHERE q.item_type = 'correction' AND q.status = 'pending_verifier'), 0)::int AS corrections_pending
+    FROM workspace_queue_counters q
+    JOIN batch b ON q.workspace_id = b.workspace_id AND q.batch_id = b.id
+    WHERE q.item_type IN ('rfi', 'correction')
+),
+reader AS (
+    SELECT
+        COUNT(*) FILTER (WHERE rc.quality_flag = 'suspect_mojibake')::int AS mojibake_suspect,
+        COUNT(*) FILTER (WHERE rc.quality_flag = 'unreadable')::int AS reader_unreadable
+    FROM reader_node_cache rc
+    JOIN documents d ON d.id = rc.document_id
+    WHERE d.batch_id = %(batch_id)s AND d.deleted_at IS NULL
+      AND rc.quality_flag IN ('suspect_mojibake', 'unreadable')
+)
+SELECT b.id, b.workspace_id,
+       queue.rfis_open, queue.rfis_awaiting, queue.corrections_pending,
+       reader.mojibake_suspect, reader.reader_unreadable
+FROM batch b, queue, reader
+"""
+
+
+# Same counts for every live batch in a workspace (optionally a subset), one row per batch.
+WORKSPACE_BATCH_HEALTH_SQL = """
+WITH batch AS (
+    SELECT id FROM batches
+    WHERE workspace_id = %(workspace_id)s AND deleted_at IS NULL
+      AND (%(batch_ids)s::text[] IS NULL OR id = ANY(%(batch_ids)s::text[]))
+),
+queue AS (
+    SELECT q.batch_id,
+        COALESCE(SUM(q.item_count) FILTER (
+            WHERE q.item_type = 'rfi'
+              AND (q.custody_status = 'open' OR (q.custody_status = '' AND q.status = 'open'))), 0)::int AS rfis_open,
+        COALESCE(SUM(q.item_count) FILTER (
+            WHERE q.item_type = 'rfi'
+              AND (q.custody_status = 'awaiting_verifier' OR (q.custody_status = '' AND q.status = 'responded'))), 0)::int AS rfis_awaiting,
+        COALESCE(SUM(q.item_count) FILTER (
+            WHERE q.item_type = 'correction' AND q.status = 'pending_verifier'), 0)::int AS corrections_pending
+    FROM workspace_queue_counters q
+    WHERE q.workspace_id = %(workspace_id)s AND q.item_type IN ('rfi', 'correction')
+    GROUP BY q.batch_id
+),
+reader AS (
+    SELECT d.batch_id,
+        COUNT(*) FILTER (WHERE rc.quality_flag = 'suspect_mojibake')::int AS mojibake_suspect,
+        COUNT(*) FILTER (WHERE rc.quality_flag = 'unreadable')::int AS reader_unreadable
+    FROM reader_node_cache rc
+    JOIN documents d ON d.id = rc.document_id
+    WHERE d.workspace_id = %(workspace_id)s AND d.deleted_at IS NULL
+      AND rc.quality_flag IN ('suspect_mojibake', 'unreadable')
+    GROUP BY d.batch_id
+)
+SELECT b.id,
+       COALESCE(queue.rfis_open, 0), COALESCE(queue.rfis_awaiting, 0), COALESCE(queue.corrections_pending, 0),
+       COALESCE(reader.mojibake_suspect, 0), COALESCE(reader.reader_unreadable, 0)
+FROM batch b
+LEFT JOIN queue ON queue.batch_id = b.id
+LEFT JOIN reader ON reader.batch_id = b.id
+ORDER BY b.id
+"""
+
+
+# Version of WORKSPACE_BATCH_HEALTH_SQL's inputs for the ETag, without computing the
+# rollup: the live batch set, then a hash of the counter buckets and of the flagged
+# reader cache counts it reads. Hashing the rows themselves rather than updated_at
+# stamps catches every change, including a move between buckets committed by a
+# transaction whose NOW() is older than the newest stamp.
+HEALTH_VERSION_SQL = """
+WITH batch AS (
+    SELECT id FROM batches
+    WHERE workspace_id = %(workspace_id)s AND deleted_at IS NULL
+      AND (%(batch_ids)s::text[] IS NULL OR id = ANY(%(batch_ids)s::text[]))
+)
+SELECT
+    (SELECT string_agg(id, ',' ORDER BY id) FROM batch),
+    (SELECT md5(string_agg(concat_ws('|', q.batch_id, q.item_type, q.author_id, q.status, q.custody_status, q.item_count),
+                           ',' ORDER BY q.batch_id, q.item_type, q.author_id, q.status, q.custody_status))
+     FROM workspace_queue_counters q
+     JOIN batch b ON b.id = q.batch_id
+     WHERE q.workspace_id = %(workspace_id)s AND q.item_type IN ('rfi', 'correction')),
+    (SELECT md5(string_agg(concat_ws('|', r.batch_id, r.quality_flag, r.entries), ',' ORDER BY r.batch_id, r.quality_flag))
+     FROM (
+        SELECT d.batch_id, rc.quality_flag, COUNT(*) AS entries
+        FROM reader_node_cache rc
+        JOIN documents d ON d.id = rc.document_id
+        JOIN batch b ON b.id = d.batch_id
+        WHERE d.workspace_id = %(workspace_id)s AND d.deleted_at IS NULL
+          AND rc.quality_flag IN ('suspect_mojibake', 'unreadable')
+        GROUP BY d.batch_id, rc.quality_flag
+     ) r)
+"""
+
+
+def _health_item(bat_id, counts_row):
+    rfis_open, rfis_awaiting, corrections_pending, mojibake_suspect, reader_unreadable = counts_row
+
+    blockers = []
+    if mojibake_suspect > 0:
+        blockers.append("mojibake_suspect_docs: %d" % mojibake_suspect)
+    if reader_unreadable > 0:
+        blockers.append("reader_unreadable_docs: %d" % reader_unreadable)
+
+    return {
+        "batch_id": bat_id,
+        "counts": {
+            "rfis_open": rfis_open,
+            "rfis_awaiting_verifier": rfis_awaiting,
+            "corrections_pending": corrections_pending,
+            "mojibake_suspect_docs": mojibake_suspect,
+            "reader_unreadable_docs": reader_unreadable,
+        },
+        "blockers": blockers,
+    }
+
+
+def _health_etag(version_row):
+    key = "|".join("" if v is None else str(v) for v in version_row)
+    return '"%s"' % hashlib.sha1(key.encode("utf-8")).hexdigest()
+
 
 @router.get("/batches/{bat_id}/health")
-def get_batch_health(
+async def get_batch_health(
     bat_id: str,
     auth=Depends(require_auth(AuthClass.EITHER)),
 ):
@@ -24,77 +163,74 @@ def get_batch_health(
     if gate:
         return gate
 
-    conn = get_conn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT id, workspace_id FROM batches WHERE id = %s AND deleted_at IS NULL", (bat_id,))
-            batch_row = cur.fetchone()
-            if not batch_row:
-                return JSONResponse(
-                    status_code=404,
-                    content=error_envelope("NOT_FOUND", "Batch not found: %s" % bat_id),
-                )
-            workspace_id = batch_row[1]
-
-            cur.execute(
-                "SELECT COUNT(*) FROM rfis WHERE batch_id = %s "
-                "AND deleted_at IS NULL AND (custody_status = 'open' OR (custody_status IS NULL AND status = 'open'))",
-                (bat_id,),
-            )
-            rfis_open = cur.fetchone()[0]
+    async with async_conn() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(BATCH_HEALTH_SQL, {"batch_id": bat_id})
+                row = await cur.fetchone()
+                if not row:
+                    return JSONResponse(
+                        status_code=404,
+                        content=error_envelope("NOT_FOUND", "Batch not found: %s" % bat_id),
+                    )
 
-            cur.execute(
-                "SELECT COUNT(*) FROM rfis WHERE batch_id = %s "
-                "AND deleted_at IS NULL AND (custody_status = 'awaiting_verifier' OR (custody_status IS NULL AND status = 'responded'))",
-                (bat_id,),
-            )
-            rfis_awaiting = cur.fetchone()[0]
+            health = _health_item(bat_id, row[2:])
+            health["updated_at"] = datetime.now(timezone.utc).isoformat()
+            return envelope(health)
+        except Exception as e:
+            logger.error("get_batch_health error: %s", e)
+            await conn.rollback()
+            return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
 
-            cur.execute(
-                "SELECT COUNT(*) FROM corrections WHERE document_id IN "
-                "(SELECT id FROM documents WHERE batch_id = %s AND deleted_at IS NULL) "
-                "AND deleted_at IS NULL AND status = 'pending_verifier'",
-                (bat_id,),
-            )
-            corrections_pending = cur.fetchone()[0]
 
-            cur.execute(
-                "SELECT COUNT(*) FROM reader_node_cache WHERE document_id IN "
-                "(SELECT id FROM documents WHERE batch_id = %s AND deleted_at IS NULL) "
-                "AND quality_flag = 'suspect_mojibake'",
-                (bat_id,),
-            )
-            mojibake_suspect = cur.fetchone()[0]
+@router.get("/workspaces/{ws_id}/batch-health")
+async def get_workspace_batch_health(
+    ws_id: str,
+    request: Request,
+    batch_ids: str = Query(None, description="Comma-separated batch ids; defaults to all live batches"),
+    auth=Depends(require_auth(AuthClass.EITHER)),
+):
+    if isinstance(auth, JSONResponse):
+        return auth
+    gate = require_evidence_inspector()
+    if gate:
+        return gate
+
+    _, role_err = await run_in_threadpool(require_workspace_member, request, auth, ws_id)
+    if role_err is not None:
+        return role_err
+
+    wanted = sorted({b.strip() for b in batch_ids.split(",") if b.strip()}) if batch_ids else None
+
+    async with async_conn() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await aexecute_prepared(cur, "workspace_exists", (ws_id,))
+                if not await cur.fetchone():
+                    return JSONResponse(
+                        status_code=404,
+                        content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
+                    )
+
+                params = {"workspace_id": ws_id, "batch_ids": wanted}
+                await cur.execute(HEALTH_VERSION_SQL, params)
+                etag = _health_etag(await cur.fetchone())
+                if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+                    return Response(status_code=304, headers={"ETag": etag})
+
+                await cur.execute(WORKSPACE_BATCH_HEALTH_SQL, params)
+                rows = await cur.fetchall()
 
-            cur.execute(
-                "SELECT COUNT(*) FROM reader_node_cache WHERE document_id IN "
-                "(SELECT id FROM documents WHERE batch_id = %s AND deleted_at IS NULL) "
-                "AND quality_flag = 'unreadable'",
-                (bat_id,),
+            items = [_health_item(row[0], row[1:]) for row in rows]
+            return JSONResponse(
+                content=envelope({
+                    "workspace_id": ws_id,
+                    "batches": items,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                }),
+                headers={"ETag": etag},
             )
-            reader_unreadable = cur.fetchone()[0]
-
-            blockers = []
-            if mojibake_suspect > 0:
-                blockers.append("mojibake_suspect_docs: %d" % mojibake_suspect)
-            if reader_unreadable > 0:
-                blockers.append("reader_unreadable_docs: %d" % reader_unreadable)
-
-        return envelope({
-            "batch_id": bat_id,
-            "counts": {
-                "rfis_open": rfis_open,
-                "rfis_awaiting_verifier": rfis_awaiting,
-                "corrections_pending": corrections_pending,
-                "mojibake_suspect_docs": mojibake_suspect,
-                "reader_unreadable_docs": reader_unreadable,
-            },
-            "blockers": blockers,
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-        })
-    except Exception as e:
-        logger.error("get_batch_health error: %s", e)
-        conn.rollback()
-        return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
-    finally:
-        put_conn(conn)
+        except Exception as e:
+            logger.error("get_workspace_batch_health error: %s", e)
+            await conn.rollback()
+            return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
@@ -5,9 +5,11 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import JSONResponse
 
-from server.db import get_conn, put_conn
+from server.db import get_conn, put_conn, async_conn
+from server.prepared import execute_prepared, aexecute_prepared
 from server.ulid import generate_id
 from server.api_v25 import envelope, collection_envelope, error_envelope
+from server.list_totals import fetch_total, include_total_error
 from server.auth import AuthClass, require_auth
 from server.audit import emit_audit_event
 
@@ -37,56 +39,63 @@ def _row_to_dict(row, columns):
 
 
 @router.get("/workspaces/{ws_id}/batches")
-def list_batches(
+async def list_batches(
     ws_id: str,
     cursor: str = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    include_total: str = Query(None),
     include_deleted: bool = Query(False),
     auth=Depends(require_auth(AuthClass.EITHER)),
 ):
     if isinstance(auth, JSONResponse):
         return auth
+    total_err = include_total_error(include_total)
+    if total_err:
+        return total_err
+
+    async with async_conn() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await aexecute_prepared(cur, "workspace_exists", (ws_id,))
+                if not await cur.fetchone():
+                    return JSONResponse(
+                        status_code=404,
+                        content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
+                    )
 
-    conn = get_conn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT id FROM workspaces WHERE id = %s AND deleted_at IS NULL", (ws_id,))
-            if not cur.fetchone():
-                return JSONResponse(
-                    status_code=404,
-                    content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
-                )
-
-            conditions = ["workspace_id = %s"]
-            params = [ws_id]
+                conditions = ["workspace_id = %s"]
+                params = [ws_id]
 
-            if not include_deleted:
-                conditions.append("deleted_at IS NULL")
-            if cursor:
-                conditions.append("id > %s")
-                params.append(cursor)
+                if not include_deleted:
+                    conditions.append("deleted_at IS NULL")
+                total_where = "WHERE " + " AND ".join(conditions)
+                total_params = list(params)
+                if cursor:
+                    conditions.append("id > %s")
+                    params.append(cursor)
 
-            where = "WHERE " + " AND ".join(conditions)
-            sql = "SELECT %s FROM batches %s ORDER BY id ASC LIMIT %%s" % (BATCH_SELECT, where)
-            params.append(limit + 1)
+                where = "WHERE " + " AND ".join(conditions)
+                sql = "SELECT %s FROM batches %s ORDER BY id ASC LIMIT %%s" % (BATCH_SELECT, where)
+                params.append(limit + 1)
 
-            cur.execute(sql, params)
-            rows = cur.fetchall()
+                await cur.execute(sql, params)
+                rows = await cur.fetchall()
+                total = None
+                if include_total:
+                    total = await fetch_total(cur, include_total, "batches", total_where, total_params)
 
-        has_more = len(rows) > limit
-        if has_more:
-            rows = rows[:limit]
+            has_more = len(rows) > limit
+            if has_more:
+                rows = rows[:limit]
 
-        items = [_row_to_dict(r, BATCH_COLUMNS) for r in rows]
-        next_cursor = items[-1]["id"] if items and has_more else None
+            items = [_row_to_dict(r, BATCH_COLUMNS) for r in rows]
+            next_cursor = items[-1]["id"] if items and has_more else None
 
-        return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit)
-    except Exception as e:
-        logger.error("list_batches error: %s", e)
-        conn.rollback()
-        return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
-    finally:
-        put_conn(conn)
+            return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit, total=total)
+        except Exception as e:
+            logger.error("list_batches error: %s", e)
+            await conn.rollback()
+            return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
 
 
 @router.post("/workspaces/{ws_id}/batches", status_code=201)
@@ -139,7 +148,7 @@ def create_batch(
     conn = get_conn()
     try:
         with conn.cursor() as cur:
-            cur.execute("SELECT id FROM workspaces WHERE id = %s AND deleted_at IS NULL", (ws_id,))
+            execute_prepared(cur, "workspace_exists", (ws_id,))
             if not cur.fetchone():
                 return JSONResponse(
                     status_code=404,
@@ -176,6 +185,7 @@ def create_batch(
                                 "revision_marker": str(revision_marker),
                                 "dedupe_hit": True,
                             },
+                            best_effort=True,
                         )
                         conn.commit()
                         return JSONResponse(
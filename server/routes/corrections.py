@@ -3,14 +3,17 @@ import logging
 import re
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import JSONResponse
 
-from server.db import get_conn, put_conn
+from server.db import get_conn, put_conn, async_conn
 from server.ulid import generate_id
 from server.api_v25 import envelope, collection_envelope, error_envelope
+from server.batch_get import batch_get
+from server.list_totals import fetch_total, include_total_error
 from server.auth import AuthClass, require_auth, get_workspace_role
 from server.audit import emit_audit_event
+from server.queue_counters import move_in, move_out
 from server.feature_flags import require_evidence_inspector
 
 logger = logging.getLogger(__name__)
@@ -138,6 +141,7 @@ def create_correction(
                  correction_type, status, auth.user_id, json.dumps(metadata)),
             )
             row = cur.fetchone()
+            move_in(cur, "correction", cor_id)
 
             emit_audit_event(
                 cur,
@@ -199,6 +203,20 @@ def create_correction(
         put_conn(conn)
 
 
+@router.post("/corrections:batchGet")
+async def batch_get_corrections(
+    body: dict,
+    request: Request = None,
+    auth=Depends(require_auth(AuthClass.EITHER)),
+):
+    if isinstance(auth, JSONResponse):
+        return auth
+    gate = require_evidence_inspector()
+    if gate:
+        return gate
+    return await batch_get(request, auth, body, "corrections", CORRECTION_COLUMNS, _row_to_dict, "batch_get_corrections")
+
+
 @router.patch("/corrections/{cor_id}")
 def update_correction(
     cor_id: str,
@@ -311,6 +329,10 @@ def update_correction(
             set_clauses.append("version = version + 1")
             set_clauses.append("updated_at = NOW()")
 
+            status_changed = "status" in updates
+            if status_changed:
+                move_out(cur, "correction", cor_id)
+
             params.extend([cor_id, version])
             sql = "UPDATE corrections SET %s WHERE id = %%s AND version = %%s RETURNING %s" % (
                 ", ".join(set_clauses),
@@ -325,6 +347,8 @@ def update_correction(
                     status_code=409,
                     content=error_envelope("STALE_VERSION", "Concurrent modification detected"),
                 )
+            if status_changed:
+                move_in(cur, "correction", cor_id)
 
             emit_audit_event(
                 cur,
@@ -374,61 +398,68 @@ def update_correction(
 
 
 @router.get("/batches/{bat_id}/corrections")
-def list_batch_corrections(
+async def list_batch_corrections(
     bat_id: str,
     status: str = Query(None),
     cursor: str = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    include_total: str = Query(None),
     auth=Depends(require_auth(AuthClass.EITHER)),
 ):
     if isinstance(auth, JSONResponse):
         return auth
+    total_err = include_total_error(include_total)
+    if total_err:
+        return total_err
     gate = require_evidence_inspector()
     if gate:
         return gate
 
-    conn = get_conn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT id FROM batches WHERE id = %s AND deleted_at IS NULL", (bat_id,))
-            if not cur.fetchone():
-                return JSONResponse(
-                    status_code=404,
-                    content=error_envelope("NOT_FOUND", "Batch not found: %s" % bat_id),
-                )
-
-            conditions = [
-                "c.document_id IN (SELECT id FROM documents WHERE batch_id = %s AND deleted_at IS NULL)"
-            ]
-            params: list = [bat_id]
-
-            conditions.append("c.deleted_at IS NULL")
-            if status:
-                conditions.append("c.status = %s")
-                params.append(status)
-            if cursor:
-                conditions.append("c.id > %s")
-                params.append(cursor)
-
-            where = "WHERE " + " AND ".join(conditions)
-            col_list = ", ".join(["c." + col for col in CORRECTION_COLUMNS])
-            sql = "SELECT %s FROM corrections c %s ORDER BY c.id ASC LIMIT %%s" % (col_list, where)
-            params.append(limit + 1)
-
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-
-        has_more = len(rows) > limit
-        if has_more:
-            rows = rows[:limit]
-
-        items = [_row_to_dict(r, CORRECTION_COLUMNS) for r in rows]
-        next_cursor = items[-1]["id"] if items and has_more else None
+    async with async_conn() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT id FROM batches WHERE id = %s AND deleted_at IS NULL", (bat_id,))
+                if not await cur.fetchone():
+                    return JSONResponse(
+                        status_code=404,
+                        content=error_envelope("NOT_FOUND", "Batch not found: %s" % bat_id),
+                    )
 
-        return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit)
-    except Exception as e:
-        logger.error("list_batch_corrections error: %s", e)
-        conn.rollback()
-        return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
-    finally:
-        put_conn(conn)
+                conditions = [
+                    "c.document_id IN (SELECT id FROM documents WHERE batch_id = %s AND deleted_at IS NULL)"
+                ]
+                params: list = [bat_id]
+
+                conditions.append("c.deleted_at IS NULL")
+                if status:
+                    conditions.append("c.status = %s")
+                    params.append(status)
+                total_where = "WHERE " + " AND ".join(conditions)
+                total_params = list(params)
+                if cursor:
+                    conditions.append("c.id > %s")
+                    params.append(cursor)
+
+                where = "WHERE " + " AND ".join(conditions)
+                col_list = ", ".join(["c." + col for col in CORRECTION_COLUMNS])
+                sql = "SELECT %s FROM corrections c %s ORDER BY c.id ASC LIMIT %%s" % (col_list, where)
+                params.append(limit + 1)
+
+                await cur.execute(sql, params)
+                rows = await cur.fetchall()
+                total = None
+                if include_total:
+                    total = await fetch_total(cur, include_total, "corrections c", total_where, total_params)
+
+            has_more = len(rows) > limit
+            if has_more:
+                rows = rows[:limit]
+
+            items = [_row_to_dict(r, CORRECTION_COLUMNS) for r in rows]
+            next_cursor = items[-1]["id"] if items and has_more else None
+
+            return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit, total=total)
+        except Exception as e:
+            logger.error("list_batch_corrections error: %s", e)
+            await conn.rollback()
+            return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
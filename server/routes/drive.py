@@ -9,7 +9,7 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import JSONResponse
 
-from server.db import get_conn, put_conn
+from server.db import get_conn, get_conn_async, put_conn, LANE_LONG
 from server.ulid import generate_id
 from server.api_v25 import envelope, collection_envelope, error_envelope
 from server.auth import AuthClass, require_auth, require_role, Role
@@ -232,7 +232,7 @@ async def drive_callback(ws_id: str, request: Request, auth=Depends(require_auth
         logger.warning("Could not fetch Drive email: %s", e)
 
     conn_id = generate_id("drc_")
-    conn = get_conn()
+    conn = await get_conn_async()
     try:
         with conn.cursor() as cur:
             cur.execute(
@@ -507,7 +507,7 @@ async def drive_settings_put(ws_id: str, request: Request, auth=Depends(require_
     verifier_folder_id = body.get("verifier_folder_id")
     admin_folder_id = body.get("admin_folder_id")
 
-    conn = get_conn()
+    conn = await get_conn_async()
     try:
         with conn.cursor() as cur:
             cur.execute(
@@ -661,7 +661,7 @@ async def drive_save(ws_id: str, request: Request, auth=Depends(require_auth(Aut
             content=error_envelope("VALIDATION_ERROR", "file_content_base64 is required"),
         )
 
-    conn = get_conn()
+    conn = await get_conn_async(lane=LANE_LONG)
     try:
         conn_row = _get_workspace_connection(ws_id, conn)
         if not conn_row:
@@ -798,7 +798,7 @@ def drive_browse(
     if role_err:
         return role_err
 
-    conn = get_conn()
+    conn = get_conn(lane=LANE_LONG)
     try:
         conn_row = _get_workspace_connection(ws_id, conn)
         if not conn_row:
@@ -923,7 +923,7 @@ async def drive_import(ws_id: str, request: Request, auth=Depends(require_auth(A
             content=error_envelope("VALIDATION_ERROR", "file_id is required"),
         )
 
-    conn = get_conn()
+    conn = await get_conn_async(lane=LANE_LONG)
     try:
         conn_row = _get_workspace_connection(ws_id, conn)
         if not conn_row:
@@ -1157,7 +1157,7 @@ async def drive_export(ws_id: str, request: Request, auth=Depends(require_auth(A
             content=error_envelope("VALIDATION_ERROR", "file_content_base64 is required"),
         )
 
-    conn = get_conn()
+    conn = await get_conn_async(lane=LANE_LONG)
     try:
         conn_row = _get_workspace_connection(ws_id, conn)
         if not conn_row:
@@ -8,6 +8,7 @@ from fastapi.responses import JSONResponse
 from server.db import get_conn, put_conn
 from server.ulid import generate_id
 from server.api_v25 import envelope, collection_envelope, error_envelope
+from server.batch_get import batch_get
 from server.auth import AuthClass, require_auth
 from server.audit import emit_audit_event
 
@@ -191,6 +192,17 @@ def get_evidence_pack(
         put_conn(conn)
 
 
+@router.post("/evidence-packs:batchGet")
+async def batch_get_evidence_packs(
+    body: dict,
+    request: Request = None,
+    auth=Depends(require_auth(AuthClass.EITHER)),
+):
+    if isinstance(auth, JSONResponse):
+        return auth
+    return await batch_get(request, auth, body, "evidence_packs", EVP_COLUMNS, _row_to_dict, "batch_get_evidence_packs")
+
+
 @router.patch("/evidence-packs/{evp_id}")
 def update_evidence_pack(
     evp_id: str,
@@ -3,7 +3,7 @@ import logging
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import JSONResponse
 
-from server.db import get_conn, put_conn
+from server.db import get_conn_async, put_conn
 from server.api_v25 import envelope, error_envelope
 from server.auth import AuthClass, require_auth, require_role, Role
 from server.ulid import generate_id
@@ -18,7 +18,7 @@ async def list_members(ws_id: str, request: Request, auth=Depends(require_auth(A
     if isinstance(auth, JSONResponse):
         return auth
 
-    conn = get_conn()
+    conn = await get_conn_async()
     try:
         with conn.cursor() as cur:
             cur.execute(
@@ -78,7 +78,7 @@ async def create_member(ws_id: str, request: Request, auth=Depends(require_auth(
     if status not in ("active", "inactive"):
         return JSONResponse(status_code=400, content=error_envelope("VALIDATION_ERROR", "Invalid status"))
 
-    conn = get_conn()
+    conn = await get_conn_async()
     try:
         with conn.cursor() as cur:
             cur.execute("SELECT id FROM users WHERE LOWER(email) = %s", (email,))
@@ -143,7 +143,7 @@ async def update_member(user_id: str, request: Request, auth=Depends(require_aut
     if role_check:
         return role_check
 
-    conn = get_conn()
+    conn = await get_conn_async()
     try:
         with conn.cursor() as cur:
             cur.execute("SELECT id, email, display_name, status FROM users WHERE id = %s", (user_id,))
@@ -209,7 +209,7 @@ async def get_member_drive_folder(user_id: str, request: Request, auth=Depends(r
     if role_check:
         return role_check
 
-    conn = get_conn()
+    conn = await get_conn_async()
     try:
         with conn.cursor() as cur:
             cur.execute(
@@ -254,7 +254,7 @@ async def update_member_drive_folder(user_id: str, request: Request, auth=Depend
 
     drive_folder_id = body.get("drive_folder_id", "")
 
-    conn = get_conn()
+    conn = await get_conn_async()
     try:
         with conn.cursor() as cur:
             cur.execute(
@@ -298,7 +298,7 @@ async def delete_member(user_id: str, request: Request, auth=Depends(require_aut
     if role_check:
         return role_check
 
-    conn = get_conn()
+    conn = await get_conn_async()
     try:
         with conn.cursor() as cur:
             cur.execute(
@@ -1,11 +1,16 @@
+import base64
 import logging
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
-from server.db import get_conn, put_conn
+from server.db import get_conn, put_conn, async_conn
+from server.prepared import aexecute_prepared
+from server.queue_counters import counter_rows_sql
 from server.api_v25 import error_envelope
+from server.list_totals import fetch_total, include_total_error
 from server.auth import AuthClass, require_auth, require_role, get_workspace_role, Role
 from server.role_scope import require_workspace_member
 
@@ -53,108 +58,82 @@ def _resolve_effective_role(request, auth, ws_id):
     return resolve_effective_role(request, auth, ws_id)
 
 
-def _build_patch_item(row):
+QUEUE_COLUMNS = [
+    "item_type", "id", "workspace_id", "batch_id", "document_id", "record_id", "field_key",
+    "lifecycle_status", "custody_owner_id", "custody_owner_role",
+    "author_id", "author_email", "decided_by", "before_value", "after_value",
+    "created_at", "updated_at", "resolved_at", "version", "metadata", "summary_text",
+    "queue_status",
+]
+
+
+def _build_item(row):
+    r = dict(zip(QUEUE_COLUMNS, row))
+    if r["item_type"] == "patch":
+        summary = _patch_summary(r)
+    elif r["item_type"] == "rfi":
+        summary = (r["summary_text"] or "")[:120]
+    else:
+        summary = _correction_summary(r)
     return {
-        "id": row[0],
-        "item_type": "patch",
-        "workspace_id": row[1],
-        "batch_id": row[2],
+        "id": r["id"],
+        "item_type": r["item_type"],
+        "workspace_id": r["workspace_id"],
+        "batch_id": r["batch_id"],
         "contract_id": None,
-        "document_id": None,
-        "record_id": row[3],
-        "field_key": row[4],
-        "lifecycle_status": row[5],
-        "queue_status": PATCH_QUEUE_STATUS_MAP.get(row[5], "pending"),
-        "custody_owner_id": None,
-        "custody_owner_role": None,
-        "author_id": row[6],
-        "author_email": row[7],
-        "decided_by": None,
-        "summary": _patch_summary(row),
-        "before_value": row[8],
-        "after_value": row[9],
-        "created_at": _iso(row[10]),
-        "updated_at": _iso(row[11]),
-        "resolved_at": _iso(row[12]),
-        "version": row[13],
-        "metadata": row[14] if row[14] else {},
+        "document_id": r["document_id"],
+        "record_id": r["record_id"],
+        "field_key": r["field_key"],
+        "lifecycle_status": r["lifecycle_status"],
+        "queue_status": r["queue_status"],
+        "custody_owner_id": r["custody_owner_id"],
+        "custody_owner_role": r["custody_owner_role"],
+        "author_id": r["author_id"],
+        "author_email": r["author_email"],
+        "decided_by": r["decided_by"],
+        "summary": summary,
+        "before_value": r["before_value"],
+        "after_value": r["after_value"],
+        "created_at": _iso(r["created_at"]),
+        "updated_at": _iso(r["updated_at"]),
+        "resolved_at": _iso(r["resolved_at"]),
+        "version": r["version"],
+        "metadata": r["metadata"] if r["metadata"] else {},
     }
 
 
-def _patch_summary(row):
-    field_key = row[4] or ""
-    after_value = row[9] or ""
-    intent = row[15] or ""
+def _patch_summary(r):
+    field_key = r["field_key"] or ""
+    after_value = r["after_value"] or ""
+    intent = r["summary_text"] or ""
     if intent:
         return intent[:120]
     if field_key and after_value:
         return "Set %s = '%s'" % (field_key, after_value[:60])
-    return "Patch %s" % row[0][:12]
+    return "Patch %s" % r["id"][:12]
 
 
-def _build_rfi_item(row):
-    return {
-        "id": row[0],
-        "item_type": "rfi",
-        "workspace_id": row[1],
-        "batch_id": row[2],
-        "contract_id": None,
-        "document_id": None,
-        "record_id": row[3],
-        "field_key": row[4],
-        "lifecycle_status": row[5] or "open",
-        "queue_status": RFI_QUEUE_STATUS_MAP.get(row[6] or "open", "pending"),
-        "custody_owner_id": row[7],
-        "custody_owner_role": row[8],
-        "author_id": row[9],
-        "author_email": row[10],
-        "decided_by": row[11],
-        "summary": (row[12] or "")[:120],
-        "before_value": None,
-        "after_value": row[13],
-        "created_at": _iso(row[14]),
-        "updated_at": _iso(row[15]),
-        "resolved_at": None,
-        "version": row[16],
-        "metadata": row[17] if row[17] else {},
-    }
+def _correction_summary(r):
+    field_key = r["field_key"] or ""
+    original = r["before_value"] or ""
+    corrected = r["after_value"] or ""
+    if field_key and corrected:
+        return "Correct %s: '%s' → '%s'" % (field_key, original[:30], corrected[:30])
+    return "Correction %s" % r["id"][:12]
 
 
-def _build_correction_item(row):
-    return {
-        "id": row[0],
-        "item_type": "correction",
-        "workspace_id": row[1],
-        "batch_id": row[2],
-        "contract_id": None,
-        "document_id": row[3],
-        "record_id": row[4],
-        "field_key": row[5],
-        "lifecycle_status": row[6],
-        "queue_status": CORRECTION_QUEUE_STATUS_MAP.get(row[6], "pending"),
-        "custody_owner_id": None,
-        "custody_owner_role": None,
-        "author_id": row[7],
-        "author_email": row[8],
-        "decided_by": row[9],
-        "summary": _correction_summary(row),
-        "before_value": row[10],
-        "after_value": row[11],
-        "created_at": _iso(row[12]),
-        "updated_at": _iso(row[13]),
-        "resolved_at": _iso(row[14]),
-        "version": row[15],
-        "metadata": row[16] if row[16] else {},
-    }
+def _encode_cursor(created_at, item_id):
+    raw = "%s|%s" % (created_at.isoformat() if isinstance(created_at, datetime) else created_at, item_id)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
 
 
-def _correction_summary(row):
-    field_key = row[5] or ""
-    original = row[10] or ""
-    corrected = row[11] or ""
-    if field_key and corrected:
-        return "Correct %s: '%s' → '%s'" % (field_key, original[:30], corrected[:30])
-    return "Correction %s" % row[0][:12]
+def _decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, item_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), item_id
+    except (ValueError, UnicodeDecodeError):
+        return None
 
 
 ANALYST_VISIBLE_PATCH_STATUSES = (
@@ -169,7 +148,7 @@ VERIFIER_VISIBLE_PATCH_STATUSES = (
 
 
 @router.get("/workspaces/{ws_id}/operations/queue")
-def operations_queue(
+async def operations_queue(
     ws_id: str,
     request: Request,
     queue_status: str = Query(None),
@@ -186,84 +165,88 @@ def operations_queue(
     if auth.role and auth.user_id == 'sandbox_user':
         pass
     else:
-        role_err = require_role(ws_id, auth, Role.ANALYST)
+        role_err = await run_in_threadpool(require_role, ws_id, auth, Role.ANALYST)
         if role_err is not None:
             return role_err
 
-    effective_role = _resolve_effective_role(request, auth, ws_id)
-    user_id = auth.user_id
+    after = None
+    if cursor:
+        after = _decode_cursor(cursor)
+        if after is None:
+            return JSONResponse(
+                status_code=400,
+                content=error_envelope("VALIDATION_ERROR", "Invalid cursor"),
+            )
 
-    conn = get_conn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT id FROM workspaces WHERE id = %s AND deleted_at IS NULL", (ws_id,))
-            if not cur.fetchone():
-                return JSONResponse(
-                    status_code=404,
-                    content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
-                )
-
-            items = []
-
-            if item_type is None or item_type == "patch":
-                items.extend(_query_patches(cur, ws_id, batch_id, author_id, role=effective_role, user_id=user_id))
-
-            if item_type is None or item_type == "rfi":
-                items.extend(_query_rfis(cur, ws_id, batch_id, author_id, role=effective_role, user_id=user_id))
-
-            if item_type is None or item_type == "correction":
-                items.extend(_query_corrections(cur, ws_id, batch_id, author_id, role=effective_role, user_id=user_id))
-
-            if queue_status:
-                items = [i for i in items if i["queue_status"] == queue_status]
-
-            counts = {"pending": 0, "needs_clarification": 0, "sent_to_admin": 0, "resolved": 0, "total": 0}
-            all_items_for_counts = []
-            if item_type is None or item_type == "patch":
-                all_items_for_counts.extend(_query_patches(cur, ws_id, batch_id, None, role=effective_role, user_id=user_id))
-            if item_type is None or item_type == "rfi":
-                all_items_for_counts.extend(_query_rfis(cur, ws_id, batch_id, None, role=effective_role, user_id=user_id))
-            if item_type is None or item_type == "correction":
-                all_items_for_counts.extend(_query_corrections(cur, ws_id, batch_id, None, role=effective_role, user_id=user_id))
-            for ci in all_items_for_counts:
-                qs = ci["queue_status"]
-                if qs in counts:
-                    counts[qs] += 1
-                counts["total"] += 1
-
-            items.sort(key=lambda x: x.get("created_at") or "", reverse=True)
-
-            if cursor:
-                items = [i for i in items if i["id"] > cursor]
-
-            has_more = len(items) > limit
+    effective_role = await run_in_threadpool(_resolve_effective_role, request, auth, ws_id)
+    user_id = auth.user_id
+    item_types = [t for t in ("patch", "rfi", "correction") if item_type is None or item_type == t]
+
+    async with async_conn() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await aexecute_prepared(cur, "workspace_exists", (ws_id,))
+                if not await cur.fetchone():
+                    return JSONResponse(
+                        status_code=404,
+                        content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
+                    )
+
+                counts = {"pending": 0, "needs_clarification": 0, "sent_to_admin": 0, "resolved": 0, "total": 0}
+                rows = []
+                if item_types:
+                    sql, params = _queue_page_sql(
+                        item_types, ws_id, batch_id, author_id, effective_role, user_id,
+                        queue_status, after, limit,
+                    )
+                    await cur.execute(sql, params)
+                    rows = await cur.fetchall()
+
+                    sql, params = counter_rows_sql(
+                        ws_id, batch_id=batch_id, item_types=item_types,
+                        author_id=user_id if effective_role == "analyst" else None,
+                    )
+                    await cur.execute(sql, params)
+                    _accumulate_counts(counts, await cur.fetchall(), effective_role)
+
+            has_more = len(rows) > limit
             if has_more:
-                items = items[:limit]
-
-            next_cursor = items[-1]["id"] if items and has_more else None
-
-        meta = {
-            "cursor": next_cursor,
-            "has_more": has_more,
-            "limit": limit,
-            "effective_role": effective_role,
-        }
-        return {
-            "data": {
-                "items": items,
-                "counts": counts,
-            },
-            "meta": meta,
-        }
-    except Exception as e:
-        logger.error("operations_queue error: %s", e)
-        conn.rollback()
-        return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
-    finally:
-        put_conn(conn)
-
-
-def _query_patches(cur, ws_id, batch_id, author_id, role="admin", user_id=None):
+                rows = rows[:limit]
+
+            items = [_build_item(row) for row in rows]
+            next_cursor = _encode_cursor(rows[-1][15], rows[-1][1]) if rows and has_more else None
+
+            meta = {
+                "cursor": next_cursor,
+                "has_more": has_more,
+                "limit": limit,
+                "effective_role": effective_role,
+            }
+            return {
+                "data": {
+                    "items": items,
+                    "counts": counts,
+                },
+                "meta": meta,
+            }
+        except Exception as e:
+            logger.error("operations_queue error: %s", e)
+            await conn.rollback()
+            return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
+
+
+def _status_map_cte(item_types):
+    """VALUES list mapping (item_type, source status) to queue_status, built from the Python maps."""
+    maps = {"patch": PATCH_QUEUE_STATUS_MAP, "rfi": RFI_QUEUE_STATUS_MAP, "correction": CORRECTION_QUEUE_STATUS_MAP}
+    values, params = [], []
+    for t in item_types:
+        for status, qs in maps[t].items():
+            values.append("(%s, %s, %s)")
+            params.extend([t, status, qs])
+    return "status_map(item_type, status, queue_status) AS (VALUES %s)" % ", ".join(values), params
+
+
+def _patch_branch(ws_id, batch_id, author_id, role, user_id):
     conditions = ["p.workspace_id = %s", "p.deleted_at IS NULL", "p.status != 'Draft'"]
     params = [ws_id]
 
@@ -288,22 +271,23 @@ def _query_patches(cur, ws_id, batch_id, author_id, role="admin", user_id=None):
         conditions.append("p.author_id = %s")
         params.append(author_id)
     where = " AND ".join(conditions)
-    cur.execute(
-        """SELECT p.id, p.workspace_id, p.batch_id, p.record_id, p.field_key,
-                  p.status, p.author_id, u.email,
+    return (
+        """SELECT 'patch', p.id, p.workspace_id, p.batch_id, NULL::text,
+                  p.record_id, p.field_key, p.status,
+                  NULL::text, NULL::text,
+                  p.author_id, u.email, NULL::text,
                   p.before_value, p.after_value,
                   p.created_at, p.updated_at, p.resolved_at,
-                  p.version, p.metadata, p.intent
+                  p.version, p.metadata, p.intent,
+                  p.status
            FROM patches p
            LEFT JOIN users u ON u.id = p.author_id
-           WHERE %s
-           ORDER BY p.created_at DESC""" % where,
+           WHERE %s""" % where,
         params,
     )
-    return [_build_patch_item(row) for row in cur.fetchall()]
 
 
-def _query_rfis(cur, ws_id, batch_id, author_id, role="admin", user_id=None):
+def _rfi_branch(ws_id, batch_id, author_id, role, user_id):
     conditions = ["r.workspace_id = %s", "r.deleted_at IS NULL"]
     params = [ws_id]
 
@@ -318,24 +302,25 @@ def _query_rfis(cur, ws_id, batch_id, author_id, role="admin", user_id=None):
         conditions.append("r.author_id = %s")
         params.append(author_id)
     where = " AND ".join(conditions)
-    cur.execute(
-        """SELECT r.id, r.workspace_id, r.batch_id, r.target_record_id, r.target_field_key,
-                  r.status, r.custody_status, r.custody_owner_id, r.custody_owner_role,
+    return (
+        """SELECT 'rfi', r.id, r.workspace_id, r.batch_id, NULL::text,
+                  r.target_record_id, r.target_field_key, COALESCE(r.status, 'open'),
+                  r.custody_owner_id, r.custody_owner_role,
                   r.author_id, u.email, r.responder_id,
-                  r.question, r.response,
-                  r.created_at, r.updated_at,
-                  r.version, r.metadata
+                  NULL::text, r.response,
+                  r.created_at, r.updated_at, NULL::timestamptz,
+                  r.version, r.metadata, r.question,
+                  COALESCE(r.custody_status, 'open')
            FROM rfis r
            LEFT JOIN users u ON u.id = r.author_id
-           WHERE %s
-           ORDER BY r.created_at DESC""" % where,
+           WHERE %s""" % where,
         params,
     )
-    return [_build_rfi_item(row) for row in cur.fetchall()]
 
 
-def _query_corrections(cur, ws_id, batch_id, author_id, role="admin", user_id=None):
-    conditions = ["c.workspace_id = %s", "c.deleted_at IS NULL"]
+def _correction_branch(ws_id, batch_id, author_id, role, user_id):
+    # Corrections on soft-deleted documents are out of the queue, as in the counters.
+    conditions = ["c.workspace_id = %s", "c.deleted_at IS NULL", "d.deleted_at IS NULL"]
     params = [ws_id]
 
     if role == "analyst" and user_id:
@@ -349,88 +334,166 @@ def _query_corrections(cur, ws_id, batch_id, author_id, role="admin", user_id=No
         conditions.append("c.created_by = %s")
         params.append(author_id)
     where = " AND ".join(conditions)
-    cur.execute(
-        """SELECT c.id, c.workspace_id, d.batch_id, c.document_id, c.field_id, c.field_key,
-                  c.status, c.created_by, u.email, c.decided_by,
+    return (
+        """SELECT 'correction', c.id, c.workspace_id, d.batch_id, c.document_id,
+                  c.field_id, c.field_key, c.status,
+                  NULL::text, NULL::text,
+                  c.created_by, u.email, c.decided_by,
                   c.original_value, c.corrected_value,
                   c.created_at, c.updated_at, c.decided_at,
-                  c.version, c.metadata
+                  c.version, c.metadata, NULL::text,
+                  c.status
            FROM corrections c
            JOIN documents d ON d.id = c.document_id
            LEFT JOIN users u ON u.id = c.created_by
-           WHERE %s
-           ORDER BY c.created_at DESC""" % where,
+           WHERE %s""" % where,
         params,
     )
-    return [_build_correction_item(row) for row in cur.fetchall()]
+
+
+_BRANCHES = {"patch": _patch_branch, "rfi": _rfi_branch, "correction": _correction_branch}
+
+
+def _union(item_types, ws_id, batch_id, author_id, role, user_id):
+    parts, params = [], []
+    for t in item_types:
+        sql, p = _BRANCHES[t](ws_id, batch_id, author_id, role, user_id)
+        parts.append(sql)
+        params.extend(p)
+    return " UNION ALL ".join(parts), params
+
+
+def _queue_page_sql(item_types, ws_id, batch_id, author_id, role, user_id, queue_status, after, limit):
+    """One keyset page of the unified queue, newest first, ordered by (created_at, id)."""
+    status_cte, params = _status_map_cte(item_types)
+    union_sql, union_params = _union(item_types, ws_id, batch_id, author_id, role, user_id)
+    params.extend(union_params)
+
+    conditions = []
+    if queue_status:
+        conditions.append("COALESCE(m.queue_status, 'pending') = %s")
+        params.append(queue_status)
+    if after:
+        conditions.append("(i.created_at, i.id) < (%s, %s)")
+        params.extend(after)
+    where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+    params.append(limit + 1)
+
+    sql = """WITH %s,
+             items (item_type, id, workspace_id, batch_id, document_id, record_id, field_key,
+                    lifecycle_status, custody_owner_id, custody_owner_role,
+                    author_id, author_email, decided_by, before_value, after_value,
+                    created_at, updated_at, resolved_at, version, metadata, summary_text,
+                    map_status) AS (%s)
+             SELECT i.item_type, i.id, i.workspace_id, i.batch_id, i.document_id, i.record_id, i.field_key,
+                    i.lifecycle_status, i.custody_owner_id, i.custody_owner_role,
+                    i.author_id, i.author_email, i.decided_by, i.before_value, i.after_value,
+                    i.created_at, i.updated_at, i.resolved_at, i.version, i.metadata, i.summary_text,
+                    COALESCE(m.queue_status, 'pending')
+             FROM items i
+             LEFT JOIN status_map m ON m.item_type = i.item_type AND m.status = i.map_status
+             %s
+             ORDER BY i.created_at DESC, i.id DESC
+             LIMIT %%s""" % (status_cte, union_sql, where)
+    return sql, params
+
+
+def _accumulate_counts(counts, counter_rows, role):
+    """Fold workspace_queue_counters buckets into queue-status counts for *role*'s scope."""
+    if role == "analyst":
+        visible_patches = set(ANALYST_VISIBLE_PATCH_STATUSES)
+    elif role == "verifier":
+        visible_patches = set(VERIFIER_VISIBLE_PATCH_STATUSES)
+    else:
+        visible_patches = None
+
+    for item_type, status, custody_status, n in counter_rows:
+        if item_type == "patch":
+            if status == "Draft" or (visible_patches is not None and status not in visible_patches):
+                continue
+            qs = PATCH_QUEUE_STATUS_MAP.get(status, "pending")
+        elif item_type == "rfi":
+            qs = RFI_QUEUE_STATUS_MAP.get(custody_status or "open", "pending")
+        else:
+            qs = CORRECTION_QUEUE_STATUS_MAP.get(status, "pending")
+        if qs in counts:
+            counts[qs] += n
+        counts["total"] += n
 
 
 @router.get("/workspaces/{ws_id}/corrections")
-def list_workspace_corrections(
+async def list_workspace_corrections(
     ws_id: str,
     request: Request,
     status: str = Query(None),
     batch_id: str = Query(None),
     cursor: str = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    include_total: str = Query(None),
     auth=Depends(require_auth(AuthClass.EITHER)),
 ):
     if isinstance(auth, JSONResponse):
         return auth
+    total_err = include_total_error(include_total)
+    if total_err:
+        return total_err
 
-    effective_role, role_err = require_workspace_member(request, auth, ws_id)
+    effective_role, role_err = await run_in_threadpool(require_workspace_member, request, auth, ws_id)
     if role_err is not None:
         return role_err
 
-    conn = get_conn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT id FROM workspaces WHERE id = %s AND deleted_at IS NULL", (ws_id,))
-            if not cur.fetchone():
-                return JSONResponse(
-                    status_code=404,
-                    content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
-                )
-
-            from server.routes.corrections import CORRECTION_COLUMNS, CORRECTION_SELECT, _row_to_dict
-
-            conditions = ["c.workspace_id = %s", "c.deleted_at IS NULL"]
-            params = [ws_id]
-
-            if effective_role == "analyst":
-                conditions.append("c.created_by = %s")
-                params.append(auth.user_id)
-
-            if status:
-                conditions.append("c.status = %s")
-                params.append(status)
-            if batch_id:
-                conditions.append("c.document_id IN (SELECT id FROM documents WHERE batch_id = %s AND deleted_at IS NULL)")
-                params.append(batch_id)
-            if cursor:
-                conditions.append("c.id > %s")
-                params.append(cursor)
-
-            where = "WHERE " + " AND ".join(conditions)
-            col_list = ", ".join(["c." + col for col in CORRECTION_COLUMNS])
-            sql = "SELECT %s FROM corrections c %s ORDER BY c.id ASC LIMIT %%s" % (col_list, where)
-            params.append(limit + 1)
-
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-
-        has_more = len(rows) > limit
-        if has_more:
-            rows = rows[:limit]
-
-        items = [_row_to_dict(r, CORRECTION_COLUMNS) for r in rows]
-        next_cursor = items[-1]["id"] if items and has_more else None
-
-        from server.api_v25 import collection_envelope
-        return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit)
-    except Exception as e:
-        logger.error("list_workspace_corrections error: %s", e)
-        conn.rollback()
-        return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
-    finally:
-        put_conn(conn)
+    async with async_conn() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await aexecute_prepared(cur, "workspace_exists", (ws_id,))
+                if not await cur.fetchone():
+                    return JSONResponse(
+                        status_code=404,
+                        content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
+                    )
+
+                from server.routes.corrections import CORRECTION_COLUMNS, CORRECTION_SELECT, _row_to_dict
+
+                conditions = ["c.workspace_id = %s", "c.deleted_at IS NULL"]
+                params = [ws_id]
+
+                if effective_role == "analyst":
+                    conditions.append("c.created_by = %s")
+                    params.append(auth.user_id)
+
+                if status:
+                    conditions.append("c.status = %s")
+                    params.append(status)
+                if batch_id:
+                    conditions.append("c.document_id IN (SELECT id FROM documents WHERE batch_id = %s AND deleted_at IS NULL)")
+                    params.append(batch_id)
+                total_where = "WHERE " + " AND ".join(conditions)
+                total_params = list(params)
+                if cursor:
+                    conditions.append("c.id > %s")
+                    params.append(cursor)
+
+                where = "WHERE " + " AND ".join(conditions)
+                col_list = ", ".join(["c." + col for col in CORRECTION_COLUMNS])
+                sql = "SELECT %s FROM corrections c %s ORDER BY c.id ASC LIMIT %%s" % (col_list, where)
+                params.append(limit + 1)
+
+                await cur.execute(sql, params)
+                rows = await cur.fetchall()
+                total = None
+                if include_total:
+                    total = await fetch_total(cur, include_total, "corrections c", total_where, total_params)
+
+            has_more = len(rows) > limit
+            if has_more:
+                rows = rows[:limit]
+
+            items = [_row_to_dict(r, CORRECTION_COLUMNS) for r in rows]
+            next_cursor = items[-1]["id"] if items and has_more else None
+
+            from server.api_v25 import collection_envelope
+            return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit, total=total)
+        except Exception as e:
+            logger.error("list_workspace_corrections error: %s", e)
+            await conn.rollback()
+            return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
@@ -3,13 +3,18 @@ import logging
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
-from server.db import get_conn, put_conn
+from server.db import get_conn, put_conn, async_conn
+from server.prepared import execute_prepared, aexecute_prepared
 from server.ulid import generate_id
 from server.api_v25 import envelope, collection_envelope, error_envelope
+from server.batch_get import batch_get
+from server.list_totals import fetch_total, include_total_error
 from server.auth import AuthClass, require_auth
 from server.audit import emit_audit_event
+from server.queue_counters import move_in, move_out
 from server.role_scope import require_workspace_member
 
 logger = logging.getLogger(__name__)
@@ -74,10 +79,7 @@ def _row_to_dict(row, columns):
 
 def _check_role(user_id, workspace_id, min_role, conn):
     with conn.cursor() as cur:
-        cur.execute(
-            "SELECT role FROM user_workspace_roles WHERE user_id = %s AND workspace_id = %s",
-            (user_id, workspace_id),
-        )
+        execute_prepared(cur, "workspace_role", (user_id, workspace_id))
         row = cur.fetchone()
     if not row:
         return None, "No role assigned in this workspace"
@@ -88,11 +90,12 @@ def _check_role(user_id, workspace_id, min_role, conn):
 
 
 @router.get("/workspaces/{ws_id}/patches")
-def list_patches(
+async def list_patches(
     ws_id: str,
     request: Request = None,
     cursor: str = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    include_total: str = Query(None),
     status: str = Query(None),
     author_id: str = Query(None),
     record_id: str = Query(None),
@@ -103,74 +106,80 @@ def list_patches(
 ):
     if isinstance(auth, JSONResponse):
         return auth
+    total_err = include_total_error(include_total)
+    if total_err:
+        return total_err
 
-    effective_role, role_err = require_workspace_member(request, auth, ws_id)
+    effective_role, role_err = await run_in_threadpool(require_workspace_member, request, auth, ws_id)
     if role_err is not None:
         return role_err
 
-    conn = get_conn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT id FROM workspaces WHERE id = %s AND deleted_at IS NULL", (ws_id,))
-            if not cur.fetchone():
-                return JSONResponse(
-                    status_code=404,
-                    content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
-                )
-
-            conditions = ["workspace_id = %s"]
-            params = [ws_id]
-
-            if effective_role == "analyst":
-                conditions.append("author_id = %s")
-                params.append(auth.user_id)
-
-            if not include_deleted:
-                conditions.append("deleted_at IS NULL")
-            if not include_hidden:
-                conditions.append("status NOT IN ('Sent_to_Kiwi', 'Kiwi_Returned')")
-            if status:
-                if status not in ALL_STATUSES:
+    async with async_conn() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await aexecute_prepared(cur, "workspace_exists", (ws_id,))
+                if not await cur.fetchone():
                     return JSONResponse(
-                        status_code=400,
-                        content=error_envelope("VALIDATION_ERROR", "Invalid status filter: %s" % status),
+                        status_code=404,
+                        content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
                     )
-                conditions.append("status = %s")
-                params.append(status)
-            if author_id:
-                conditions.append("author_id = %s")
-                params.append(author_id)
-            if record_id:
-                conditions.append("record_id = %s")
-                params.append(record_id)
-            if batch_id:
-                conditions.append("batch_id = %s")
-                params.append(batch_id)
-            if cursor:
-                conditions.append("id > %s")
-                params.append(cursor)
-
-            where = "WHERE " + " AND ".join(conditions)
-            sql = "SELECT %s FROM patches %s ORDER BY id ASC LIMIT %%s" % (PATCH_SELECT, where)
-            params.append(limit + 1)
-
-            cur.execute(sql, params)
-            rows = cur.fetchall()
 
-        has_more = len(rows) > limit
-        if has_more:
-            rows = rows[:limit]
+                conditions = ["workspace_id = %s"]
+                params = [ws_id]
 
-        items = [_row_to_dict(r, PATCH_COLUMNS) for r in rows]
-        next_cursor = items[-1]["id"] if items and has_more else None
+                if effective_role == "analyst":
+                    conditions.append("author_id = %s")
+                    params.append(auth.user_id)
 
-        return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit)
-    except Exception as e:
-        logger.error("list_patches error: %s", e)
-        conn.rollback()
-        return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
-    finally:
-        put_conn(conn)
+                if not include_deleted:
+                    conditions.append("deleted_at IS NULL")
+                if not include_hidden:
+                    conditions.append("status NOT IN ('Sent_to_Kiwi', 'Kiwi_Returned')")
+                if status:
+                    if status not in ALL_STATUSES:
+                        return JSONResponse(
+                            status_code=400,
+                            content=error_envelope("VALIDATION_ERROR", "Invalid status filter: %s" % status),
+                        )
+                    conditions.append("status = %s")
+                    params.append(status)
+                if author_id:
+                    conditions.append("author_id = %s")
+                    params.append(author_id)
+                if record_id:
+                    conditions.append("record_id = %s")
+                    params.append(record_id)
+                if batch_id:
+                    conditions.append("batch_id = %s")
+                    params.append(batch_id)
+                total_where = "WHERE " + " AND ".join(conditions)
+                total_params = list(params)
+                if cursor:
+                    conditions.append("id > %s")
+                    params.append(cursor)
+
+                where = "WHERE " + " AND ".join(conditions)
+                sql = "SELECT %s FROM patches %s ORDER BY id ASC LIMIT %%s" % (PATCH_SELECT, where)
+                params.append(limit + 1)
+
+                await cur.execute(sql, params)
+                rows = await cur.fetchall()
+                total = None
+                if include_total:
+                    total = await fetch_total(cur, include_total, "patches", total_where, total_params)
+
+            has_more = len(rows) > limit
+            if has_more:
+                rows = rows[:limit]
+
+            items = [_row_to_dict(r, PATCH_COLUMNS) for r in rows]
+            next_cursor = items[-1]["id"] if items and has_more else None
+
+            return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit, total=total)
+        except Exception as e:
+            logger.error("list_patches error: %s", e)
+            await conn.rollback()
+            return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
 
 
 @router.post("/workspaces/{ws_id}/patches", status_code=201)
@@ -198,7 +207,7 @@ def create_patch(
     conn = get_conn()
     try:
         with conn.cursor() as cur:
-            cur.execute("SELECT id FROM workspaces WHERE id = %s AND deleted_at IS NULL", (ws_id,))
+            execute_prepared(cur, "workspace_exists", (ws_id,))
             if not cur.fetchone():
                 return JSONResponse(
                     status_code=404,
@@ -228,6 +237,7 @@ def create_patch(
                  json.dumps(metadata)),
             )
             row = cur.fetchone()
+            move_in(cur, "patch", pat_id)
 
             emit_audit_event(
                 cur,
@@ -254,6 +264,17 @@ def create_patch(
         put_conn(conn)
 
 
+@router.post("/patches:batchGet")
+async def batch_get_patches(
+    body: dict,
+    request: Request = None,
+    auth=Depends(require_auth(AuthClass.EITHER)),
+):
+    if isinstance(auth, JSONResponse):
+        return auth
+    return await batch_get(request, auth, body, "patches", PATCH_COLUMNS, _row_to_dict, "batch_get_patches")
+
+
 @router.get("/patches/{pat_id}")
 def get_patch(
     pat_id: str,
@@ -450,6 +471,10 @@ def update_patch(
             set_clauses.append("version = version + 1")
             set_clauses.append("updated_at = NOW()")
 
+            status_changed = bool(new_status and new_status != current_status)
+            if status_changed:
+                move_out(cur, "patch", pat_id)
+
             params.extend([pat_id, version])
             sql = "UPDATE patches SET %s WHERE id = %%s AND version = %%s RETURNING %s" % (
                 ", ".join(set_clauses),
@@ -464,6 +489,8 @@ def update_patch(
                     status_code=409,
                     content=error_envelope("STALE_VERSION", "Concurrent modification detected"),
                 )
+            if status_changed:
+                move_in(cur, "patch", pat_id)
 
             event_type = "patch.updated"
             detail = {"fields": list(field_updates.keys()), "new_version": version + 1}
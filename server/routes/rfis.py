@@ -3,13 +3,18 @@ import logging
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
-from server.db import get_conn, put_conn
+from server.db import get_conn, put_conn, async_conn
+from server.prepared import execute_prepared, aexecute_prepared
 from server.ulid import generate_id
 from server.api_v25 import envelope, collection_envelope, error_envelope
+from server.batch_get import batch_get
+from server.list_totals import fetch_total, include_total_error
 from server.auth import AuthClass, require_auth, get_workspace_role
 from server.audit import emit_audit_event
+from server.queue_counters import move_in, move_out
 from server.role_scope import require_workspace_member
 
 logger = logging.getLogger(__name__)
@@ -75,78 +80,85 @@ def _row_to_dict(row, columns):
 
 
 @router.get("/workspaces/{ws_id}/rfis")
-def list_rfis(
+async def list_rfis(
     ws_id: str,
     request: Request = None,
     cursor: str = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    include_total: str = Query(None),
     include_deleted: bool = Query(False),
     record_id: str = Query(None),
     auth=Depends(require_auth(AuthClass.EITHER)),
 ):
     if isinstance(auth, JSONResponse):
         return auth
+    total_err = include_total_error(include_total)
+    if total_err:
+        return total_err
 
-    effective_role, role_err = require_workspace_member(request, auth, ws_id)
+    effective_role, role_err = await run_in_threadpool(require_workspace_member, request, auth, ws_id)
     if role_err is not None:
         return role_err
 
-    conn = get_conn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT id FROM workspaces WHERE id = %s AND deleted_at IS NULL", (ws_id,))
-            if not cur.fetchone():
-                return JSONResponse(
-                    status_code=404,
-                    content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
-                )
-
-            conditions = ["workspace_id = %s"]
-            params: list = [ws_id]
-
-            if effective_role == "analyst":
-                conditions.append("author_id = %s")
-                params.append(auth.user_id)
-
-            if not include_deleted:
-                conditions.append("deleted_at IS NULL")
-            if record_id:
-                conditions.append("target_record_id = %s")
-                params.append(record_id)
-
-            batch_id_param = request.query_params.get("batch_id") if hasattr(request, 'query_params') else None
-            custody_status_param = request.query_params.get("custody_status") if hasattr(request, 'query_params') else None
-            if batch_id_param:
-                conditions.append("batch_id = %s")
-                params.append(batch_id_param)
-            if custody_status_param:
-                conditions.append("custody_status = %s")
-                params.append(custody_status_param)
-            if cursor:
-                conditions.append("id > %s")
-                params.append(cursor)
-
-            where = "WHERE " + " AND ".join(conditions)
-            sql = "SELECT %s FROM rfis %s ORDER BY id ASC LIMIT %%s" % (RFI_SELECT, where)
-            params.append(limit + 1)
-
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-
-        has_more = len(rows) > limit
-        if has_more:
-            rows = rows[:limit]
-
-        items = [_row_to_dict(r, RFI_COLUMNS) for r in rows]
-        next_cursor = items[-1]["id"] if items and has_more else None
+    async with async_conn() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await aexecute_prepared(cur, "workspace_exists", (ws_id,))
+                if not await cur.fetchone():
+                    return JSONResponse(
+                        status_code=404,
+                        content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
+                    )
 
-        return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit)
-    except Exception as e:
-        logger.error("list_rfis error: %s", e)
-        conn.rollback()
-        return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
-    finally:
-        put_conn(conn)
+                conditions = ["workspace_id = %s"]
+                params: list = [ws_id]
+
+                if effective_role == "analyst":
+                    conditions.append("author_id = %s")
+                    params.append(auth.user_id)
+
+                if not include_deleted:
+                    conditions.append("deleted_at IS NULL")
+                if record_id:
+                    conditions.append("target_record_id = %s")
+                    params.append(record_id)
+
+                batch_id_param = request.query_params.get("batch_id") if hasattr(request, 'query_params') else None
+                custody_status_param = request.query_params.get("custody_status") if hasattr(request, 'query_params') else None
+                if batch_id_param:
+                    conditions.append("batch_id = %s")
+                    params.append(batch_id_param)
+                if custody_status_param:
+                    conditions.append("custody_status = %s")
+                    params.append(custody_status_param)
+                total_where = "WHERE " + " AND ".join(conditions)
+                total_params = list(params)
+                if cursor:
+                    conditions.append("id > %s")
+                    params.append(cursor)
+
+                where = "WHERE " + " AND ".join(conditions)
+                sql = "SELECT %s FROM rfis %s ORDER BY id ASC LIMIT %%s" % (RFI_SELECT, where)
+                params.append(limit + 1)
+
+                await cur.execute(sql, params)
+                rows = await cur.fetchall()
+                total = None
+                if include_total:
+                    total = await fetch_total(cur, include_total, "rfis", total_where, total_params)
+
+            has_more = len(rows) > limit
+            if has_more:
+                rows = rows[:limit]
+
+            items = [_row_to_dict(r, RFI_COLUMNS) for r in rows]
+            next_cursor = items[-1]["id"] if items and has_more else None
+
+            return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit, total=total)
+        except Exception as e:
+            logger.error("list_rfis error: %s", e)
+            await conn.rollback()
+            return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
 
 
 @router.post("/workspaces/{ws_id}/rfis", status_code=201)
@@ -188,7 +200,7 @@ def create_rfi(
     conn = get_conn()
     try:
         with conn.cursor() as cur:
-            cur.execute("SELECT id FROM workspaces WHERE id = %s AND deleted_at IS NULL", (ws_id,))
+            execute_prepared(cur, "workspace_exists", (ws_id,))
             if not cur.fetchone():
                 return JSONResponse(
                     status_code=404,
@@ -220,6 +232,7 @@ def create_rfi(
                  "open", auth.user_id, "analyst", rfi_batch_id),
             )
             row = cur.fetchone()
+            move_in(cur, "rfi", rfi_id)
 
             audit_detail = {"question": question, "target_record_id": target_record_id}
             if auth.is_role_simulated:
@@ -258,6 +271,17 @@ def create_rfi(
         put_conn(conn)
 
 
+@router.post("/rfis:batchGet")
+async def batch_get_rfis(
+    body: dict,
+    request: Request = None,
+    auth=Depends(require_auth(AuthClass.EITHER)),
+):
+    if isinstance(auth, JSONResponse):
+        return auth
+    return await batch_get(request, auth, body, "rfis", RFI_COLUMNS, _row_to_dict, "batch_get_rfis")
+
+
 @router.get("/rfis/{rfi_id}")
 def get_rfi(
     rfi_id: str,
@@ -439,6 +463,10 @@ def update_rfi(
             set_clauses.append("version = version + 1")
             set_clauses.append("updated_at = NOW()")
 
+            status_changed = "status" in updates or "custody_status" in updates
+            if status_changed:
+                move_out(cur, "rfi", rfi_id)
+
             params.extend([rfi_id, version])
             sql = "UPDATE rfis SET %s WHERE id = %%s AND version = %%s RETURNING %s" % (
                 ", ".join(set_clauses),
@@ -453,6 +481,8 @@ def update_rfi(
                     status_code=409,
                     content=error_envelope("STALE_VERSION", "Concurrent modification detected"),
                 )
+            if status_changed:
+                move_in(cur, "rfi", rfi_id)
 
             audit_detail = {"fields": list(updates.keys()), "new_version": version + 1}
             if "custody_status" in updates:
@@ -497,68 +527,75 @@ def update_rfi(
 
 
 @router.get("/batches/{bat_id}/rfis")
-def list_batch_rfis(
+async def list_batch_rfis(
     bat_id: str,
     status: str = Query(None),
     custody_status: str = Query(None),
     cursor: str = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    include_total: str = Query(None),
     auth=Depends(require_auth(AuthClass.EITHER)),
 ):
     if isinstance(auth, JSONResponse):
         return auth
+    total_err = include_total_error(include_total)
+    if total_err:
+        return total_err
 
     from server.feature_flags import require_evidence_inspector
     gate = require_evidence_inspector()
     if gate:
         return gate
 
-    conn = get_conn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT id, workspace_id FROM batches WHERE id = %s AND deleted_at IS NULL", (bat_id,))
-            batch_row = cur.fetchone()
-            if not batch_row:
-                return JSONResponse(
-                    status_code=404,
-                    content=error_envelope("NOT_FOUND", "Batch not found: %s" % bat_id),
-                )
-            workspace_id = batch_row[1]
-
-            conditions = ["batch_id = %s", "deleted_at IS NULL"]
-            params: list = [bat_id]
-
-            if custody_status:
-                conditions.append("custody_status = %s")
-                params.append(custody_status)
-            elif status:
-                conditions.append("(custody_status = %s OR (custody_status IS NULL AND status = %s))")
-                params.extend([status, status])
-            else:
-                conditions.append("(custody_status IN ('open', 'awaiting_verifier') OR (custody_status IS NULL AND status IN ('open', 'responded')))")
-
-            if cursor:
-                conditions.append("id > %s")
-                params.append(cursor)
-
-            where = "WHERE " + " AND ".join(conditions)
-            sql = "SELECT %s FROM rfis %s ORDER BY id ASC LIMIT %%s" % (RFI_SELECT, where)
-            params.append(limit + 1)
-
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-
-        has_more = len(rows) > limit
-        if has_more:
-            rows = rows[:limit]
+    async with async_conn() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT id, workspace_id FROM batches WHERE id = %s AND deleted_at IS NULL", (bat_id,))
+                batch_row = await cur.fetchone()
+                if not batch_row:
+                    return JSONResponse(
+                        status_code=404,
+                        content=error_envelope("NOT_FOUND", "Batch not found: %s" % bat_id),
+                    )
+                workspace_id = batch_row[1]
 
-        items = [_row_to_dict(r, RFI_COLUMNS) for r in rows]
-        next_cursor = items[-1]["id"] if items and has_more else None
+                conditions = ["batch_id = %s", "deleted_at IS NULL"]
+                params: list = [bat_id]
 
-        return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit)
-    except Exception as e:
-        logger.error("list_batch_rfis error: %s", e)
-        conn.rollback()
-        return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
-    finally:
-        put_conn(conn)
+                if custody_status:
+                    conditions.append("custody_status = %s")
+                    params.append(custody_status)
+                elif status:
+                    conditions.append("(custody_status = %s OR (custody_status IS NULL AND status = %s))")
+                    params.extend([status, status])
+                else:
+                    conditions.append("(custody_status IN ('open', 'awaiting_verifier') OR (custody_status IS NULL AND status IN ('open', 'responded')))")
+
+                total_where = "WHERE " + " AND ".join(conditions)
+                total_params = list(params)
+                if cursor:
+                    conditions.append("id > %s")
+                    params.append(cursor)
+
+                where = "WHERE " + " AND ".join(conditions)
+                sql = "SELECT %s FROM rfis %s ORDER BY id ASC LIMIT %%s" % (RFI_SELECT, where)
+                params.append(limit + 1)
+
+                await cur.execute(sql, params)
+                rows = await cur.fetchall()
+                total = None
+                if include_total:
+                    total = await fetch_total(cur, include_total, "rfis", total_where, total_params)
+
+            has_more = len(rows) > limit
+            if has_more:
+                rows = rows[:limit]
+
+            items = [_row_to_dict(r, RFI_COLUMNS) for r in rows]
+            next_cursor = items[-1]["id"] if items and has_more else None
+
+            return collection_envelope(items, cursor=next_cursor, has_more=has_more, limit=limit, total=total)
+        except Exception as e:
+            logger.error("list_batch_rfis error: %s", e)
+            await conn.rollback()
+            return JSONResponse(status_code=500, content=error_envelope("INTERNAL", str(e)))
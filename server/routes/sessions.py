@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import JSONResponse
 
-from server.db import get_conn, put_conn
+from server.db import get_conn, get_conn_async, put_conn
 from server.ulid import generate_id
 from server.api_v25 import envelope, collection_envelope, error_envelope
 from server.auth import AuthClass, require_auth, require_role, Role
@@ -115,7 +115,7 @@ async def create_session(ws_id: str, request: Request, auth=Depends(require_auth
             content=error_envelope("VALIDATION_ERROR", "source_ref is required"),
         )
 
-    conn = get_conn()
+    conn = await get_conn_async()
     try:
         with conn.cursor() as cur:
             cur.execute(
@@ -262,7 +262,7 @@ async def update_session(ws_id: str, session_id: str, request: Request, auth=Dep
             content=error_envelope("VALIDATION_ERROR", "Invalid JSON body"),
         )
 
-    conn = get_conn()
+    conn = await get_conn_async()
     try:
         with conn.cursor() as cur:
             cur.execute(
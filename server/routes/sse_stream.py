@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import time
@@ -7,9 +8,11 @@ from fastapi import APIRouter, Depends, Request, Query
 from fastapi.responses import JSONResponse
 from sse_starlette.sse import EventSourceResponse
 
-from server.db import get_conn, put_conn
+from server.db import async_conn
+from server.prepared import aexecute_prepared
 from server.api_v25 import error_envelope
 from server.auth import AuthClass, require_auth
+from server.audit_partitions import id_lower_bound
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v2.5")
@@ -33,37 +36,39 @@ def _row_to_dict(row, columns):
     return d
 
 
-def _sse_event_generator(ws_id, last_event_id, auth_user_id):
+async def _sse_event_generator(ws_id, last_event_id, auth_user_id):
     last_id = last_event_id or ""
     poll_interval = 2
 
     while True:
-        conn = get_conn()
         try:
-            with conn.cursor() as cur:
-                if last_id:
-                    cur.execute(
-                        "SELECT %s FROM audit_events WHERE workspace_id = %%s AND id > %%s ORDER BY id ASC LIMIT 50" % AUDIT_SELECT,
-                        (ws_id, last_id),
-                    )
-                else:
-                    cur.execute(
-                        "SELECT %s FROM audit_events WHERE workspace_id = %%s ORDER BY id DESC LIMIT 10" % AUDIT_SELECT,
-                        (ws_id,),
-                    )
-                rows = cur.fetchall()
-
-                if not last_id and rows:
-                    rows = list(reversed(rows))
+            async with async_conn() as conn:
+                async with conn.cursor() as cur:
+                    lower = id_lower_bound(last_id)
+                    if last_id and lower:
+                        await cur.execute(
+                            "SELECT %s FROM audit_events WHERE workspace_id = %%s AND id > %%s AND timestamp_iso >= %%s "
+                            "ORDER BY id ASC LIMIT 50" % AUDIT_SELECT,
+                            (ws_id, last_id, lower),
+                        )
+                    elif last_id:
+                        await cur.execute(
+                            "SELECT %s FROM audit_events WHERE workspace_id = %%s AND id > %%s ORDER BY id ASC LIMIT 50" % AUDIT_SELECT,
+                            (ws_id, last_id),
+                        )
+                    else:
+                        await cur.execute(
+                            "SELECT %s FROM audit_events WHERE workspace_id = %%s ORDER BY id DESC LIMIT 10" % AUDIT_SELECT,
+                            (ws_id,),
+                        )
+                    rows = await cur.fetchall()
+
+            if not last_id and rows:
+                rows = list(reversed(rows))
         except Exception as e:
             logger.error("SSE poll error: %s", e)
-            conn.rollback()
-            put_conn(conn)
-            time.sleep(poll_interval)
+            await asyncio.sleep(poll_interval)
             continue
-        finally:
-            if conn:
-                put_conn(conn)
 
         if rows:
             for row in rows:
@@ -95,7 +100,7 @@ def _sse_event_generator(ws_id, last_event_id, auth_user_id):
                 }
 
         yield {"event": "heartbeat", "data": json.dumps({"ts": int(time.time())})}
-        time.sleep(poll_interval)
+        await asyncio.sleep(poll_interval)
 
 
 def _infer_resource_type(event_type):
@@ -126,17 +131,14 @@ async def sse_event_stream(
     if isinstance(auth, JSONResponse):
         return auth
 
-    conn = get_conn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT id FROM workspaces WHERE id = %s AND deleted_at IS NULL", (ws_id,))
-            if not cur.fetchone():
+    async with async_conn() as conn:
+        async with conn.cursor() as cur:
+            await aexecute_prepared(cur, "workspace_exists", (ws_id,))
+            if not await cur.fetchone():
                 return JSONResponse(
                     status_code=404,
                     content=error_envelope("NOT_FOUND", "Workspace not found: %s" % ws_id),
                 )
-    finally:
-        put_conn(conn)
 
     last_event_id = request.headers.get("Last-Event-ID")
 
@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import JSONResponse
 
-from server.db import get_conn, put_conn
+from server.db import get_conn, get_conn_async, put_conn, LANE_LONG
 from server.ulid import generate_id
 from server.api_v25 import envelope, collection_envelope, error_envelope
 from server.auth import AuthClass, require_auth
@@ -82,7 +82,7 @@ async def create_suggestion_run(
 
     body = {}
 
-    conn = get_conn()
+    conn = await get_conn_async(lane=LANE_LONG)
     try:
         with conn.cursor() as cur:
             cur.execute(
@@ -211,7 +211,7 @@ async def create_local_suggestion_run(
     if isinstance(auth, JSONResponse):
         return auth
 
-    conn = get_conn()
+    conn = await get_conn_async(lane=LANE_LONG)
     try:
         body = {}
         try:
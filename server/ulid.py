@@ -35,3 +35,17 @@ def generate_id(prefix):
     random_encoded = _encode_crockford(random_int, 16)
 
     return "%s%s%s" % (prefix, timestamp_encoded, random_encoded)
+
+
+def id_timestamp_ms(id_str):
+    """Millisecond timestamp encoded in a generate_id() value, or None if it does not decode."""
+    body = id_str.split("_", 1)[-1]
+    if len(body) != 26:
+        return None
+    value = 0
+    for ch in body[:10].upper():
+        idx = CROCKFORD_ALPHABET.find(ch)
+        if idx < 0:
+            return None
+        value = (value << 5) | idx
+    return value
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from server import db
+
+
+@pytest.fixture(params=["threaded", "native"])
+def run(request):
+    """Run a coroutine against async_conn on the threaded fallback or the native async pool."""
+    if request.param == "native":
+        pytest.importorskip("psycopg_pool")
+    db.init_pool(DATABASE_URL, min_conn=1, max_conn=4)
+
+    def runner(coro_fn):
+        async def scenario():
+            if request.param == "native":
+                await db.init_async_pool(DATABASE_URL, min_conn=1, max_conn=2)
+            try:
+                return await coro_fn()
+            finally:
+                await db.close_async_pool()
+        return asyncio.run(scenario())
+
+    yield runner
+    db.close_pool()
+
+
+@pytest.fixture
+def table_name():
+    name = "test_async_conn_%s" % uuid.uuid4().hex[:12]
+    yield name
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("DROP TABLE IF EXISTS %s" % name)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _table_exists(name):
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s)", (name,))
+            return cur.fetchone()[0] is not None
+    finally:
+        conn.close()
+
+
+def test_clean_exit_commits(run, table_name):
+    async def scenario():
+        async with db.async_conn() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("CREATE TABLE %s (n int)" % table_name)
+
+    run(scenario)
+    assert _table_exists(table_name)
+
+
+def test_exception_rolls_back(run, table_name):
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with db.async_conn() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("CREATE TABLE %s (n int)" % table_name)
+                raise RuntimeError("handler failed")
+
+    run(scenario)
+    assert not _table_exists(table_name)
+
+
+def test_threaded_fallback_nests_in_the_request_transaction():
+    db.init_pool(DATABASE_URL, min_conn=1, max_conn=4)
+    holder = db.RequestConnection()
+    token = db._request_conn.set(holder)
+    try:
+        shared = db.get_conn()
+        with shared.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE handler_writes (n int)")
+            cur.execute("INSERT INTO handler_writes VALUES (1)")
+
+        async def scenario():
+            async with db.async_conn() as conn:
+                assert conn._conn is shared
+                async with conn.cursor() as cur:
+                    await cur.execute("INSERT INTO handler_writes VALUES (2)")
+                    await conn.rollback()
+                    await cur.execute("INSERT INTO handler_writes VALUES (3)")
+            assert db.get_pool_metrics()["lanes"][db.LANE_SHORT]["in_use"] == 1
+
+        asyncio.run(scenario())
+        # The block ran in a savepoint: its rollback undid only its own write, and the
+        # handler's transaction stays open for the handler to commit.
+        assert shared.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        with shared.cursor() as cur:
+            cur.execute("SELECT array_agg(n ORDER BY n) FROM handler_writes")
+            assert cur.fetchone()[0] == [1, 3]
+        shared.rollback()
+    finally:
+        db._request_conn.reset(token)
+        holder.release()
+        db.close_pool()
@@ -0,0 +1,143 @@
+import os
+import queue
+import time
+import uuid
+
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("fastapi")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from server import audit, db, feature_flags
+from server.audit import emit_audit_event, get_audit_queue_metrics, stop_audit_worker
+
+WORKSPACE_ID = "ws_SEED0100000000000000000000"
+
+
+@pytest.fixture
+def buffered_pool(request, monkeypatch):
+    """Pool with AUDIT_BUFFERED on, or set to the indirect parameter."""
+    monkeypatch.setenv(feature_flags.AUDIT_BUFFERED, getattr(request, "param", "true"))
+    feature_flags.clear_cache()
+    db.init_pool(DATABASE_URL, min_conn=1, max_conn=4)
+    yield
+    db.close_pool()
+    feature_flags.clear_cache()
+
+
+@pytest.fixture
+def fresh_queue(monkeypatch):
+    """An empty best-effort queue for this test; the worker is stopped and drained afterwards."""
+    monkeypatch.setattr(audit, "_queue", queue.Queue(maxsize=audit.BEST_EFFORT_QUEUE_MAX))
+    yield audit._queue
+    stop_audit_worker()
+
+
+def _count_events(event_type):
+    conn = db.get_conn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM audit_events WHERE event_type = %s", (event_type,))
+            return cur.fetchone()[0]
+    finally:
+        db.put_conn(conn)
+
+
+def test_buffered_events_flush_on_commit(buffered_pool):
+    event_type = "test.buffered.%s" % uuid.uuid4().hex
+    conn = db.get_conn()
+    try:
+        with conn.cursor() as cur:
+            emit_audit_event(cur, WORKSPACE_ID, event_type, "usr_test")
+            emit_audit_event(cur, WORKSPACE_ID, event_type, "usr_test")
+        assert len(conn.audit_buffer) == 2
+        assert _count_events(event_type) == 0
+        conn.commit()
+    finally:
+        db.put_conn(conn)
+    assert _count_events(event_type) == 2
+
+
+def test_uncommitted_buffer_is_not_flushed_by_next_borrower(buffered_pool):
+    event_type = "test.abandoned.%s" % uuid.uuid4().hex
+    conn = db.get_conn()
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1")
+        emit_audit_event(cur, WORKSPACE_ID, event_type, "usr_test")
+    assert conn.audit_buffer
+    db.put_conn(conn)  # returned without commit: the transaction is abandoned
+
+    reused = db.get_conn()
+    try:
+        assert reused is conn
+        assert reused.audit_buffer == []
+        with reused.cursor() as cur:
+            cur.execute("SELECT 1")
+        reused.commit()
+    finally:
+        db.put_conn(reused)
+    assert _count_events(event_type) == 0
+
+
+def _metric_deltas(before):
+    after = get_audit_queue_metrics()
+    return {k: after[k] - before[k] for k in ("enqueued", "dropped", "flushed", "flush_failures")}
+
+
+@pytest.mark.parametrize("buffered_pool", ["true", "false"], indirect=True, ids=["buffered", "unbuffered"])
+def test_best_effort_events_skip_the_transaction_and_flush_from_the_queue(buffered_pool, fresh_queue):
+    event_type = "test.best_effort.%s" % uuid.uuid4().hex
+    before = get_audit_queue_metrics()
+    conn = db.get_conn()
+    try:
+        with conn.cursor() as cur:
+            emit_audit_event(cur, WORKSPACE_ID, event_type, "usr_test", best_effort=True)
+            emit_audit_event(cur, WORKSPACE_ID, event_type, "usr_test", best_effort=True)
+        assert conn.audit_buffer == []
+        conn.rollback()
+    finally:
+        db.put_conn(conn)
+    stop_audit_worker()
+    assert _count_events(event_type) == 2
+    assert _metric_deltas(before) == {"enqueued": 2, "dropped": 0, "flushed": 2, "flush_failures": 0}
+
+
+def test_full_queue_drops_events(buffered_pool, monkeypatch):
+    monkeypatch.setattr(audit, "_queue", queue.Queue(maxsize=1))
+    monkeypatch.setattr(audit, "_ensure_worker", lambda: None)
+    before = get_audit_queue_metrics()
+    audit._enqueue(audit._audit_row(WORKSPACE_ID, "test.dropped", "usr_test"))
+    audit._enqueue(audit._audit_row(WORKSPACE_ID, "test.dropped", "usr_test"))
+    assert _metric_deltas(before) == {"enqueued": 1, "dropped": 1, "flushed": 0, "flush_failures": 0}
+    assert get_audit_queue_metrics()["queued"] == 1
+
+
+def test_next_batch_is_capped(fresh_queue, monkeypatch):
+    monkeypatch.setattr(audit, "BEST_EFFORT_BATCH", 2)
+    for n in range(5):
+        fresh_queue.put_nowait(n)
+    assert audit._next_batch(block=False) == [0, 1]
+    assert audit._next_batch(block=False) == [2, 3]
+    assert audit._next_batch(block=False) == [4]
+    assert audit._next_batch(block=False) == []
+
+
+def _wait_for_metric(key, target, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while get_audit_queue_metrics()[key] < target:
+        assert time.monotonic() < deadline, "audit worker did not reach %s=%d" % (key, target)
+        time.sleep(0.01)
+
+
+def test_failed_flush_is_counted_and_the_worker_keeps_draining(buffered_pool, fresh_queue):
+    event_type = "test.after_failure.%s" % uuid.uuid4().hex
+    before = get_audit_queue_metrics()
+    audit._enqueue(audit._audit_row("ws_DOESNOTEXIST%s" % uuid.uuid4().hex, event_type, "usr_test"))
+    _wait_for_metric("flush_failures", before["flush_failures"] + 1)
+    audit._enqueue(audit._audit_row(WORKSPACE_ID, event_type, "usr_test"))
+    _wait_for_metric("flushed", before["flushed"] + 1)
+    assert audit._worker.is_alive()
+    assert _count_events(event_type) == 1
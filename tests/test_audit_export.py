@@ -0,0 +1,81 @@
+import gzip
+import json
+import os
+import uuid
+import zlib
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+pytest.importorskip("fastapi")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from server import db
+from server.audit import emit_audit_event
+from server.routes import audit_events
+from server.routes.audit_events import _audit_filters, _export_chunks
+
+WORKSPACE_ID = "ws_SEED0100000000000000000000"
+EVENT_TYPE = "test.export.%s" % uuid.uuid4().hex
+
+
+@pytest.fixture(scope="module")
+def event_ids():
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            ids = [emit_audit_event(cur, WORKSPACE_ID, EVENT_TYPE, "usr_test", detail={"n": n}) for n in range(5)]
+        conn.commit()
+    finally:
+        conn.close()
+    return sorted(ids)
+
+
+@pytest.fixture
+def export(monkeypatch, event_ids):
+    monkeypatch.setattr(audit_events, "EXPORT_ITERSIZE", 2)
+    db.init_pool(DATABASE_URL, min_conn=1, max_conn=4)
+
+    def run(compression, event_type=EVENT_TYPE):
+        conditions, params = _audit_filters(WORKSPACE_ID, event_type, None, None, None, None, None, None)
+        return list(_export_chunks("WHERE " + " AND ".join(conditions), params, compression))
+
+    yield run
+    db.close_pool()
+
+
+def _ids(ndjson):
+    return [json.loads(line)["id"] for line in ndjson.decode("utf-8").splitlines()]
+
+
+def test_plain_export_streams_ndjson_in_id_order(export, event_ids):
+    chunks = export(None)
+    assert len(chunks) == 3  # 2 + 2 rows, then the last row
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+    assert _ids(b"".join(chunks)) == event_ids
+
+
+def test_gzip_export_is_one_stream_decodable_chunk_by_chunk(export, event_ids):
+    chunks = export("gzip")
+    assert len(chunks) == 3
+    assert chunks[0][:2] == b"\x1f\x8b"
+
+    # Each chunk is sync-flushed, so a client can decode every full line as it arrives.
+    decoder = zlib.decompressobj(wbits=31)
+    seen = []
+    for chunk in chunks:
+        seen += _ids(decoder.decompress(chunk))
+        assert len(seen) in (2, 4, 5)
+    assert decoder.eof
+    assert seen == event_ids
+    assert _ids(gzip.decompress(b"".join(chunks))) == event_ids
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_empty_export_is_a_valid_empty_body(export, compression):
+    chunks = export(compression, event_type="test.export.none.%s" % uuid.uuid4().hex)
+    assert len(chunks) == 1
+    body = gzip.decompress(chunks[0]) if compression else chunks[0]
+    assert body == b""
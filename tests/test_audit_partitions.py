@@ -0,0 +1,128 @@
+import csv
+import gzip
+import io
+import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+needs_db = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from server.audit_partitions import (
+    ID_CLOCK_SKEW, archive_partitions, ensure_partitions, id_lower_bound, id_window, list_partitions,
+)
+from server.ulid import _encode_crockford, generate_id
+
+WORKSPACE_ID = "ws_SEED0100000000000000000000"
+
+
+def _audit_id_at(moment):
+    ms = int(moment.timestamp() * 1000)
+    return "aud_%s%s" % (_encode_crockford(ms, 10), _encode_crockford(int(uuid.uuid4().int >> 48), 16))
+
+
+def test_id_lower_bound_subtracts_clock_skew():
+    moment = datetime(2026, 3, 1, 0, 2, tzinfo=timezone.utc)
+    assert id_lower_bound(_audit_id_at(moment)) == moment - ID_CLOCK_SKEW
+
+
+def test_id_lower_bound_skips_undecodable_and_future_ids():
+    assert id_lower_bound(None) is None
+    assert id_lower_bound("") is None
+    assert id_lower_bound("aud_short") is None
+    assert id_lower_bound("aud_" + "!" * 26) is None
+    future = datetime.now(timezone.utc) + 2 * ID_CLOCK_SKEW
+    assert id_lower_bound(_audit_id_at(future)) is None
+    assert id_lower_bound(generate_id("aud_")) is not None
+
+
+def test_id_window_spans_skew_on_both_sides():
+    moment = datetime(2026, 3, 1, 0, 2, tzinfo=timezone.utc)
+    assert id_window(_audit_id_at(moment)) == (moment - ID_CLOCK_SKEW, moment + ID_CLOCK_SKEW)
+    assert id_window("not-an-id") is None
+
+
+@pytest.fixture
+def cur():
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as c:
+            yield c
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def _insert_event(cur, audit_id, timestamp_iso):
+    cur.execute(
+        """INSERT INTO audit_events (id, workspace_id, event_type, actor_id, timestamp_iso)
+           VALUES (%s, %s, %s, 'usr_test', %s)""",
+        (audit_id, WORKSPACE_ID, "test.partitions.%s" % uuid.uuid4().hex, timestamp_iso),
+    )
+
+
+@needs_db
+@pytest.mark.parametrize("offset", [-ID_CLOCK_SKEW, timedelta(0), ID_CLOCK_SKEW])
+def test_events_within_skew_are_accepted_and_found_by_id_window(cur, offset):
+    moment = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(minutes=30)
+    audit_id = _audit_id_at(moment)
+    _insert_event(cur, audit_id, moment + offset)
+    lo, hi = id_window(audit_id)
+    cur.execute("SELECT COUNT(*) FROM audit_events WHERE id = %s AND timestamp_iso BETWEEN %s AND %s",
+                (audit_id, lo, hi))
+    assert cur.fetchone()[0] == 1
+
+
+@needs_db
+@pytest.mark.parametrize("sign", [-1, 1])
+def test_events_past_skew_are_rejected(cur, sign):
+    moment = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(minutes=30)
+    with pytest.raises(psycopg2.errors.CheckViolation):
+        _insert_event(cur, _audit_id_at(moment), moment + sign * (ID_CLOCK_SKEW + timedelta(milliseconds=1)))
+
+
+@needs_db
+@pytest.mark.parametrize("make_id", [
+    lambda moment: "legacy-%s" % uuid.uuid4().hex,
+    lambda moment: _audit_id_at(moment).lower(),
+    lambda moment: _audit_id_at(moment).replace("aud_", "pat_"),
+], ids=["not-a-ulid", "lowercase", "wrong-prefix"])
+def test_events_without_aud_ulid_ids_are_rejected(cur, make_id):
+    # id_lower_bound() could not bound them, so pruning might skip them.
+    moment = datetime.now(timezone.utc).replace(microsecond=0)
+    with pytest.raises(psycopg2.errors.CheckViolation):
+        _insert_event(cur, make_id(moment), moment)
+
+
+@needs_db
+def test_ensure_partitions_creates_months_ahead(cur):
+    names = ensure_partitions(cur, months_ahead=2, today=date(2001, 11, 20))
+    assert names == ["audit_events_2001_11", "audit_events_2001_12", "audit_events_2002_01"]
+    assert ensure_partitions(cur, months_ahead=0, today=date(2001, 11, 1)) == ["audit_events_2001_11"]
+    present = dict((name, month) for month, name in list_partitions(cur))
+    assert present["audit_events_2002_01"] == date(2002, 1, 1)
+
+
+@needs_db
+def test_archive_writes_expired_months_and_drops_them(cur, tmp_path):
+    ensure_partitions(cur, months_ahead=1, today=date(2001, 1, 1))
+    moment = datetime(2001, 1, 15, 12, tzinfo=timezone.utc)
+    audit_id = _audit_id_at(moment)
+    _insert_event(cur, audit_id, moment)
+
+    archived = archive_partitions(cur, retain_months=1, archive_dir=str(tmp_path), today=date(2001, 3, 5))
+
+    assert [(name, rows) for name, _, rows in archived] == [("audit_events_2001_01", 1)]
+    path = archived[0][1]
+    assert path == str(tmp_path / "audit_events_2001_01.csv.gz")
+    assert not os.path.exists(path + ".tmp")
+    with gzip.open(path, "rt") as f:
+        rows = list(csv.DictReader(io.StringIO(f.read())))
+    assert [r["id"] for r in rows] == [audit_id]
+    names = [name for _, name in list_partitions(cur)]
+    assert "audit_events_2001_01" not in names
+    assert "audit_events_2001_02" in names
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import os
+import uuid
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+pytest.importorskip("fastapi")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+needs_db = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from server import db
+from server.auth import AuthResult
+from server.batch_get import MAX_BATCH_GET_IDS, batch_get, parse_batch_ids
+from server.routes.patches import PATCH_COLUMNS, _row_to_dict
+
+SUFFIX = uuid.uuid4().hex[:12].upper()
+OWN_WS = "ws_TESTBGA%s" % SUFFIX
+OTHER_WS = "ws_TESTBGB%s" % SUFFIX
+USER_ID = "usr_TESTBG%s" % SUFFIX
+OWN_PATCHES = ["pat_TESTBGA%s%d" % (SUFFIX, n) for n in range(3)]
+OTHER_PATCH = "pat_TESTBGB%s" % SUFFIX
+DELETED_PATCH = "pat_TESTBGD%s" % SUFFIX
+
+
+def _error_message(resp):
+    return json.loads(resp.body)["error"]["message"]
+
+
+def test_parse_batch_ids_drops_duplicates_in_order():
+    ids, err = parse_batch_ids({"ids": ["b", "a", "b", "c", "a"]})
+    assert err is None
+    assert ids == ["b", "a", "c"]
+
+
+def test_parse_batch_ids_caps_the_request_size():
+    ids, err = parse_batch_ids({"ids": ["id%d" % n for n in range(MAX_BATCH_GET_IDS)]})
+    assert err is None and len(ids) == MAX_BATCH_GET_IDS
+    # The cap applies to the request as sent, before duplicates are dropped.
+    ids, err = parse_batch_ids({"ids": ["same"] * (MAX_BATCH_GET_IDS + 1)})
+    assert ids is None and err.status_code == 400
+    assert "at most %d" % MAX_BATCH_GET_IDS in _error_message(err)
+
+
+@pytest.mark.parametrize("body", [None, [], {}, {"ids": []}, {"ids": "pat_1"}, {"ids": ["pat_1", ""]}, {"ids": [1]}])
+def test_parse_batch_ids_rejects_malformed_bodies(body):
+    ids, err = parse_batch_ids(body)
+    assert ids is None and err.status_code == 400
+
+
+@pytest.fixture(scope="module")
+def patches():
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            for ws_id in (OWN_WS, OTHER_WS):
+                cur.execute("INSERT INTO workspaces (id, name) VALUES (%s, 'BatchGet Test')", (ws_id,))
+            cur.execute("INSERT INTO users (id, email, display_name) VALUES (%s, %s, 'BatchGet Test')",
+                        (USER_ID, "%s@test.local" % USER_ID.lower()))
+            cur.execute("INSERT INTO user_workspace_roles (user_id, workspace_id, role) VALUES (%s, %s, 'analyst')",
+                        (USER_ID, OWN_WS))
+            for pat_id in OWN_PATCHES + [DELETED_PATCH]:
+                cur.execute("INSERT INTO patches (id, workspace_id, author_id) VALUES (%s, %s, %s)",
+                            (pat_id, OWN_WS, USER_ID))
+            cur.execute("UPDATE patches SET deleted_at = NOW() WHERE id = %s", (DELETED_PATCH,))
+            cur.execute("INSERT INTO patches (id, workspace_id, author_id) VALUES (%s, %s, %s)",
+                        (OTHER_PATCH, OTHER_WS, USER_ID))
+        conn.commit()
+        db.init_pool(DATABASE_URL, min_conn=1, max_conn=4)
+        yield
+        db.close_pool()
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM patches WHERE workspace_id IN (%s, %s)", (OWN_WS, OTHER_WS))
+            cur.execute("DELETE FROM user_workspace_roles WHERE user_id = %s", (USER_ID,))
+            cur.execute("DELETE FROM users WHERE id = %s", (USER_ID,))
+            cur.execute("DELETE FROM workspaces WHERE id IN (%s, %s)", (OWN_WS, OTHER_WS))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _batch_get(auth, ids):
+    return asyncio.run(batch_get(None, auth, {"ids": ids}, "patches", PATCH_COLUMNS, _row_to_dict, "test"))
+
+
+@needs_db
+@pytest.mark.parametrize("auth", [
+    AuthResult(user_id=USER_ID, auth_type="bearer"),
+    AuthResult(workspace_id=OWN_WS, auth_type="api_key"),
+], ids=["user", "api_key"])
+def test_batch_get_returns_visible_items_in_request_order(patches, auth):
+    requested = [OWN_PATCHES[2], OTHER_PATCH, "pat_MISSING", OWN_PATCHES[0], DELETED_PATCH, OWN_PATCHES[2]]
+    resp = _batch_get(auth, requested)
+    assert [item["id"] for item in resp["data"]] == [OWN_PATCHES[2], OWN_PATCHES[0]]
+    assert resp["meta"]["not_found"] == [OTHER_PATCH, "pat_MISSING", DELETED_PATCH]
+
+
+@needs_db
+def test_batch_get_api_key_is_limited_to_its_workspace(patches):
+    resp = _batch_get(AuthResult(workspace_id=OTHER_WS, auth_type="api_key"), OWN_PATCHES + [OTHER_PATCH])
+    assert [item["id"] for item in resp["data"]] == [OTHER_PATCH]
+    assert resp["meta"]["not_found"] == OWN_PATCHES
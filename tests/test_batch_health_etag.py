@@ -0,0 +1,173 @@
+import hashlib
+import os
+import uuid
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from server import db, feature_flags
+from server.queue_counters import move_in, move_out
+from server.routes import batch_health
+
+SUFFIX = uuid.uuid4().hex[:12].upper()
+WORKSPACE_ID = "ws_TESTBH%s" % SUFFIX
+BATCH_ID = "bat_TESTBH%s" % SUFFIX
+USER_ID = "usr_TESTBH%s" % SUFFIX
+API_KEY = "test-key-%s" % uuid.uuid4().hex
+
+
+def _write(sql, params):
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def workspace():
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO workspaces (id, name) VALUES (%s, 'Health ETag Test')", (WORKSPACE_ID,))
+            cur.execute("INSERT INTO users (id, email, display_name) VALUES (%s, %s, 'Health ETag Test')",
+                        (USER_ID, "%s@test.local" % USER_ID.lower()))
+            cur.execute("INSERT INTO batches (id, workspace_id, name) VALUES (%s, %s, 'b')", (BATCH_ID, WORKSPACE_ID))
+            cur.execute(
+                """INSERT INTO api_keys (key_id, workspace_id, key_hash, key_prefix, created_by)
+                   VALUES (%s, %s, %s, %s, %s)""",
+                ("key_%s" % uuid.uuid4().hex, WORKSPACE_ID,
+                 hashlib.sha256(API_KEY.encode("utf-8")).hexdigest(), API_KEY[:8], USER_ID),
+            )
+        conn.commit()
+        yield
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM workspace_queue_counters WHERE workspace_id = %s", (WORKSPACE_ID,))
+            cur.execute("DELETE FROM reader_node_cache WHERE document_id IN "
+                        "(SELECT id FROM documents WHERE workspace_id = %s)", (WORKSPACE_ID,))
+            for table in ("corrections", "documents", "contracts", "api_keys", "batches"):
+                cur.execute("DELETE FROM %s WHERE workspace_id = %%s" % table, (WORKSPACE_ID,))
+            cur.execute("DELETE FROM users WHERE id = %s", (USER_ID,))
+            cur.execute("DELETE FROM workspaces WHERE id = %s", (WORKSPACE_ID,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv(feature_flags.EVIDENCE_INSPECTOR, "true")
+    feature_flags.clear_cache()
+    db.init_pool(DATABASE_URL, min_conn=1, max_conn=4)
+    app = FastAPI()
+    app.include_router(batch_health.router)
+    with TestClient(app, headers={"X-API-Key": API_KEY}) as c:
+        yield c
+    db.close_pool()
+    feature_flags.clear_cache()
+
+
+def _get(client, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get("/api/v2.5/workspaces/%s/batch-health" % WORKSPACE_ID, headers=headers)
+
+
+def _add_correction(status="pending_verifier"):
+    conn = psycopg2.connect(DATABASE_URL)
+    doc_id = "doc_TESTBH%s" % uuid.uuid4().hex[:12].upper()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO contracts (id, batch_id, workspace_id) VALUES (%s, %s, %s)",
+                        (doc_id.replace("doc_", "ctr_"), BATCH_ID, WORKSPACE_ID))
+            cur.execute("INSERT INTO documents (id, contract_id, batch_id, workspace_id) VALUES (%s, %s, %s, %s)",
+                        (doc_id, doc_id.replace("doc_", "ctr_"), BATCH_ID, WORKSPACE_ID))
+            cor_id = doc_id.replace("doc_", "cor_")
+            cur.execute("""INSERT INTO corrections (id, document_id, workspace_id, created_by, status)
+                           VALUES (%s, %s, %s, %s, %s)""",
+                        (cor_id, doc_id, WORKSPACE_ID, USER_ID, status))
+            move_in(cur, "correction", cor_id)
+        conn.commit()
+    finally:
+        conn.close()
+    return doc_id
+
+
+def test_unchanged_rollup_returns_304(client):
+    first = _get(client)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    again = _get(client, etag)
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.content == b""
+
+    listed = _get(client, '"stale", %s' % etag)
+    assert listed.status_code == 304
+
+
+def test_etag_changes_with_every_input_of_the_rollup(client):
+    etags = [_get(client).headers["ETag"]]
+
+    doc_id = _add_correction()
+    moved = _get(client, etags[-1])
+    assert moved.status_code == 200
+    assert moved.json()["data"]["batches"][0]["counts"]["corrections_pending"] == 1
+    etags.append(moved.headers["ETag"])
+
+    _write("""INSERT INTO reader_node_cache (id, document_id, source_pdf_hash, ocr_version, quality_flag, nodes, page_count)
+              VALUES (%s, %s, 'h', 'v1', 'unreadable', '[]'::jsonb, 1)""",
+           (doc_id.replace("doc_", "doc_RC"), doc_id))
+    cached = _get(client, etags[-1])
+    assert cached.status_code == 200
+    assert cached.json()["data"]["batches"][0]["counts"]["reader_unreadable_docs"] == 1
+    etags.append(cached.headers["ETag"])
+
+    _write("UPDATE batches SET deleted_at = NOW() WHERE id = %s", (BATCH_ID,))
+    try:
+        deleted = _get(client, etags[-1])
+        assert deleted.status_code == 200
+        assert deleted.json()["data"]["batches"] == []
+        etags.append(deleted.headers["ETag"])
+    finally:
+        _write("UPDATE batches SET deleted_at = NULL WHERE id = %s", (BATCH_ID,))
+
+    assert len(set(etags)) == len(etags)
+
+
+def test_etag_changes_when_a_move_keeps_the_stamps_and_totals(client):
+    pending = _add_correction().replace("doc_", "cor_")
+    _add_correction("approved")
+    stamp = "UPDATE workspace_queue_counters SET updated_at = '2026-01-01T00:00:00Z' WHERE workspace_id = %s"
+    _write(stamp, (WORKSPACE_ID,))
+    before = _get(client)
+    assert before.status_code == 200
+
+    # A pending -> approved move between existing buckets, committed with an older
+    # NOW(): the newest stamp, bucket count and item total all stay the same.
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            move_out(cur, "correction", pending)
+            cur.execute("UPDATE corrections SET status = 'approved' WHERE id = %s", (pending,))
+            move_in(cur, "correction", pending)
+            cur.execute(stamp, (WORKSPACE_ID,))
+        conn.commit()
+    finally:
+        conn.close()
+
+    after = _get(client, before.headers["ETag"])
+    assert after.status_code == 200
+    pending_count = before.json()["data"]["batches"][0]["counts"]["corrections_pending"]
+    assert after.json()["data"]["batches"][0]["counts"]["corrections_pending"] == pending_count - 1
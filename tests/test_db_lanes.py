@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from server import db
+
+
+@pytest.fixture
+def saturated_long_lane(monkeypatch):
+    """A one-slot long lane whose slot is already taken; get_pool() is satisfied without a database."""
+    lane = db._Lane(db.LANE_LONG, 1)
+    lane.acquire(0)
+    monkeypatch.setitem(db._lanes, db.LANE_LONG, lane)
+    monkeypatch.setattr(db, "_pool", object())
+    monkeypatch.setattr(db, "ACQUIRE_TIMEOUT_SECONDS", 0.5)
+    return lane
+
+
+def test_lane_grants_free_slots_then_times_out():
+    lane = db._Lane("t", 2)
+    lane.acquire(0)
+    lane.acquire(0)
+    t0 = time.monotonic()
+    with pytest.raises(db.PoolSaturatedError):
+        lane.acquire(0.2)
+    assert time.monotonic() - t0 >= 0.2
+    snap = lane.snapshot()
+    assert snap["in_use"] == 2 and snap["waiting"] == 0 and snap["timeouts"] == 1
+
+
+def test_lane_zero_timeout_rejects_without_queueing():
+    lane = db._Lane("t", 1)
+    lane.acquire(0)
+    with pytest.raises(db.PoolSaturatedError):
+        lane.acquire(0)
+    assert lane.snapshot()["queued"] == 0
+
+
+def test_lane_hands_released_slots_to_waiters_in_fifo_order():
+    lane = db._Lane("t", 1)
+    lane.acquire(0)
+    order = []
+
+    def waiter(n):
+        lane.acquire(5)
+        order.append(n)
+
+    threads = []
+    for n in range(3):
+        t = threading.Thread(target=waiter, args=(n,))
+        t.start()
+        threads.append(t)
+        while lane.snapshot()["waiting"] < n + 1:
+            time.sleep(0.001)
+    for granted in range(1, len(threads) + 1):
+        lane.release()
+        while len(order) < granted:
+            time.sleep(0.001)
+    for t in threads:
+        t.join()
+    assert order == [0, 1, 2]
+
+
+def test_lane_rejects_past_max_waiters(monkeypatch):
+    monkeypatch.setattr(db, "MAX_WAITERS", 0)
+    lane = db._Lane("t", 1)
+    lane.acquire(0)
+    with pytest.raises(db.PoolSaturatedError):
+        lane.acquire(5)
+    assert lane.snapshot()["rejected"] == 1
+
+
+def test_get_conn_async_keeps_event_loop_responsive(saturated_long_lane):
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        t0 = time.monotonic()
+        with pytest.raises(db.PoolSaturatedError):
+            await asyncio.gather(*(db.get_conn_async(db.LANE_LONG) for _ in range(3)))
+        elapsed = time.monotonic() - t0
+        tick_task.cancel()
+        return elapsed, ticks
+
+    elapsed, ticks = asyncio.run(scenario())
+    assert elapsed >= 0.5
+    # The loop kept running while the checkouts queued in worker threads.
+    assert ticks >= 20
+
+
+def test_sync_get_conn_on_event_loop_fails_fast(saturated_long_lane):
+    async def handler():
+        t0 = time.monotonic()
+        with pytest.raises(db.PoolSaturatedError):
+            db.get_conn(db.LANE_LONG)
+        return time.monotonic() - t0
+
+    assert asyncio.run(handler()) < 0.1
+    assert saturated_long_lane.snapshot()["waiting"] == 0
+
+
+def test_saturated_pool_maps_to_503_with_retry_after(saturated_long_lane):
+    pytest.importorskip("httpx")
+    fastapi = pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    from server import pdf_proxy
+
+    app = fastapi.FastAPI()
+    app.add_exception_handler(db.PoolSaturatedError, pdf_proxy.app.exception_handlers[db.PoolSaturatedError])
+
+    @app.get("/busy")
+    async def busy():
+        db.get_conn(db.LANE_LONG)
+
+    resp = TestClient(app).get("/busy")
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+    body = resp.json()
+    assert body["error"]["code"] == "POOL_SATURATED"
+    assert body["error"]["details"] == {"lane": db.LANE_LONG}
@@ -0,0 +1,114 @@
+import os
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from server import db
+
+
+@pytest.fixture
+def pool():
+    """A one-connection-at-rest pool, so consecutive checkouts reuse the same connection."""
+    db.init_pool(DATABASE_URL, min_conn=1, max_conn=4)
+    yield
+    db.close_pool()
+
+
+def _borrow_and_return():
+    conn = db.get_conn()
+    db.put_conn(conn)
+    return conn
+
+
+def _delta(before, key):
+    return db.get_pool_metrics()[key] - before[key]
+
+
+def test_returned_connection_is_reused_without_ping(pool):
+    first = _borrow_and_return()
+    before = db.get_pool_metrics()
+    assert _borrow_and_return() is first
+    assert _delta(before, "connects") == 0
+    assert _delta(before, "pings") == 0
+    assert db.get_pool_metrics()["in_use"] == before["in_use"]
+
+
+def test_connection_past_max_lifetime_is_recycled(pool):
+    old = _borrow_and_return()
+    old.created_at -= db.MAX_LIFETIME_SECONDS + 1
+    before = db.get_pool_metrics()
+    fresh = _borrow_and_return()
+    assert fresh is not old
+    assert old.closed
+    assert _delta(before, "recycles") == 1
+    assert _delta(before, "connects") == 1
+
+
+def test_idle_connection_is_pinged_before_reuse(pool):
+    conn = _borrow_and_return()
+    conn.last_used_at -= db.IDLE_CHECK_SECONDS + 1
+    before = db.get_pool_metrics()
+    assert _borrow_and_return() is conn
+    assert _delta(before, "pings") == 1
+    assert _delta(before, "ping_failures") == 0
+
+
+def test_routine_rollback_is_not_pinged(pool):
+    conn = db.get_conn()
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1")
+    conn.rollback()
+    db.put_conn(conn)
+    assert not conn.suspect
+    before = db.get_pool_metrics()
+    assert _borrow_and_return() is conn
+    assert _delta(before, "pings") == 0
+
+
+def test_failed_rollback_marks_connection_suspect(pool):
+    conn = db.get_conn()
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_backend_pid()")
+        pid = cur.fetchone()[0]
+    killer = psycopg2.connect(DATABASE_URL)
+    try:
+        with killer.cursor() as cur:
+            cur.execute("SELECT pg_terminate_backend(%s)", (pid,))
+    finally:
+        killer.close()
+    with pytest.raises((psycopg2.OperationalError, psycopg2.InterfaceError)):
+        conn.rollback()
+    assert conn.suspect
+    db.put_conn(conn)
+    assert _borrow_and_return() is not conn
+
+
+def test_dead_idle_connection_is_replaced(pool):
+    dead = db.get_conn()
+    with dead.cursor() as cur:
+        cur.execute("SELECT pg_backend_pid()")
+        pid = cur.fetchone()[0]
+    db.put_conn(dead)
+    killer = psycopg2.connect(DATABASE_URL)
+    try:
+        with killer.cursor() as cur:
+            cur.execute("SELECT pg_terminate_backend(%s)", (pid,))
+    finally:
+        killer.close()
+    dead.last_used_at -= db.IDLE_CHECK_SECONDS + 1
+
+    before = db.get_pool_metrics()
+    conn = db.get_conn()
+    try:
+        assert conn is not dead
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+            assert cur.fetchone() == (1,)
+    finally:
+        db.put_conn(conn)
+    assert _delta(before, "ping_failures") == 1
+    assert _delta(before, "connects") == 1
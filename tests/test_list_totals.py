@@ -0,0 +1,74 @@
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("fastapi")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+needs_db = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from server import db, list_totals
+from server.list_totals import fetch_total, include_total_error
+
+SERIES = "generate_series(1, 25) g(n)"
+SLOW = "generate_series(1, 3) g(n) CROSS JOIN LATERAL pg_sleep(0.2)"
+
+
+def test_include_total_error_accepts_known_modes():
+    assert include_total_error(None) is None
+    assert include_total_error("exact") is None
+    assert include_total_error("estimate") is None
+    resp = include_total_error("all")
+    assert resp.status_code == 400
+
+
+@pytest.fixture
+def total():
+    """Run fetch_total on an async_conn cursor and return (result, statement_timeout afterwards)."""
+    db.init_pool(DATABASE_URL, min_conn=1, max_conn=4)
+
+    def run(mode, from_sql, where="", params=()):
+        async def scenario():
+            async with db.async_conn() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("SET LOCAL statement_timeout = '7s'")
+                    result = await fetch_total(cur, mode, from_sql, where, list(params))
+                    await cur.execute("SELECT current_setting('statement_timeout')")
+                    return result, (await cur.fetchone())[0]
+        return asyncio.run(scenario())
+
+    yield run
+    db.close_pool()
+
+
+@needs_db
+def test_exact_total_counts_matching_rows(total):
+    result, timeout = total("exact", SERIES, "WHERE n > %s", (5,))
+    assert result == {"count": 20, "kind": "exact", "capped": False}
+    assert timeout == "7s"
+
+
+@needs_db
+def test_exact_total_is_capped_at_the_ceiling(total, monkeypatch):
+    monkeypatch.setattr(list_totals, "LIST_TOTAL_CEILING", 10)
+    result, _ = total("exact", SERIES)
+    assert result == {"count": 10, "kind": "exact", "capped": True}
+
+
+@needs_db
+def test_exact_total_falls_back_to_estimate_on_timeout(total, monkeypatch):
+    monkeypatch.setattr(list_totals, "LIST_TOTAL_TIMEOUT_MS", 50)
+    result, timeout = total("exact", SLOW)
+    assert result["kind"] == "estimate" and result["capped"] is False
+    assert isinstance(result["count"], int)
+    # The savepoint rollback restores the caller's timeout and leaves the transaction usable.
+    assert timeout == "7s"
+
+
+@needs_db
+def test_estimate_total_uses_the_plan(total):
+    result, _ = total("estimate", SERIES, "WHERE n > %s", (5,))
+    assert result["kind"] == "estimate" and result["capped"] is False
+    assert result["count"] > 0
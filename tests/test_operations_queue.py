@@ -0,0 +1,111 @@
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+pytest.importorskip("fastapi")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+needs_db = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from server.queue_counters import move_in
+from server.routes.operations_queue import _decode_cursor, _encode_cursor, _queue_page_sql
+
+
+def test_cursor_round_trips():
+    created_at = datetime(2026, 5, 4, 3, 2, 1, 123456, tzinfo=timezone.utc)
+    token = _encode_cursor(created_at, "pat_01|odd")
+    assert "=" not in token
+    assert _decode_cursor(token) == (created_at, "pat_01|odd")
+
+
+@pytest.mark.parametrize("token", ["!!!", "bm9waXBl", "bm90LWEtZGF0ZXxwYXRfMQ", "__58eA"])
+def test_malformed_cursor_decodes_to_none(token):
+    # "bm9waXBl" has no separator, "bm90LWEtZGF0ZXxwYXRfMQ" has a bad timestamp,
+    # "__58eA" is not UTF-8.
+    assert _decode_cursor(token) is None
+
+
+@pytest.fixture
+def seeded():
+    """(cursor, workspace id, expected (created_at, id) order) with ties on created_at; rolled back afterwards."""
+    conn = psycopg2.connect(DATABASE_URL)
+    suffix = uuid.uuid4().hex[:12].upper()
+    ws_id, user_id = "ws_TESTOQ%s" % suffix, "usr_TESTOQ%s" % suffix
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO workspaces (id, name) VALUES (%s, 'Queue Test')", (ws_id,))
+            cur.execute("INSERT INTO users (id, email, display_name) VALUES (%s, %s, 'Queue Test')",
+                        (user_id, "%s@test.local" % user_id.lower()))
+            expected = []
+            for n in range(7):
+                created_at = base + timedelta(minutes=n // 2)  # pairs share a timestamp
+                pat_id = "pat_TESTOQ%s%02d" % (suffix, n)
+                rfi_id = "rfi_TESTOQ%s%02d" % (suffix, n)
+                cur.execute("""INSERT INTO patches (id, workspace_id, author_id, status, created_at)
+                               VALUES (%s, %s, %s, 'Submitted', %s)""", (pat_id, ws_id, user_id, created_at))
+                cur.execute("""INSERT INTO rfis (id, workspace_id, author_id, target_record_id, question, created_at)
+                               VALUES (%s, %s, %s, 'rec', 'q?', %s)""", (rfi_id, ws_id, user_id, created_at))
+                expected += [(created_at, pat_id), (created_at, rfi_id)]
+            expected.sort(reverse=True)
+            yield cur, ws_id, [item_id for _, item_id in expected]
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def _page(cur, ws_id, after, limit):
+    sql, params = _queue_page_sql(["patch", "rfi"], ws_id, None, None, "admin", None, None, after, limit)
+    cur.execute(sql, params)
+    return cur.fetchall()
+
+
+@needs_db
+@pytest.mark.parametrize("limit", [1, 2, 3, 14, 50])
+def test_keyset_pages_cover_the_queue_once_in_order(seeded, limit):
+    cur, ws_id, expected = seeded
+    seen, after, pages = [], None, 0
+    while True:
+        rows = _page(cur, ws_id, after, limit)
+        assert len(rows) <= limit + 1
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        seen += [row[1] for row in rows]
+        pages += 1
+        if not has_more:
+            break
+        after = _decode_cursor(_encode_cursor(rows[-1][15], rows[-1][1]))
+    assert seen == expected
+    # limit+1 rows tell a full last page from one with more behind it: no empty trailing page.
+    assert pages == -(-len(expected) // limit)
+
+
+@needs_db
+def test_corrections_on_deleted_documents_leave_the_queue(seeded):
+    cur, ws_id, _ = seeded
+    suffix = uuid.uuid4().hex[:12].upper()
+    batch_id, ctr_id = "bat_TESTOQ%s" % suffix, "ctr_TESTOQ%s" % suffix
+    cur.execute("INSERT INTO batches (id, workspace_id, name) VALUES (%s, %s, 'Queue Test')", (batch_id, ws_id))
+    cur.execute("INSERT INTO contracts (id, batch_id, workspace_id) VALUES (%s, %s, %s)", (ctr_id, batch_id, ws_id))
+    live = None
+    for state in ("live", "deleted"):
+        doc_id, cor_id = "doc_TESTOQ%s%s" % (suffix, state), "cor_TESTOQ%s%s" % (suffix, state)
+        cur.execute("INSERT INTO documents (id, contract_id, batch_id, workspace_id) VALUES (%s, %s, %s, %s)",
+                    (doc_id, ctr_id, batch_id, ws_id))
+        cur.execute("INSERT INTO corrections (id, document_id, workspace_id) VALUES (%s, %s, %s)",
+                    (cor_id, doc_id, ws_id))
+        move_in(cur, "correction", cor_id)
+        if state == "live":
+            live = cor_id
+        else:
+            cur.execute("UPDATE documents SET deleted_at = NOW() WHERE id = %s", (doc_id,))
+
+    sql, params = _queue_page_sql(["correction"], ws_id, None, None, "admin", None, None, None, 50)
+    cur.execute(sql, params)
+    assert [row[1] for row in cur.fetchall()] == [live]
+    cur.execute("""SELECT COALESCE(SUM(item_count), 0) FROM workspace_queue_counters
+                   WHERE workspace_id = %s AND item_type = 'correction'""", (ws_id,))
+    assert cur.fetchone()[0] == 1
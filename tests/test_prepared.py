@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from server import db
+from server.prepared import _numbered, execute_prepared
+
+WORKSPACE_ID = "ws_SEED0100000000000000000000"
+
+
+@pytest.fixture
+def conn():
+    db.init_pool(DATABASE_URL, min_conn=1, max_conn=4)
+    c = db.get_conn()
+    yield c
+    db.put_conn(c)
+    db.close_pool()
+
+
+def _server_prepared(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT name FROM pg_prepared_statements ORDER BY name")
+        return [r[0] for r in cur.fetchall()]
+
+
+def _workspace_exists(conn):
+    with conn.cursor() as cur:
+        execute_prepared(cur, "workspace_exists", (WORKSPACE_ID,))
+        return cur.fetchone()
+
+
+def test_numbered_placeholders():
+    assert _numbered("SELECT %s, %s FROM t WHERE a = %s") == "SELECT $1, $2 FROM t WHERE a = $3"
+
+
+def test_statement_is_prepared_once_per_connection(conn):
+    assert _workspace_exists(conn) == (WORKSPACE_ID,)
+    assert "workspace_exists" in conn.prepared
+    assert _server_prepared(conn) == ["workspace_exists"]
+    assert _workspace_exists(conn) == (WORKSPACE_ID,)
+    assert _server_prepared(conn) == ["workspace_exists"]
+
+
+def test_statement_is_prepared_again_after_reset(conn):
+    _workspace_exists(conn)
+    conn.rollback()
+    conn.reset()
+    assert conn.prepared == set()
+    assert _server_prepared(conn) == []
+    assert _workspace_exists(conn) == (WORKSPACE_ID,)
+    assert _server_prepared(conn) == ["workspace_exists"]
+
+
+def test_plain_connection_falls_back_to_execute():
+    plain = psycopg2.connect(DATABASE_URL)
+    try:
+        assert _workspace_exists(plain) == (WORKSPACE_ID,)
+        assert _server_prepared(plain) == []
+    finally:
+        plain.close()
@@ -0,0 +1,151 @@
+import os
+import uuid
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+pytest.importorskip("fastapi")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+needs_db = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from server.queue_counters import counter_rows_sql, move_in, move_out, rebuild
+from server.routes.operations_queue import _accumulate_counts
+
+
+def _empty_counts():
+    return {"pending": 0, "needs_clarification": 0, "sent_to_admin": 0, "resolved": 0, "total": 0}
+
+
+def test_accumulate_counts_maps_buckets_to_queue_statuses():
+    counts = _empty_counts()
+    _accumulate_counts(counts, [
+        ("patch", "Submitted", "", 2),
+        ("patch", "Draft", "", 5),
+        ("patch", "Admin_Hold", "", 1),
+        ("rfi", "open", "", 3),
+        ("rfi", "open", "returned_to_analyst", 1),
+        ("correction", "approved", "", 4),
+    ], "admin")
+    assert counts == {"pending": 5, "needs_clarification": 1, "sent_to_admin": 1, "resolved": 4, "total": 11}
+
+
+def test_accumulate_counts_hides_patch_statuses_outside_role_scope():
+    counts = _empty_counts()
+    _accumulate_counts(counts, [("patch", "Admin_Hold", "", 2), ("patch", "Cancelled", "", 1)], "analyst")
+    assert counts == dict(_empty_counts(), resolved=1, total=1)
+
+
+@pytest.fixture
+def seeded():
+    """(cursor, ids) for a seeded workspace; everything is rolled back afterwards."""
+    conn = psycopg2.connect(DATABASE_URL)
+    suffix = uuid.uuid4().hex[:12].upper()
+    ids = {key: "%s_TESTQC%s" % (prefix, suffix) for key, prefix in (
+        ("ws", "ws"), ("batch", "bat"), ("other_batch", "bat"), ("contract", "ctr"),
+        ("doc", "doc"), ("user", "usr"),
+    )}
+    ids["other_batch"] += "B"
+    try:
+        with conn.cursor() as c:
+            c.execute("INSERT INTO workspaces (id, name) VALUES (%s, 'Counter Test')", (ids["ws"],))
+            c.execute("INSERT INTO users (id, email, display_name) VALUES (%s, %s, 'Counter Test')",
+                      (ids["user"], "%s@test.local" % ids["user"].lower()))
+            for batch in (ids["batch"], ids["other_batch"]):
+                c.execute("INSERT INTO batches (id, workspace_id, name) VALUES (%s, %s, 'b')", (batch, ids["ws"]))
+            c.execute("INSERT INTO contracts (id, batch_id, workspace_id) VALUES (%s, %s, %s)",
+                      (ids["contract"], ids["batch"], ids["ws"]))
+            c.execute("INSERT INTO documents (id, contract_id, batch_id, workspace_id) VALUES (%s, %s, %s, %s)",
+                      (ids["doc"], ids["contract"], ids["batch"], ids["ws"]))
+            yield c, ids
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def _counters(cur, ws_id):
+    sql, params = counter_rows_sql(ws_id)
+    cur.execute(sql + " ORDER BY 1, 2, 3", params)
+    return cur.fetchall()
+
+
+def _batch_counters(cur, ws_id, batch_id):
+    sql, params = counter_rows_sql(ws_id, batch_id=batch_id)
+    cur.execute(sql + " ORDER BY 1, 2, 3", params)
+    return cur.fetchall()
+
+
+def _assert_matches_rebuild(cur, ws_id):
+    incremental = _counters(cur, ws_id)
+    rebuild(cur, ws_id)
+    assert _counters(cur, ws_id) == incremental
+    return incremental
+
+
+def _add(cur, item_type, sql, params):
+    cur.execute(sql, params)
+    move_in(cur, item_type, params[0])
+    return params[0]
+
+
+def _set_status(cur, item_type, table, item_id, status):
+    move_out(cur, item_type, item_id)
+    cur.execute("UPDATE %s SET status = %%s WHERE id = %%s" % table, (status, item_id))
+    move_in(cur, item_type, item_id)
+
+
+@needs_db
+def test_move_in_and_move_out_match_rebuild(seeded):
+    cur, ids = seeded
+    pat = _add(cur, "patch", "INSERT INTO patches (id, workspace_id, batch_id, author_id, status) VALUES (%s, %s, %s, %s, 'Submitted')",
+               ("pat_TESTQC%s" % uuid.uuid4().hex[:12].upper(), ids["ws"], ids["batch"], ids["user"]))
+    rfi = _add(cur, "rfi", """INSERT INTO rfis (id, workspace_id, batch_id, author_id, target_record_id, question, status)
+                              VALUES (%s, %s, %s, %s, 'rec', 'q?', 'open')""",
+               ("rfi_TESTQC%s" % uuid.uuid4().hex[:12].upper(), ids["ws"], ids["batch"], ids["user"]))
+    cors = [
+        _add(cur, "correction", """INSERT INTO corrections (id, document_id, workspace_id, created_by, status)
+                                   VALUES (%s, %s, %s, %s, 'pending_verifier')""",
+             ("cor_TESTQC%s%d" % (uuid.uuid4().hex[:12].upper(), n), ids["doc"], ids["ws"], ids["user"]))
+        for n in range(2)
+    ]
+    _assert_matches_rebuild(cur, ids["ws"])
+
+    _set_status(cur, "patch", "patches", pat, "Verifier_Approved")
+    _set_status(cur, "rfi", "rfis", rfi, "closed")
+    _set_status(cur, "correction", "corrections", cors[0], "approved")
+    assert _assert_matches_rebuild(cur, ids["ws"]) == [
+        ("correction", "approved", "", 1),
+        ("correction", "pending_verifier", "", 1),
+        ("patch", "Verifier_Approved", "", 1),
+        ("rfi", "closed", "", 1),
+    ]
+
+    move_out(cur, "correction", cors[1])
+    cur.execute("UPDATE corrections SET deleted_at = NOW() WHERE id = %s", (cors[1],))
+    move_in(cur, "correction", cors[1])
+    assert ("correction", "pending_verifier", "", 1) not in _assert_matches_rebuild(cur, ids["ws"])
+
+
+@needs_db
+def test_document_soft_delete_and_rebatch_move_its_corrections(seeded):
+    cur, ids = seeded
+    for n in range(3):
+        _add(cur, "correction", """INSERT INTO corrections (id, document_id, workspace_id, created_by, status)
+                                   VALUES (%s, %s, %s, %s, 'pending_verifier')""",
+             ("cor_TESTQC%s%d" % (uuid.uuid4().hex[:12].upper(), n), ids["doc"], ids["ws"], ids["user"]))
+    assert _batch_counters(cur, ids["ws"], ids["batch"]) == [("correction", "pending_verifier", "", 3)]
+
+    cur.execute("UPDATE documents SET deleted_at = NOW() WHERE id = %s", (ids["doc"],))
+    assert _assert_matches_rebuild(cur, ids["ws"]) == []
+
+    cur.execute("UPDATE documents SET deleted_at = NOW() WHERE id = %s", (ids["doc"],))
+    assert _assert_matches_rebuild(cur, ids["ws"]) == []
+
+    cur.execute("UPDATE documents SET deleted_at = NULL, batch_id = %s WHERE id = %s", (ids["other_batch"], ids["doc"]))
+    _assert_matches_rebuild(cur, ids["ws"])
+    assert _batch_counters(cur, ids["ws"], ids["batch"]) == []
+    assert _batch_counters(cur, ids["ws"], ids["other_batch"]) == [("correction", "pending_verifier", "", 3)]
+
+    cur.execute("UPDATE documents SET batch_id = %s WHERE id = %s", (ids["batch"], ids["doc"]))
+    _assert_matches_rebuild(cur, ids["ws"])
+    assert _batch_counters(cur, ids["ws"], ids["batch"]) == [("correction", "pending_verifier", "", 3)]
@@ -0,0 +1,185 @@
+import hashlib
+import os
+import uuid
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+pytest.importorskip("fastapi")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from server import auth, db
+
+WORKSPACE_ID = "ws_SEED0100000000000000000000"
+ANALYST_ID = "usr_TESTREQCONN%s" % uuid.uuid4().hex[:12].upper()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def analyst():
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO users (id, email, display_name) VALUES (%s, %s, 'Request Test')",
+                        (ANALYST_ID, "%s@test.local" % ANALYST_ID.lower()))
+            cur.execute("INSERT INTO user_workspace_roles (user_id, workspace_id, role) VALUES (%s, %s, 'analyst')",
+                        (ANALYST_ID, WORKSPACE_ID))
+        conn.commit()
+        yield
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM api_keys WHERE created_by = %s", (ANALYST_ID,))
+            cur.execute("DELETE FROM user_workspace_roles WHERE user_id = %s", (ANALYST_ID,))
+            cur.execute("DELETE FROM users WHERE id = %s", (ANALYST_ID,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def request_scope():
+    """Pool plus an active per-request holder, as request_connection() sets up."""
+    db.init_pool(DATABASE_URL, min_conn=1, max_conn=4)
+    holder = db.RequestConnection()
+    token = db._request_conn.set(holder)
+    yield holder
+    db._request_conn.reset(token)
+    holder.release()
+    db.close_pool()
+
+
+def _open_handler_transaction(conn):
+    with conn.cursor() as cur:
+        cur.execute("CREATE TEMP TABLE handler_writes (n int)")
+        cur.execute("INSERT INTO handler_writes VALUES (1)")
+
+
+def _handler_rows(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM handler_writes")
+        return cur.fetchone()[0]
+
+
+def test_short_lane_checkouts_share_one_connection(request_scope):
+    first = db.get_conn()
+    db.put_conn(first)
+    second = db.get_conn()
+    assert second is first
+    private = db.get_conn(shared=False)
+    try:
+        assert private is not first
+        assert db.get_pool_metrics()["lanes"][db.LANE_SHORT]["in_use"] == 2
+    finally:
+        db.put_conn(private)
+
+
+def test_role_lookup_mid_transaction_keeps_handler_transaction(request_scope):
+    conn = db.get_conn()
+    _open_handler_transaction(conn)
+    assert auth.get_workspace_role(ANALYST_ID, WORKSPACE_ID) == "analyst"
+    assert conn.info.transaction_status == TRANSACTION_STATUS_INTRANS
+    assert _handler_rows(conn) == 1
+    conn.rollback()
+
+
+def test_failing_helper_rolls_back_to_its_savepoint_only(request_scope):
+    conn = db.get_conn()
+    _open_handler_transaction(conn)
+    with pytest.raises(psycopg2.errors.DivisionByZero):
+        with db.helper_conn() as helper, helper.cursor() as cur:
+            cur.execute("SELECT 1 / 0")
+    assert _handler_rows(conn) == 1
+    conn.rollback()
+
+
+def test_helper_without_open_transaction_leaves_connection_idle(request_scope):
+    conn = db.get_conn()
+    assert auth.get_workspace_role(ANALYST_ID, WORKSPACE_ID) == "analyst"
+    assert conn.info.transaction_status == TRANSACTION_STATUS_IDLE
+
+
+def test_helper_after_failed_handler_statement_uses_private_connection(request_scope):
+    conn = db.get_conn()
+    with pytest.raises(psycopg2.errors.DivisionByZero):
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1 / 0")
+    assert auth.get_workspace_role(ANALYST_ID, WORKSPACE_ID) == "analyst"
+    conn.rollback()
+
+
+def test_api_key_commit_does_not_commit_handler_writes(request_scope):
+    raw_key = "test-key-%s" % uuid.uuid4().hex
+    key_id = "key_%s" % uuid.uuid4().hex
+    setup = psycopg2.connect(DATABASE_URL)
+    try:
+        with setup.cursor() as cur:
+            cur.execute(
+                """INSERT INTO api_keys (key_id, workspace_id, key_hash, key_prefix, created_by)
+                   VALUES (%s, %s, %s, %s, %s)""",
+                (key_id, WORKSPACE_ID, hashlib.sha256(raw_key.encode("utf-8")).hexdigest(), raw_key[:8], ANALYST_ID),
+            )
+        setup.commit()
+
+        conn = db.get_conn()
+        _open_handler_transaction(conn)
+        result = auth._resolve_api_key(raw_key)
+        assert result is not None and result.workspace_id == WORKSPACE_ID
+        assert conn.info.transaction_status == TRANSACTION_STATUS_INTRANS
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('pg_temp.handler_writes')")
+            assert cur.fetchone()[0] is None
+        with setup.cursor() as cur:
+            cur.execute("SELECT last_used_at FROM api_keys WHERE key_id = %s", (key_id,))
+            assert cur.fetchone()[0] is not None
+    finally:
+        setup.close()
+
+
+def test_put_conn_close_discards_shared_connection(request_scope):
+    broken = db.get_conn()
+    db.put_conn(broken, close=True)
+    assert broken.closed
+    assert request_scope.conn is None
+    fresh = db.get_conn()
+    assert fresh is not broken and not fresh.closed
+    with fresh.cursor() as cur:
+        cur.execute("SELECT 1")
+        assert cur.fetchone() == (1,)
+
+
+def test_concurrent_requests_do_not_deadlock_a_saturated_short_lane(monkeypatch):
+    import asyncio
+
+    import httpx
+    from fastapi import Depends, FastAPI
+    from starlette.concurrency import run_in_threadpool
+
+    monkeypatch.setattr(db, "ACQUIRE_TIMEOUT_SECONDS", 1)
+    app = FastAPI(dependencies=[Depends(db.request_connection)])
+
+    @app.get("/items")
+    async def items():
+        # The role check takes the request's shared short-lane connection...
+        role = await run_in_threadpool(auth.get_workspace_role, ANALYST_ID, WORKSPACE_ID)
+        await asyncio.sleep(0.2)  # ...and every request holds it at once.
+        async with db.async_conn() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT 1")
+                return {"role": role, "n": (await cur.fetchone())[0]}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*[client.get("/items") for _ in range(4)])
+
+    db.init_pool(DATABASE_URL, min_conn=1, max_conn=4)
+    try:
+        assert db.get_pool_metrics()["lanes"][db.LANE_SHORT]["size"] == 2
+        responses = asyncio.run(scenario())
+    finally:
+        db.close_pool()
+    assert [resp.status_code for resp in responses] == [200] * 4
+    assert all(resp.json() == {"role": "analyst", "n": 1} for resp in responses)
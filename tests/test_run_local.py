@@ -0,0 +1,156 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from argparse import Namespace
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "local_runner"))
+
+import run_local
+
+RUNNER = os.path.join(ROOT, "local_runner", "run_local.py")
+BASE = os.path.join(ROOT, "config", "config_pack.base.json")
+PATCH = os.path.join(ROOT, "config", "config_pack.example.patch.json")
+DATASETS = {
+    "example": os.path.join(ROOT, "examples", "standardized_dataset.example.json"),
+    "edge_cases": os.path.join(ROOT, "examples", "standardized_dataset.edge_cases.json"),
+}
+needs_unix_sockets = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+
+def _preview(tmp_path, dataset, *extra, name="out.json", base=BASE):
+    out = tmp_path / name
+    proc = subprocess.run(
+        [sys.executable, RUNNER, "--base", base, "--patch", PATCH,
+         "--standardized", DATASETS[dataset], "--out", str(out), *extra],
+        capture_output=True, text=True, timeout=120, env=dict(os.environ, RUN_LOCAL_DAEMON=""),
+    )
+    assert proc.returncode == 0, proc.stderr
+    with open(out, encoding="utf-8") as f:
+        return json.load(f), proc
+
+
+@pytest.fixture(params=sorted(DATASETS))
+def dataset(request, tmp_path):
+    """(dataset name, default-mode output)."""
+    expected, _ = _preview(tmp_path, request.param, name="default.json")
+    return request.param, expected
+
+
+@pytest.mark.parametrize("mode", [
+    ["--engine", "columnar"],
+    ["--stream"],
+    ["--stream", "--memory-budget", "2"],
+    ["--workers", "2"],
+    ["--workers", "2", "--engine", "columnar"],
+], ids=["columnar", "stream", "stream-spill", "workers", "workers-columnar"])
+def test_mode_matches_default_output(tmp_path, dataset, mode):
+    name, expected = dataset
+    assert _preview(tmp_path, name, *mode)[0] == expected
+
+
+def test_cache_matches_default_output_cold_and_warm(tmp_path, dataset):
+    name, expected = dataset
+    cache = str(tmp_path / "eval_cache.json")
+    cold, _ = _preview(tmp_path, name, "--cache", cache, name="cold.json")
+    warm, proc = _preview(tmp_path, name, "--cache", cache, name="warm.json")
+    assert cold == expected and warm == expected
+    assert "Re-evaluated 0/" in proc.stdout
+
+
+def test_cache_keeps_duplicate_rules_apart(tmp_path, dataset):
+    name, _ = dataset
+    with open(BASE, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(PATCH, encoding="utf-8") as f:
+        rule = next(change["rule"] for change in json.load(f)["changes"] if change["action"] == "add_rule")
+    base["salesforce_rules"]["rules"] = [dict(rule, rule_id="SF_DUP"), dict(rule, rule_id="SF_DUP")]
+    base_path = str(tmp_path / "base_dup.json")
+    with open(base_path, "w", encoding="utf-8") as f:
+        json.dump(base, f)
+
+    expected, _ = _preview(tmp_path, name, name="default.json", base=base_path)
+    cache = str(tmp_path / "eval_cache.json")
+    for run in ("cold", "warm"):
+        output, _ = _preview(tmp_path, name, "--cache", cache, name="%s.json" % run, base=base_path)
+        assert output == expected
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    sock_path = str(tmp_path / "run_local.sock")
+    proc = subprocess.Popen([sys.executable, RUNNER, "--serve", sock_path],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while not run_local.daemon_alive(sock_path):
+        assert proc.poll() is None and time.monotonic() < deadline, "preview daemon did not start"
+        time.sleep(0.05)
+    yield sock_path
+    proc.terminate()
+    proc.wait(timeout=10)
+
+
+@needs_unix_sockets
+def test_daemon_matches_default_output(tmp_path, dataset, daemon):
+    name, expected = dataset
+    for run in range(2):  # cold, then served from the warm cache
+        output, proc = _preview(tmp_path, name, "--daemon", daemon, name="daemon%d.json" % run)
+        assert output == expected
+        assert "running in-process" not in proc.stderr
+
+
+def _fake_daemon(sock_path, reply):
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(sock_path)
+    server.listen(1)
+
+    def answer():
+        conn, _ = server.accept()
+        with conn:
+            conn.makefile("rb").readline()
+            conn.sendall(reply)
+        server.close()
+
+    threading.Thread(target=answer, daemon=True).start()
+
+
+def _args(tmp_path):
+    return Namespace(base=BASE, patch=PATCH, standardized=DATASETS["example"], out=str(tmp_path / "out.json"),
+                     qa=None, engine="row", stream=False, memory_budget=1, workers=1, cache=None,
+                     serve=None, daemon=None)
+
+
+@needs_unix_sockets
+@pytest.mark.parametrize("reply", [b"", b"not json\n", b"[1, 2]\n", b'{"status": 0}\n'],
+                         ids=["empty", "malformed", "not-an-object", "incomplete"])
+def test_unusable_daemon_reply_falls_back(tmp_path, reply):
+    sock_path = str(tmp_path / "fake.sock")
+    _fake_daemon(sock_path, reply)
+    assert run_local.request_preview(sock_path, _args(tmp_path)) is None
+
+
+@needs_unix_sockets
+def test_unreachable_daemon_falls_back(tmp_path, monkeypatch):
+    assert run_local.request_preview(str(tmp_path / "missing.sock"), _args(tmp_path)) is None
+
+    def denied(self, address):
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr(socket.socket, "connect", denied)
+    assert run_local.request_preview(str(tmp_path / "denied.sock"), _args(tmp_path)) is None
+
+
+@needs_unix_sockets
+def test_cli_runs_in_process_after_a_malformed_reply(tmp_path):
+    expected, _ = _preview(tmp_path, "example", name="default.json")
+    sock_path = str(tmp_path / "fake.sock")
+    _fake_daemon(sock_path, b"garbage\n")
+    output, proc = _preview(tmp_path, "example", "--daemon", sock_path)
+    assert output == expected
+    assert "running in-process" in proc.stderr